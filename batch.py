@@ -0,0 +1,109 @@
+"""
+Batched routing: many (start, end) queries on one map, fanned out over a process pool.
+
+The map, terrain costs included, is sent to every worker once, when the worker starts, and the
+queries travel in chunks of cell indices. Given a map file (see map_file), the workers map it
+instead, so an unpacked file is shared read-only through the page cache rather than copied into
+every process. Results are yielded as soon as their chunk completes, tagged with the index of the
+query in the input list.
+"""
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import engine
+from engine import SearchResult
+from components import Components
+from grid_map import GridMap
+from map_file import MapFile
+
+# the map and algorithm of the current worker process, set once by _init_worker
+_worker_map: GridMap | None = None
+_worker_file: MapFile | None = None  # keeps the mapping of a map file open for the worker's lifetime
+_worker_search: callable = None
+
+
+def _init_worker(rows: int, cols: int, cells: bytes | None, costs: bytes | None, max_cost: int, algorithm: str,
+                 map_path: str = None) -> None:
+    """
+    Rebuild the map in a freshly started worker, or map it from map_path.
+    """
+    global _worker_map, _worker_file, _worker_search
+    if map_path:
+        _worker_file = MapFile(map_path)
+        _worker_map = _worker_file.grid_map(copy=False)
+    else:
+        _worker_map = GridMap(rows, cols)
+        _worker_map.cells[:] = cells
+        if costs is not None:
+            _worker_map.costs = bytearray(costs)
+            _worker_map.max_cost = max_cost
+    _worker_search = engine.ALGORITHMS[algorithm]
+
+
+def _solve_chunk(chunk: list[tuple[int, int, int]]) -> list[tuple[int, SearchResult]]:
+    """
+    Answer a chunk of (query index, start cell, end cell) queries in a worker.
+    """
+    return [(index, _worker_search(_worker_map, start, end)) for index, start, end in chunk]
+
+
+def route_batch(grid_map: GridMap, pairs: list[tuple[tuple[int, int], tuple[int, int]]], algorithm: str = "astar",
+                workers: int = None, chunk_size: int = 64, components: Components = None,
+                map_path: str = None) -> Iterator[tuple[int, SearchResult]]:
+    """
+    Answer many (start, end) queries in parallel, yielding results as they complete.
+    Args:
+        grid_map (GridMap): The map to search; it must not change while the batch runs.
+        pairs (list[tuple[tuple[int, int], tuple[int, int]]]): The (start, end) position pairs.
+        algorithm (str): A key of engine.ALGORITHMS.
+        workers (int): The number of worker processes (default: one per core).
+        chunk_size (int): How many queries a worker answers per round trip.
+        components (Components): Optional labeling of grid_map; unreachable queries are answered
+            right away instead of being sent to a worker.
+        map_path (str): Optional map file holding grid_map (see map_file.save_map); the workers
+            map it instead of receiving a copy of the cells.
+    Returns:
+        Iterator[tuple[int, SearchResult]]: (index in pairs, result) tuples, in completion order.
+    """
+    if algorithm not in engine.ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    index = grid_map.index
+    queries = [(i, index(*start), index(*end)) for i, (start, end) in enumerate(pairs)]
+    if components:
+        for i, start, end in queries:
+            if not components.connected(start, end):
+                yield i, SearchResult(False)
+        queries = [query for query in queries if components.connected(query[1], query[2])]
+    chunks = [queries[i:i + chunk_size] for i in range(0, len(queries), chunk_size)]
+
+    cells = costs = None
+    if not map_path:
+        cells = bytes(grid_map.cells)
+        costs = bytes(grid_map.costs) if grid_map.costs is not None else None
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker,
+                             initargs=(grid_map.rows, grid_map.cols, cells, costs, grid_map.max_cost, algorithm,
+                                       map_path)) as pool:
+        for future in as_completed([pool.submit(_solve_chunk, chunk) for chunk in chunks]):
+            yield from future.result()
+
+
+def route_all(grid_map: GridMap, pairs: list[tuple[tuple[int, int], tuple[int, int]]], algorithm: str = "astar",
+              workers: int = None, chunk_size: int = 64, components: Components = None,
+              map_path: str = None) -> list[SearchResult]:
+    """
+    Answer many (start, end) queries in parallel and return the results in input order.
+    Args:
+        grid_map (GridMap): The map to search; it must not change while the batch runs.
+        pairs (list[tuple[tuple[int, int], tuple[int, int]]]): The (start, end) position pairs.
+        algorithm (str): A key of engine.ALGORITHMS.
+        workers (int): The number of worker processes (default: one per core).
+        chunk_size (int): How many queries a worker answers per round trip.
+        components (Components): Optional labeling of grid_map, see route_batch().
+        map_path (str): Optional map file holding grid_map, see route_batch().
+    Returns:
+        list[SearchResult]: One result per pair, in the same order.
+    """
+    results: list[SearchResult] = [None] * len(pairs)
+    for i, result in route_batch(grid_map, pairs, algorithm, workers, chunk_size, components, map_path):
+        results[i] = result
+    return results
@@ -0,0 +1,213 @@
+"""
+Headless benchmark of every algorithm registered in engine.ALGORITHMS.
+
+For every generated map it picks reproducible (start, end) queries inside the largest connected
+component and runs each algorithm three times per query:
+    1. with a counting on_event callback, for the nodes expanded and the peak frontier (the number
+       of cells open at once); this run also enforces the time limit,
+    2. bare, for the wall time,
+    3. under tracemalloc, for the peak memory allocated by the search.
+Tables an algorithm precomputes per map (the JPS+ jump table) are built once per map, before its
+queries, and their build time is recorded separately as preprocess_time.
+The records are written to JSON and/or CSV so runs of different versions can be compared.
+
+Example:
+    python benchmark.py --sizes 50 200 --maps random25 maze --algorithms astar jps --json base.json
+"""
+import argparse
+import csv
+import json
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+import engine
+from engine import SearchCancelled
+from components import Components
+from grid_map import GridMap, FREE, OPEN, CLOSED, OPEN_BACKWARD, CLOSED_BACKWARD
+from map_generators import GENERATORS
+
+SIZES = [50, 200, 500, 1000, 2000]
+FIELDS = ["map", "rows", "cols", "seed", "algorithm", "query", "start", "end", "status", "found", "cost",
+          "expanded", "peak_frontier", "wall_time", "peak_memory", "preprocess_time"]
+# per-map tables an algorithm takes as a keyword argument: (builder, keyword). They are built once
+# per map, outside the measured runs, and their build time is recorded as preprocess_time
+PREPROCESSING: dict[str, tuple[callable, str]] = {
+    "jps_plus": (engine.JumpTable, "table"),
+}
+
+
+def pick_queries(grid_map: GridMap, count: int, seed: int) -> list[tuple[int, int]]:
+    """
+    Pick reproducible (start, end) cell pairs inside the largest connected component.
+    Args:
+        grid_map (GridMap): The map.
+        count (int): The number of queries.
+        seed (int): The random seed.
+    Returns:
+        list[tuple[int, int]]: The (start, end) cells; empty if the map has fewer than two free cells.
+    """
+    components = Components(grid_map)
+    if not components.sizes:
+        return []
+    largest = max(components.sizes, key=components.sizes.get)
+    cells = [cell for cell, label in enumerate(components.labels) if label == largest]
+    if len(cells) < 2:
+        return []
+    rng = random.Random(seed)
+    return [tuple(rng.sample(cells, 2)) for _ in range(count)]
+
+
+def measure(algorithm: callable, grid_map: GridMap, start: int, end: int, timeout: float, **kwargs) -> dict:
+    """
+    Run one query of one algorithm and collect its statistics.
+    Args:
+        algorithm (callable): An engine algorithm.
+        grid_map (GridMap): The map.
+        start (int): The starting cell.
+        end (int): The ending cell.
+        timeout (float): Seconds the counting run may take before the query is given up.
+        **kwargs: Extra arguments for every run, e.g. a prebuilt table.
+    Returns:
+        dict: The status, found, cost, expanded, peak_frontier, wall_time and peak_memory of the query.
+    """
+    frontier: set[int] = set()
+    peak = 0
+    events = 0
+    deadline = time.perf_counter() + timeout
+
+    def on_event(kind: int, cell: int) -> None:
+        nonlocal peak, events
+        if kind == OPEN or kind == OPEN_BACKWARD:
+            frontier.add(cell)
+            peak = max(peak, len(frontier))
+        elif kind == CLOSED or kind == CLOSED_BACKWARD or kind == FREE:
+            frontier.discard(cell)
+        events += 1
+        if events % 1024 == 0 and time.perf_counter() > deadline:
+            raise SearchCancelled
+
+    record = {"status": "ok", "found": None, "cost": None, "expanded": None, "peak_frontier": None,
+              "wall_time": None, "peak_memory": None}
+    try:
+        result = algorithm(grid_map, start, end, on_event=on_event, **kwargs)
+    except SearchCancelled:
+        record["status"] = "timeout"
+        return record
+    except (RecursionError, MemoryError) as error:
+        record["status"] = type(error).__name__
+        return record
+    record.update(found=result.found, cost=result.cost if result.found else None, expanded=result.expanded,
+                  peak_frontier=peak)
+
+    began = time.perf_counter()
+    algorithm(grid_map, start, end, **kwargs)
+    record["wall_time"] = time.perf_counter() - began
+
+    tracemalloc.start()
+    try:
+        algorithm(grid_map, start, end, **kwargs)
+        record["peak_memory"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return record
+
+
+def run(maps: list[str], sizes: list[int], algorithms: list[str], queries: int, seed: int,
+        timeout: float, log: callable = print) -> list[dict]:
+    """
+    Benchmark every algorithm on every map and size.
+    Args:
+        maps (list[str]): Keys of map_generators.GENERATORS.
+        sizes (list[int]): Map sides; every map is size x size.
+        algorithms (list[str]): Keys of engine.ALGORITHMS.
+        queries (int): Queries per map.
+        seed (int): The seed of the maps and queries.
+        timeout (float): Seconds a single query may take.
+        log (callable): Called with one line per finished query.
+    Returns:
+        list[dict]: One record per (map, size, algorithm, query), with the keys in FIELDS.
+    """
+    records = []
+    for map_name in maps:
+        for size in sizes:
+            grid_map = GENERATORS[map_name](size, size, seed)
+            options: dict[str, dict] = {}
+            preprocess_times: dict[str, float] = {}
+            for name in algorithms:
+                if name in PREPROCESSING:
+                    build, keyword = PREPROCESSING[name]
+                    began = time.perf_counter()
+                    options[name] = {keyword: build(grid_map)}
+                    preprocess_times[name] = time.perf_counter() - began
+            for query, (start, end) in enumerate(pick_queries(grid_map, queries, seed)):
+                for name in algorithms:
+                    record = {"map": map_name, "rows": size, "cols": size, "seed": seed, "algorithm": name,
+                              "query": query, "start": grid_map.position(start), "end": grid_map.position(end),
+                              "preprocess_time": preprocess_times.get(name)}
+                    record.update(measure(engine.ALGORITHMS[name], grid_map, start, end, timeout,
+                                          **options.get(name, {})))
+                    records.append(record)
+                    log(f"{map_name:>9} {size:>5} {name:>20} #{query} {record['status']:>7} "
+                        f"cost={record['cost']} expanded={record['expanded']} time={record['wall_time']}")
+    return records
+
+
+def _version() -> str | None:
+    """
+    The git commit of the working tree, if there is one.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_json(path: str, records: list[dict], meta: dict) -> None:
+    """
+    Write the records and the run metadata to a JSON file.
+    Returns:
+        None
+    """
+    with open(path, "w") as file:
+        json.dump({"meta": meta, "results": records}, file, indent=1)
+
+
+def write_csv(path: str, records: list[dict]) -> None:
+    """
+    Write the records to a CSV file, one row per query.
+    Returns:
+        None
+    """
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the search algorithms on generated maps.")
+    parser.add_argument("--maps", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--algorithms", nargs="+", default=list(engine.ALGORITHMS), choices=list(engine.ALGORITHMS))
+    parser.add_argument("--queries", type=int, default=3, help="queries per map")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds a single query may take")
+    parser.add_argument("--json", help="write the results to this JSON file")
+    parser.add_argument("--csv", help="write the results to this CSV file")
+    args = parser.parse_args()
+
+    records = run(args.maps, args.sizes, args.algorithms, args.queries, args.seed, args.timeout)
+    meta = {"version": _version(), "python": platform.python_version(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "maps": args.maps, "sizes": args.sizes, "queries": args.queries, "seed": args.seed,
+            "timeout": args.timeout}
+    if args.json:
+        write_json(args.json, records, meta)
+    if args.csv:
+        write_csv(args.csv, records)
+
+
+if __name__ == "__main__":
+    main()
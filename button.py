@@ -7,20 +7,24 @@ class Button:
         self.text = text
         self.action = action
         self.font = pygame.font.SysFont('Arial', 20, bold=True)
+        # the label never changes, so it is rendered once instead of on every draw
+        self.text_surf = self.font.render(self.text, True, COLORS['TEXT_COLOR'])
+        self.text_rect = self.text_surf.get_rect(center=self.rect.center)
 
-    def draw(self, win):
-        mouse_pos = pygame.mouse.get_pos()
-        if self.rect.collidepoint(mouse_pos):
+    def is_hovered(self, mouse_pos=None):
+        if mouse_pos is None:
+            mouse_pos = pygame.mouse.get_pos()
+        return self.rect.collidepoint(mouse_pos)
+
+    def draw(self, win, mouse_pos=None):
+        if self.is_hovered(mouse_pos):
             color = COLORS['BUTTON_HOVER']
         else:
             color = COLORS['BUTTON_COLOR']
 
         pygame.draw.rect(win, color, self.rect)
         pygame.draw.rect(win, COLORS['BLACK'], self.rect, 2)
-
-        text_surf = self.font.render(self.text, True, COLORS['TEXT_COLOR'])
-        text_rect = text_surf.get_rect(center=self.rect.center)
-        win.blit(text_surf, text_rect)
+        win.blit(self.text_surf, self.text_rect)
 
     def is_clicked(self, pos):
-        return self.rect.collidepoint(pos)
\ No newline at end of file
+        return self.rect.collidepoint(pos)
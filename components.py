@@ -0,0 +1,190 @@
+"""
+Connected-component labeling of the free cells of a map.
+
+Two cells are connected exactly when they carry the same label, so a search can reject an
+unreachable query in O(1) before expanding anything. The labels are kept up to date through
+update_cell() after every barrier edit: clearing a cell merges the components around it into the
+largest one, and placing a barrier runs one BFS per side in lockstep, stopping as soon as all sides
+meet again or all but one have run dry, so only the pieces that actually broke off are relabeled.
+"""
+from array import array
+from collections import deque
+from grid_map import GridMap, BARRIER
+
+
+class Components:
+    def __init__(self, grid_map: GridMap):
+        """
+        Label the free cells of a map.
+        Args:
+            grid_map (GridMap): The map; report barrier changes with update_cell().
+        """
+        self.grid_map: GridMap = grid_map
+        # the component of every cell, -1 for barriers
+        self.labels: array = array('i')
+        # the number of cells of every component
+        self.sizes: dict[int, int] = {}
+        self.next_label: int = 0
+        self.rebuild()
+
+    @classmethod
+    def from_labels(cls, grid_map: GridMap, labels: array, sizes: dict[int, int]) -> "Components":
+        """
+        Restore labels computed earlier (e.g. stored in a map file) instead of labeling the map.
+        Args:
+            grid_map (GridMap): The map the labels belong to.
+            labels (array): The component of every cell, -1 for barriers; used as is.
+            sizes (dict[int, int]): The number of cells of every component.
+        Returns:
+            Components: The components, kept up to date through update_cell() as usual.
+        """
+        components = cls.__new__(cls)
+        components.grid_map = grid_map
+        components.labels = labels
+        components.sizes = sizes
+        components.next_label = max(sizes, default=-1) + 1
+        return components
+
+    def rebuild(self) -> None:
+        """
+        Label the whole map from scratch (e.g. after it was bulk loaded).
+        Returns:
+            None
+        """
+        cells = self.grid_map.cells
+        self.labels = array('i', [-1]) * len(cells)
+        self.sizes = {}
+        self.next_label = 0
+        for cell in range(len(cells)):
+            if cells[cell] != BARRIER and self.labels[cell] < 0:
+                label = self._new_label()
+                self.labels[cell] = label
+                self.sizes[label] = 1 + self._relabel(cell, label)
+
+    def connected(self, a: int, b: int) -> bool:
+        """
+        Checks if a path exists between two cells.
+        Args:
+            a (int): The first cell.
+            b (int): The second cell.
+        Returns:
+            bool: True if both cells are free and in the same component, False otherwise.
+        """
+        label = self.labels[a]
+        return label >= 0 and label == self.labels[b]
+
+    def update_cell(self, cell: int) -> None:
+        """
+        Report that a cell became a barrier or was cleared.
+        Args:
+            cell (int): The cell whose barrier state changed.
+        Returns:
+            None
+        """
+        labels = self.labels
+        if self.grid_map.cells[cell] == BARRIER:
+            label = labels[cell]
+            if label < 0:
+                return
+            labels[cell] = -1
+            self.sizes[label] -= 1
+            if self.sizes[label] == 0:
+                del self.sizes[label]
+            else:
+                self._split(label, self.grid_map.neighbors(cell))
+            return
+
+        if labels[cell] >= 0:
+            return
+        seeds = {labels[neighbor]: neighbor for neighbor in self.grid_map.neighbors(cell)}
+        if not seeds:
+            label = self._new_label()
+            labels[cell] = label
+            self.sizes[label] = 1
+            return
+        # the largest component absorbs the others
+        label = max(seeds, key=self.sizes.get)
+        labels[cell] = label
+        self.sizes[label] += 1
+        for other, seed in seeds.items():
+            if other != label:
+                labels[seed] = label
+                self.sizes[label] += 1 + self._relabel(seed, label)
+                del self.sizes[other]
+
+    def _new_label(self) -> int:
+        """
+        A label no component uses.
+        """
+        self.next_label += 1
+        return self.next_label - 1
+
+    def _relabel(self, seed: int, label: int) -> int:
+        """
+        Flood fill outwards from an already relabeled seed, giving label to every reachable cell.
+        Returns:
+            int: The number of cells relabeled, the seed excluded.
+        """
+        labels = self.labels
+        neighbors = self.grid_map.neighbors
+        stack = [seed]
+        count = 0
+        while stack:
+            for neighbor in neighbors(stack.pop()):
+                if labels[neighbor] != label:
+                    labels[neighbor] = label
+                    stack.append(neighbor)
+                    count += 1
+        return count
+
+    def _split(self, label: int, seeds: list[int]) -> None:
+        """
+        Find out whether removing a cell cut its component, starting one BFS from every free neighbor.
+        """
+        if len(seeds) <= 1:
+            return
+        neighbors = self.grid_map.neighbors
+        owner = {seed: group for group, seed in enumerate(seeds)}
+        queues = [deque([seed]) for seed in seeds]
+        members = [[seed] for seed in seeds]
+        merged = list(range(len(seeds)))  # union-find over the groups whose searches met
+
+        def find(group: int) -> int:
+            while merged[group] != group:
+                merged[group] = merged[merged[group]]
+                group = merged[group]
+            return group
+
+        while True:
+            roots = {find(group) for group in range(len(seeds))}
+            if len(roots) == 1:
+                return  # every side met again: no split
+            active = {find(group) for group in range(len(seeds)) if queues[group]}
+            if len(active) <= 1:
+                break
+            for group, queue in enumerate(queues):
+                if not queue:
+                    continue
+                for neighbor in neighbors(queue.popleft()):
+                    other = owner.get(neighbor)
+                    if other is None:
+                        owner[neighbor] = group
+                        members[group].append(neighbor)
+                        queue.append(neighbor)
+                    elif find(other) != find(group):
+                        merged[find(other)] = find(group)
+
+        # every side that ran dry was fully explored and broke off; the last one keeps the label
+        if not active:
+            active = {max(roots, key=lambda root: sum(len(members[group]) for group in range(len(seeds))
+                                                      if find(group) == root))}
+        for root in roots - active:
+            new_label = self._new_label()
+            count = 0
+            for group in range(len(seeds)):
+                if find(group) == root:
+                    for cell in members[group]:
+                        self.labels[cell] = new_label
+                    count += len(members[group])
+            self.sizes[new_label] = count
+            self.sizes[label] -= count
@@ -0,0 +1,994 @@
+"""
+Headless search engine.
+
+The algorithms in this module work on a GridMap and flat cell indices, never import pygame and
+return a SearchResult. A client that wants to watch a run passes an ``on_event(kind, cell)``
+callable: ``kind`` is one of the cell states from grid_map (OPEN, CLOSED, PATH, or FREE when a
+restarting search such as IDS clears a cell again). The callable may raise SearchCancelled to
+stop the search.
+"""
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from math import sqrt
+from grid_map import GridMap, FREE, BARRIER, OPEN, CLOSED, PATH, OPEN_BACKWARD, CLOSED_BACKWARD
+from open_set import OpenSet, BucketQueue
+from components import Components
+
+
+class SearchCancelled(Exception):
+    """Raised by an on_event callable to abort the running search."""
+
+
+@dataclass
+class SearchResult:
+    """
+    The outcome of a single search.
+    Attributes:
+        found (bool): True if a path was found.
+        path (list[tuple[int, int]]): The (row, col) positions from start to end, empty if not found.
+        cost (float): The cost of the path (inf if not found).
+        expanded (int): The number of nodes expanded.
+    """
+    found: bool
+    path: list[tuple[int, int]] = field(default_factory=list)
+    cost: float = float("inf")
+    expanded: int = 0
+
+
+def h_manhattan_distance(p1: tuple[int, int], p2: tuple[int, int]) -> float:
+    """
+    Heuristic function for A* algorithm: uses the Manhattan distance between two points.
+    Args:
+        p1 (tuple[int, int]): The first point (x1, y1).
+        p2 (tuple[int, int]): The second point (x2, y2).
+    Returns:
+        float: The Manhattan distance between p1 and p2.
+    """
+    x1, y1 = p1
+    x2, y2 = p2
+    return abs(x1 - x2) + abs(y1 - y2)
+
+
+def h_euclidian_distance(p1: tuple[int, int], p2: tuple[int, int]) -> float:
+    """
+    Heuristic function for A* algorithm: uses the Euclidian distance between two points.
+    Args:
+        p1 (tuple[int, int]): The first point (x1, y1).
+        p2 (tuple[int, int]): The second point (x2, y2).
+    Returns:
+        float: The Euclidian distance between p1 and p2.
+    """
+    x1, y1 = p1
+    x2, y2 = p2
+    return sqrt((x1 - x2)**2 + (y1 - y2)**2)
+
+
+def _found(grid_map: GridMap, came_from: dict[int, int], end: int, expanded: int, on_event: callable,
+           cost: float = None) -> SearchResult:
+    """
+    Walk came_from back from end and build the result, reporting every inner path cell as PATH.
+    The cost is the number of steps unless a weighted search passes its own.
+    """
+    cells = [end]
+    current = end
+    while current in came_from:
+        current = came_from[current]
+        cells.append(current)
+    if on_event:
+        for cell in cells[1:-1]:
+            on_event(PATH, cell)
+    cells.reverse()
+    return SearchResult(True, [grid_map.position(cell) for cell in cells], len(cells) - 1 if cost is None else cost,
+                        expanded)
+
+
+def bfs(grid_map: GridMap, start: int, end: int, on_event: callable = None) -> SearchResult:
+    """
+    Breadth-First Search (BFS) Algorithm.
+    Args:
+        grid_map (GridMap): The map to search.
+        start (int): The starting cell.
+        end (int): The ending cell.
+        on_event (callable): Optional on_event(kind, cell) progress callback.
+    Returns:
+        SearchResult: The path found and the search statistics.
+    """
+    queue = deque([start])
+    visited = {start}
+    came_from: dict[int, int] = {}
+    expanded = 0
+
+    while queue:
+        current = queue.popleft()
+
+        if current == end:
+            return _found(grid_map, came_from, end, expanded, on_event)
+
+        expanded += 1
+        for neighbor in grid_map.neighbors(current):
+            if neighbor not in visited:
+                visited.add(neighbor)
+                came_from[neighbor] = current
+                queue.append(neighbor)
+                if on_event:
+                    on_event(OPEN, neighbor)
+
+        if on_event:
+            on_event(CLOSED, current)
+
+    return SearchResult(False, expanded=expanded)
+
+
+def dfs(grid_map: GridMap, start: int, end: int, on_event: callable = None) -> SearchResult:
+    """
+    Depth-First Search (DFS) Algorithm.
+    Args:
+        grid_map (GridMap): The map to search.
+        start (int): The starting cell.
+        end (int): The ending cell.
+        on_event (callable): Optional on_event(kind, cell) progress callback.
+    Returns:
+        SearchResult: The path found and the search statistics.
+    """
+    stack = [start]
+    visited = {start}
+    came_from: dict[int, int] = {}
+    expanded = 0
+
+    while stack:
+        current = stack.pop()
+
+        if current == end:
+            return _found(grid_map, came_from, end, expanded, on_event)
+
+        expanded += 1
+        for neighbor in grid_map.neighbors(current):
+            if neighbor not in visited:
+                visited.add(neighbor)
+                came_from[neighbor] = current
+                stack.append(neighbor)
+                if on_event:
+                    on_event(OPEN, neighbor)
+
+        if on_event:
+            on_event(CLOSED, current)
+
+    return SearchResult(False, expanded=expanded)
+
+
+def astar(grid_map: GridMap, start: int, end: int, on_event: callable = None,
+          heuristic: callable = None) -> SearchResult:
+    """
+    A* Pathfinding Algorithm, weighing moves with the terrain costs of the map.
+    With the Manhattan estimate every priority is an integer and grows by at most max_cost + 1 per
+    step, so the open set is a bucket queue; a custom heuristic falls back to the binary heap.
+    Args:
+        grid_map (GridMap): The map to search.
+        start (int): The starting cell.
+        end (int): The ending cell.
+        on_event (callable): Optional on_event(kind, cell) progress callback.
+        heuristic (callable): Optional admissible heuristic(cell, target) (e.g. Landmarks.heuristic);
+            the Manhattan distance by default.
+    Returns:
+        SearchResult: The path found and the search statistics.
+    """
+    cols = grid_map.cols
+    end_row, end_col = divmod(end, cols)
+    start_row, start_col = divmod(start, cols)
+    costs = grid_map.costs
+    open_set = OpenSet() if heuristic else BucketQueue(grid_map.max_cost + 1)
+    if heuristic:
+        open_set.push(start, heuristic(start, end))
+    else:
+        open_set.push(start, abs(start_row - end_row) + abs(start_col - end_col))
+
+    came_from: dict[int, int] = {}
+
+    # scores are only stored for cells the search reaches, so start-up does not depend on the map size
+    g_score: dict[int, float] = {start: 0}
+    inf = float("inf")
+
+    expanded = 0
+
+    while open_set:
+        current = open_set.pop()
+
+        if current == end:
+            return _found(grid_map, came_from, end, expanded, on_event, g_score[end])
+
+        expanded += 1
+        g = g_score[current]
+        for neighbor in grid_map.neighbors(current):
+            temp_g_score = g + (costs[neighbor] if costs else 1)
+            if temp_g_score < g_score.get(neighbor, inf):
+                came_from[neighbor] = current
+                g_score[neighbor] = temp_g_score
+                if heuristic:
+                    estimate = heuristic(neighbor, end)
+                else:
+                    row, col = divmod(neighbor, cols)
+                    estimate = abs(row - end_row) + abs(col - end_col)
+
+                if on_event and neighbor not in open_set:
+                    on_event(OPEN, neighbor)
+                # an open neighbor gets its priority lowered, a closed one is reopened
+                open_set.push(neighbor, temp_g_score + estimate)
+
+        if on_event:
+            on_event(CLOSED, current)
+
+    return SearchResult(False, expanded=expanded)
+
+
+def ucs(grid_map: GridMap, start: int, end: int, on_event: callable = None) -> SearchResult:
+    """
+    Uniform Cost Search (UCS) Algorithm, weighing moves with the terrain costs of the map.
+    The costs are small integers, so the open set is a bucket queue of max_cost + 1 buckets.
+    Args:
+        grid_map (GridMap): The map to search.
+        start (int): The starting cell.
+        end (int): The ending cell.
+        on_event (callable): Optional on_event(kind, cell) progress callback.
+    Returns:
+        SearchResult: The path found and the search statistics.
+    """
+    costs = grid_map.costs
+    open_set = BucketQueue(grid_map.max_cost)
+    open_set.push(start, 0)
+
+    came_from: dict[int, int] = {}
+
+    # scores are only stored for cells the search reaches, so start-up does not depend on the map size
+    g_score: dict[int, float] = {start: 0}
+    inf = float("inf")
+
+    expanded = 0
+
+    while open_set:
+        current = open_set.pop()
+
+        if current == end:
+            return _found(grid_map, came_from, end, expanded, on_event, g_score[end])
+
+        expanded += 1
+        g = g_score[current]
+        for neighbor in grid_map.neighbors(current):
+            temp_g_score = g + (costs[neighbor] if costs else 1)
+            if temp_g_score < g_score.get(neighbor, inf):
+                came_from[neighbor] = current
+                g_score[neighbor] = temp_g_score
+
+                if on_event and neighbor not in open_set:
+                    on_event(OPEN, neighbor)
+                open_set.push(neighbor, temp_g_score)
+
+        if on_event:
+            on_event(CLOSED, current)
+
+    return SearchResult(False, expanded=expanded)
+
+
+def greedy_search(grid_map: GridMap, start: int, end: int, on_event: callable = None,
+                  heuristic: callable = None) -> SearchResult:
+    """
+    Greedy Best-First Search.
+    Args:
+        grid_map (GridMap): The map to search.
+        start (int): The starting cell.
+        end (int): The ending cell.
+        on_event (callable): Optional on_event(kind, cell) progress callback.
+        heuristic (callable): Optional heuristic(cell, target); the Manhattan distance by default.
+    Returns:
+        SearchResult: The path found and the search statistics.
+    """
+    cols = grid_map.cols
+    end_row, end_col = divmod(end, cols)
+    start_row, start_col = divmod(start, cols)
+    open_set = OpenSet()
+    if heuristic:
+        open_set.push(start, heuristic(start, end))
+    else:
+        open_set.push(start, abs(start_row - end_row) + abs(start_col - end_col))
+
+    came_from: dict[int, int] = {}
+    visited = {start}
+    expanded = 0
+
+    while open_set:
+        current = open_set.pop()
+
+        if current == end:
+            return _found(grid_map, came_from, end, expanded, on_event)
+
+        expanded += 1
+        for neighbor in grid_map.neighbors(current):
+            if neighbor not in visited:
+                came_from[neighbor] = current
+                visited.add(neighbor)
+                if heuristic:
+                    open_set.push(neighbor, heuristic(neighbor, end))
+                else:
+                    row, col = divmod(neighbor, cols)
+                    open_set.push(neighbor, abs(row - end_row) + abs(col - end_col))
+                if on_event:
+                    on_event(OPEN, neighbor)
+
+        if on_event:
+            on_event(CLOSED, current)
+
+    return SearchResult(False, expanded=expanded)
+
+
+def _deepen(grid_map: GridMap, roots: list[int], end: int, limit: int, best_depth: dict[int, int],
+            came_from: dict[int, int], on_event: callable, first_hit: bool) -> tuple[bool, list[int], int]:
+    """
+    Depth-first search from roots (at their depths in best_depth) down to limit. A cell is expanded
+    again only when it is reached at a smaller depth than before, so once the search is over every
+    cell within limit of the start holds its exact depth.
+    Returns:
+        tuple[bool, list[int], int]: Whether end was reached, the cells cut off at the limit and
+            the number of expansions. With first_hit the search stops as soon as end is reached.
+    """
+    stack = [(root, best_depth[root]) for root in roots]
+    found = False
+    cut: list[int] = []
+    expanded = 0
+
+    while stack:
+        current, depth = stack.pop()
+        if depth > best_depth[current]:
+            continue  # reached at a smaller depth since it was pushed
+
+        if current == end:
+            found = True
+            if first_hit:
+                break
+            continue
+
+        if depth == limit:
+            cut.append(current)
+            continue
+
+        expanded += 1
+        for neighbor in grid_map.neighbors(current):
+            if depth + 1 < best_depth.get(neighbor, limit + 1):
+                best_depth[neighbor] = depth + 1
+                came_from[neighbor] = current
+                stack.append((neighbor, depth + 1))
+                if on_event:
+                    on_event(OPEN, neighbor)
+
+        if on_event:
+            on_event(CLOSED, current)
+
+    return found, cut, expanded
+
+
+def dls(grid_map: GridMap, start: int, end: int, on_event: callable = None, limit: int = 50) -> SearchResult:
+    """
+    Depth-Limited Search (DLS) Algorithm.
+    A cell is searched again when it is reached at a smaller depth, so no path within the limit is missed.
+    Args:
+        grid_map (GridMap): The map to search.
+        start (int): The starting cell.
+        end (int): The ending cell.
+        on_event (callable): Optional on_event(kind, cell) progress callback.
+        limit (int): The maximum depth to search.
+    Returns:
+        SearchResult: The path found and the search statistics.
+    """
+    came_from: dict[int, int] = {}
+    found, _, expanded = _deepen(grid_map, [start], end, limit, {start: 0}, came_from, on_event, True)
+    if found:
+        return _found(grid_map, came_from, end, expanded, on_event)
+    return SearchResult(False, expanded=expanded)
+
+
+def ids(grid_map: GridMap, start: int, end: int, on_event: callable = None, growth: float = 1.0,
+        carry_frontier: bool = True) -> SearchResult:
+    """
+    Iterative Deepening Search (IDS): depth-limited searches with growing limits until the end is found.
+    Every iteration is finished even after the end was reached, which makes the depths it found
+    exact, so the path is a shortest one whatever the limits. The search stops as soon as an
+    iteration cuts nothing off at its limit: the end is then unreachable.
+    Args:
+        grid_map (GridMap): The map to search.
+        start (int): The starting cell.
+        end (int): The ending cell.
+        on_event (callable): Optional on_event(kind, cell) progress callback.
+        growth (float): The next limit is max(limit + 1, limit * growth); 1 deepens one level at a time.
+            Geometric growth (e.g. 2) saves restarts when carry_frontier is off; when it is on, wide
+            bands only make the depth-first search correct its depths more often.
+        carry_frontier (bool): Continue every iteration from the cells the previous one cut off,
+            keeping the depths found so far. Otherwise every iteration restarts from the start, and
+            the cells touched by a failed iteration are reported as FREE before the next one.
+    Returns:
+        SearchResult: The path found and the search statistics.
+    """
+    expanded = 0
+    touched: set[int] = set()
+
+    def record(kind: int, cell: int) -> None:
+        touched.add(cell)
+        on_event(kind, cell)
+
+    listener = record if on_event and not carry_frontier else on_event
+    best_depth = {start: 0}
+    came_from: dict[int, int] = {}
+    roots = [start]
+    limit = 0
+
+    while True:
+        found, cut, count = _deepen(grid_map, roots, end, limit, best_depth, came_from, listener, False)
+        expanded += count
+        if found:
+            return _found(grid_map, came_from, end, expanded, on_event)
+        if not cut:
+            return SearchResult(False, expanded=expanded)
+
+        next_limit = max(limit + 1, int(limit * growth))
+        if carry_frontier:
+            roots = list(dict.fromkeys(cell for cell in cut if best_depth[cell] == limit))
+        else:
+            best_depth = {start: 0}
+            came_from = {}
+            if on_event:
+                for cell in touched:
+                    on_event(FREE, cell)
+            touched.clear()
+        limit = next_limit
+
+
+def ida_star(grid_map: GridMap, start: int, end: int, on_event: callable = None,
+             heuristic: callable = None, table_size: int = 1 << 20) -> SearchResult:
+    """
+    Iterative Deepening A* (IDA*), with an explicit stack instead of recursion.
+    The cells on the current path are kept in a set, so cycle checks are O(1). A transposition table
+    remembers the best g of every cell and the iteration it was reached in: a cell reached with a
+    worse g, or with the same g again in the same iteration, is not searched again. Cells are not
+    cleared between iterations; the next one paints over them.
+    Args:
+        grid_map (GridMap): The map to search.
+        start (int): The starting cell.
+        end (int): The ending cell.
+        on_event (callable): Optional on_event(kind, cell) progress callback.
+        heuristic (callable): Optional admissible heuristic(cell, target); the Manhattan distance by default.
+        table_size (int): The most cells the transposition table may hold; 0 disables it.
+    Returns:
+        SearchResult: The path found and the search statistics.
+    """
+    if heuristic is None:
+        cols = grid_map.cols
+        end_row, end_col = divmod(end, cols)
+
+        def heuristic(cell: int, target: int) -> float:
+            row, col = divmod(cell, cols)
+            return abs(row - end_row) + abs(col - end_col)
+
+    neighbors = grid_map.neighbors
+    # cell -> (best g, iteration it was reached in)
+    table: dict[int, tuple[int, int]] = {}
+    expanded = 0
+
+    def iterate(limit: float, iteration: int) -> tuple[list[int] | None, float]:
+        # one depth-first pass bounded by limit: the path found, or None and the next limit
+        nonlocal expanded
+        next_limit = float("inf")
+        path = [start]
+        on_path = {start}
+        stack = [iter(neighbors(start))]
+        expanded += 1
+        while stack:
+            neighbor = next(stack[-1], None)
+            if neighbor is None:
+                # every neighbor tried: backtrack
+                stack.pop()
+                cell = path.pop()
+                on_path.discard(cell)
+                if on_event and stack:
+                    on_event(CLOSED, cell)
+                continue
+            if neighbor in on_path:
+                continue
+            g_score = len(path)
+            f_score = g_score + heuristic(neighbor, end)
+            if f_score > limit:
+                if f_score < next_limit:
+                    next_limit = f_score
+                continue
+            if table_size:
+                seen = table.get(neighbor)
+                if seen is not None and (seen[0] < g_score or (seen[0] == g_score and seen[1] == iteration)):
+                    continue
+                if seen is not None or len(table) < table_size:
+                    table[neighbor] = (g_score, iteration)
+
+            path.append(neighbor)
+            on_path.add(neighbor)
+            if on_event:
+                on_event(OPEN, neighbor)
+            if neighbor == end:
+                return path, limit
+            expanded += 1
+            stack.append(iter(neighbors(neighbor)))
+        return None, next_limit
+
+    if start == end:
+        return SearchResult(True, [grid_map.position(start)], 0, 0)
+
+    limit = heuristic(start, end)
+    iteration = 0
+    while True:
+        path, limit = iterate(limit, iteration)
+        if path is not None:
+            if on_event:
+                for cell in path[1:-1]:
+                    on_event(PATH, cell)
+            return SearchResult(True, [grid_map.position(cell) for cell in path], len(path) - 1, expanded)
+        if limit == float("inf"):
+            return SearchResult(False, expanded=expanded)
+        iteration += 1
+
+
+# ---- Bidirectional searches ----
+# Both halves share the map; the backward half searches from end toward start (moves are
+# symmetric) and reports its frontier as OPEN_BACKWARD / CLOSED_BACKWARD.
+
+def _found_bidirectional(grid_map: GridMap, came_from: dict[int, int], came_from_backward: dict[int, int],
+                         meet: int, expanded: int, on_event: callable) -> SearchResult:
+    """
+    Join the forward links from start to meet with the backward links from meet to end, then build the result.
+    """
+    cells = [meet]
+    while cells[-1] in came_from:
+        cells.append(came_from[cells[-1]])
+    cells.reverse()
+    while cells[-1] in came_from_backward:
+        cells.append(came_from_backward[cells[-1]])
+    if on_event:
+        for cell in cells[1:-1]:
+            on_event(PATH, cell)
+    return SearchResult(True, [grid_map.position(cell) for cell in cells], len(cells) - 1, expanded)
+
+
+def bidirectional_bfs(grid_map: GridMap, start: int, end: int, on_event: callable = None) -> SearchResult:
+    """
+    Bidirectional BFS: expands a whole level of the smaller frontier at a time and stops after the
+    level in which the two searches meet, keeping the shortest connection seen in that level.
+    Args:
+        grid_map (GridMap): The map to search.
+        start (int): The starting cell.
+        end (int): The ending cell.
+        on_event (callable): Optional on_event(kind, cell) progress callback.
+    Returns:
+        SearchResult: The path found and the search statistics.
+    """
+    if start == end:
+        return _found(grid_map, {}, end, 0, on_event)
+
+    distance = ({start: 0}, {end: 0})
+    came_from: tuple[dict[int, int], dict[int, int]] = ({}, {})
+    frontier = ([start], [end])
+    kinds = ((OPEN, CLOSED), (OPEN_BACKWARD, CLOSED_BACKWARD))
+    expanded = 0
+
+    while frontier[0] and frontier[1]:
+        side = 0 if len(frontier[0]) <= len(frontier[1]) else 1
+        mine, other = distance[side], distance[1 - side]
+        links = came_from[side]
+        open_kind, closed_kind = kinds[side]
+        best = float("inf")
+        meet = -1
+        next_frontier = []
+
+        for current in frontier[side]:
+            expanded += 1
+            for neighbor in grid_map.neighbors(current):
+                if neighbor not in mine:
+                    mine[neighbor] = mine[current] + 1
+                    links[neighbor] = current
+                    next_frontier.append(neighbor)
+                    if on_event:
+                        on_event(open_kind, neighbor)
+                if neighbor in other and mine[neighbor] + other[neighbor] < best:
+                    best = mine[neighbor] + other[neighbor]
+                    meet = neighbor
+            if on_event:
+                on_event(closed_kind, current)
+
+        if meet != -1:
+            return _found_bidirectional(grid_map, came_from[0], came_from[1], meet, expanded, on_event)
+        frontier = (next_frontier, frontier[1]) if side == 0 else (frontier[0], next_frontier)
+
+    return SearchResult(False, expanded=expanded)
+
+
+def bidirectional_astar(grid_map: GridMap, start: int, end: int, on_event: callable = None) -> SearchResult:
+    """
+    Bidirectional A* with the Manhattan distance heuristic toward each half's target.
+    The half with the smaller open set expands next; the search stops once the best connection
+    found is no longer than the lowest f in either open set, which bounds every other path.
+    Args:
+        grid_map (GridMap): The map to search.
+        start (int): The starting cell.
+        end (int): The ending cell.
+        on_event (callable): Optional on_event(kind, cell) progress callback.
+    Returns:
+        SearchResult: The path found and the search statistics.
+    """
+    if start == end:
+        return _found(grid_map, {}, end, 0, on_event)
+
+    cols = grid_map.cols
+    targets = (divmod(end, cols), divmod(start, cols))
+    open_sets = (OpenSet(), OpenSet())
+    open_sets[0].push(start, 0)
+    open_sets[1].push(end, 0)
+    g_scores: tuple[dict[int, float], dict[int, float]] = ({start: 0}, {end: 0})
+    came_from: tuple[dict[int, int], dict[int, int]] = ({}, {})
+    kinds = ((OPEN, CLOSED), (OPEN_BACKWARD, CLOSED_BACKWARD))
+    inf = float("inf")
+    best = inf
+    meet = -1
+    expanded = 0
+
+    while open_sets[0] and open_sets[1]:
+        if max(open_sets[0].peek_priority(), open_sets[1].peek_priority()) >= best:
+            break
+        side = 0 if len(open_sets[0]) <= len(open_sets[1]) else 1
+        open_set = open_sets[side]
+        g_score, other = g_scores[side], g_scores[1 - side]
+        links = came_from[side]
+        target_row, target_col = targets[side]
+        open_kind, closed_kind = kinds[side]
+
+        current = open_set.pop()
+        expanded += 1
+        temp_g_score = g_score[current] + 1
+        for neighbor in grid_map.neighbors(current):
+            if temp_g_score < g_score.get(neighbor, inf):
+                links[neighbor] = current
+                g_score[neighbor] = temp_g_score
+                row, col = divmod(neighbor, cols)
+                if on_event and neighbor not in open_set:
+                    on_event(open_kind, neighbor)
+                open_set.push(neighbor, temp_g_score + abs(row - target_row) + abs(col - target_col))
+                if neighbor in other and temp_g_score + other[neighbor] < best:
+                    best = temp_g_score + other[neighbor]
+                    meet = neighbor
+
+        if on_event:
+            on_event(closed_kind, current)
+
+    if meet == -1:
+        return SearchResult(False, expanded=expanded)
+    return _found_bidirectional(grid_map, came_from[0], came_from[1], meet, expanded, on_event)
+
+
+# ---- Jump Point Search ----
+# With unit move costs most shortest paths come in many symmetric variants. JPS only expands
+# "jump points": a straight scan continues until the goal, a wall, or a cell with a forced
+# neighbor (a side cell that is open while the side cell just behind it was blocked). A vertical
+# scan also stops on a cell from which a horizontal scan finds a jump point. Successors are pruned
+# to straight ahead and both sides of the direction the node was reached from.
+
+def _pruned_directions(d_row: int, d_col: int) -> tuple[tuple[int, int], ...]:
+    """
+    Get the directions to scan from a node reached moving in (d_row, d_col).
+    """
+    if d_col:
+        return (0, d_col), (1, 0), (-1, 0)
+    if d_row:
+        return (d_row, 0), (0, 1), (0, -1)
+    return (1, 0), (-1, 0), (0, 1), (0, -1)
+
+
+def _jump_horizontal(grid_map: GridMap, row: int, col: int, d_col: int, end: int) -> int:
+    """
+    Scan along a row from (row, col) and return the first jump point, or -1 if a wall comes first.
+    """
+    cells = grid_map.cells
+    rows = grid_map.rows
+    cols = grid_map.cols
+    while True:
+        col += d_col
+        if col < 0 or col >= cols:
+            return -1
+        cell = row * cols + col
+        if cells[cell] == BARRIER:
+            return -1
+        if cell == end:
+            return cell
+        behind = cell - d_col
+        if row > 0 and cells[cell - cols] != BARRIER and cells[behind - cols] == BARRIER:
+            return cell
+        if row < rows - 1 and cells[cell + cols] != BARRIER and cells[behind + cols] == BARRIER:
+            return cell
+
+
+def _jump_vertical(grid_map: GridMap, row: int, col: int, d_row: int, end: int) -> int:
+    """
+    Scan along a column from (row, col) and return the first jump point, or -1 if a wall comes first.
+    """
+    cells = grid_map.cells
+    rows = grid_map.rows
+    cols = grid_map.cols
+    step = d_row * cols
+    while True:
+        row += d_row
+        if row < 0 or row >= rows:
+            return -1
+        cell = row * cols + col
+        if cells[cell] == BARRIER:
+            return -1
+        if cell == end:
+            return cell
+        behind = cell - step
+        if col > 0 and cells[cell - 1] != BARRIER and cells[behind - 1] == BARRIER:
+            return cell
+        if col < cols - 1 and cells[cell + 1] != BARRIER and cells[behind + 1] == BARRIER:
+            return cell
+        if _jump_horizontal(grid_map, row, col, 1, end) != -1 or _jump_horizontal(grid_map, row, col, -1, end) != -1:
+            return cell
+
+
+class JumpTable:
+    # direction index of every (d_row, d_col), in the DOWN, UP, RIGHT, LEFT order of GridMap.neighbors
+    DIRECTIONS = {(1, 0): 0, (-1, 0): 1, (0, 1): 2, (0, -1): 3}
+
+    def __init__(self, grid_map: GridMap):
+        """
+        Precompute, for every cell and direction, how far the JPS scan goes (JPS+).
+        A positive distance d means the scan stops on a jump point d cells away; zero or a
+        negative distance -w means there are w free cells before a wall and no jump point.
+        The goal is not part of the table: jump_plus() checks for it at query time.
+        Args:
+            grid_map (GridMap): The map; the table must be rebuilt after its barriers change.
+        """
+        self.grid_map: GridMap = grid_map
+        # the map version the table was built for; it is stale once grid_map.version moves on
+        self.version: int = grid_map.version
+        rows, cols = grid_map.rows, grid_map.cols
+        cells = grid_map.cells
+        size = rows * cols
+        down, up, right, left = (array("i", bytes(4 * size)) for _ in range(4))
+        self.distances: tuple[array, ...] = (down, up, right, left)
+
+        def free(row: int, col: int) -> bool:
+            return 0 <= row < rows and 0 <= col < cols and cells[row * cols + col] != BARRIER
+
+        def chain(next_distance: int) -> int:
+            return next_distance + 1 if next_distance > 0 else next_distance - 1
+
+        for table, d_col in ((right, 1), (left, -1)):
+            for row in range(rows):
+                for col in (range(cols - 1, -1, -1) if d_col > 0 else range(cols)):
+                    nxt = col + d_col
+                    if not free(row, nxt):
+                        continue  # distance 0: a wall right ahead
+                    forced = any(free(row + side, nxt) and not free(row + side, col) for side in (1, -1))
+                    table[row * cols + col] = 1 if forced else chain(table[row * cols + nxt])
+
+        for table, d_row in ((down, 1), (up, -1)):
+            for col in range(cols):
+                for row in (range(rows - 1, -1, -1) if d_row > 0 else range(rows)):
+                    nxt = row + d_row
+                    if not free(nxt, col):
+                        continue
+                    cell = nxt * cols + col
+                    forced = any(free(nxt, col + side) and not free(row, col + side) for side in (1, -1))
+                    if forced or right[cell] > 0 or left[cell] > 0:
+                        table[row * cols + col] = 1
+                    else:
+                        table[row * cols + col] = chain(table[cell])
+
+    def jump(self, row: int, col: int, d_row: int, d_col: int, end: int) -> int:
+        """
+        Same result as the online scans, read from the table.
+        Args:
+            row (int): The row the scan starts from.
+            col (int): The column the scan starts from.
+            d_row (int): The row direction (-1, 0 or 1).
+            d_col (int): The column direction (-1, 0 or 1).
+            end (int): The goal cell.
+        Returns:
+            int: The jump point, or -1 if the scan hits a wall first.
+        """
+        cols = self.grid_map.cols
+        end_row, end_col = divmod(end, cols)
+        distance = self.distances[self.DIRECTIONS[d_row, d_col]][row * cols + col]
+        reach = abs(distance)
+        if d_col:
+            if row == end_row and 0 < (end_col - col) * d_col <= reach:
+                return end
+            return row * cols + col + distance * d_col if distance > 0 else -1
+
+        if 0 < (end_row - row) * d_row <= reach:
+            if col == end_col:
+                return end
+            # the online scan stops on the goal's row when a horizontal scan from there sees the goal
+            toward = 1 if end_col > col else -1
+            side = self.distances[self.DIRECTIONS[0, toward]][end_row * cols + col]
+            if abs(end_col - col) <= abs(side):
+                return end_row * cols + col
+        return (row + distance * d_row) * cols + col if distance > 0 else -1
+
+
+def _jump_point_search(grid_map: GridMap, start: int, end: int, on_event: callable, jump: callable) -> SearchResult:
+    """
+    A* over jump points, with the Manhattan distance heuristic.
+    Args:
+        grid_map (GridMap): The map to search.
+        start (int): The starting cell.
+        end (int): The ending cell.
+        on_event (callable): Optional on_event(kind, cell) progress callback.
+        jump (callable): jump(row, col, d_row, d_col) returning the next jump point or -1.
+    Returns:
+        SearchResult: The path found (every cell, not only the jump points) and the search statistics.
+    """
+    cols = grid_map.cols
+    end_row, end_col = divmod(end, cols)
+    start_row, start_col = divmod(start, cols)
+    open_set = OpenSet()
+    open_set.push(start, abs(start_row - end_row) + abs(start_col - end_col))
+
+    came_from: dict[int, int] = {}
+    g_score: dict[int, float] = {start: 0}
+    inf = float("inf")
+    expanded = 0
+
+    while open_set:
+        current = open_set.pop()
+
+        if current == end:
+            return _found(grid_map, _fill_jumps(came_from, end, cols), end, expanded, on_event)
+
+        expanded += 1
+        row, col = divmod(current, cols)
+        if current in came_from:
+            parent_row, parent_col = divmod(came_from[current], cols)
+            d_row = (row > parent_row) - (row < parent_row)
+            d_col = (col > parent_col) - (col < parent_col)
+        else:
+            d_row = d_col = 0
+
+        for step_row, step_col in _pruned_directions(d_row, d_col):
+            neighbor = jump(row, col, step_row, step_col)
+            if neighbor == -1:
+                continue
+            n_row, n_col = divmod(neighbor, cols)
+            temp_g_score = g_score[current] + abs(n_row - row) + abs(n_col - col)
+            if temp_g_score < g_score.get(neighbor, inf):
+                came_from[neighbor] = current
+                g_score[neighbor] = temp_g_score
+                if on_event and neighbor not in open_set:
+                    on_event(OPEN, neighbor)
+                open_set.push(neighbor, temp_g_score + abs(n_row - end_row) + abs(n_col - end_col))
+
+        if on_event:
+            on_event(CLOSED, current)
+
+    return SearchResult(False, expanded=expanded)
+
+
+def _fill_jumps(came_from: dict[int, int], end: int, cols: int) -> dict[int, int]:
+    """
+    Turn the jump point links on the path to end into single-cell links.
+    """
+    filled: dict[int, int] = {}
+    current = end
+    while current in came_from:
+        parent = came_from[current]
+        step = cols if abs(current - parent) >= cols else 1
+        if current < parent:
+            step = -step
+        for cell in range(current, parent, -step):
+            filled[cell] = cell - step
+        current = parent
+    return filled
+
+
+def jps(grid_map: GridMap, start: int, end: int, on_event: callable = None) -> SearchResult:
+    """
+    Jump Point Search (JPS) for the 4-connected unit-cost grid. Finds the same path lengths as A*.
+    Args:
+        grid_map (GridMap): The map to search.
+        start (int): The starting cell.
+        end (int): The ending cell.
+        on_event (callable): Optional on_event(kind, cell) progress callback; only jump points are reported.
+    Returns:
+        SearchResult: The path found and the search statistics.
+    """
+    def jump(row: int, col: int, d_row: int, d_col: int) -> int:
+        if d_col:
+            return _jump_horizontal(grid_map, row, col, d_col, end)
+        return _jump_vertical(grid_map, row, col, d_row, end)
+
+    return _jump_point_search(grid_map, start, end, on_event, jump)
+
+
+def jps_plus(grid_map: GridMap, start: int, end: int, on_event: callable = None,
+             table: JumpTable = None) -> SearchResult:
+    """
+    JPS+ : Jump Point Search reading its scans from a precomputed JumpTable.
+    Args:
+        grid_map (GridMap): The map to search.
+        start (int): The starting cell.
+        end (int): The ending cell.
+        on_event (callable): Optional on_event(kind, cell) progress callback; only jump points are reported.
+        table (JumpTable): The table for this map; built here if not given (reuse it for repeated queries).
+    Returns:
+        SearchResult: The path found and the search statistics.
+    """
+    if table is None:
+        table = JumpTable(grid_map)
+
+    def jump(row: int, col: int, d_row: int, d_col: int) -> int:
+        return table.jump(row, col, d_row, d_col, end)
+
+    return _jump_point_search(grid_map, start, end, on_event, jump)
+
+
+ALGORITHMS: dict[str, callable] = {
+    "bfs": bfs,
+    "dfs": dfs,
+    "astar": astar,
+    "ucs": ucs,
+    "greedy": greedy_search,
+    "dls": dls,
+    "ids": ids,
+    "ida_star": ida_star,
+    "bidirectional_bfs": bidirectional_bfs,
+    "bidirectional_astar": bidirectional_astar,
+    "jps": jps,
+    "jps_plus": jps_plus,
+}
+
+
+def search(grid_map: GridMap, start: tuple[int, int], end: tuple[int, int], algorithm: str = "astar",
+           on_event: callable = None, components: Components = None) -> SearchResult:
+    """
+    Run one query by algorithm name.
+    Args:
+        grid_map (GridMap): The map to search.
+        start (tuple[int, int]): The (row, col) of the starting cell.
+        end (tuple[int, int]): The (row, col) of the ending cell.
+        algorithm (str): A key of ALGORITHMS.
+        on_event (callable): Optional on_event(kind, cell) progress callback.
+        components (Components): Optional labeling of grid_map, used to reject unreachable queries up front.
+    Returns:
+        SearchResult: The path found and the search statistics.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    start, end = grid_map.index(*start), grid_map.index(*end)
+    if components and not components.connected(start, end):
+        return SearchResult(False)
+    return ALGORITHMS[algorithm](grid_map, start, end, on_event=on_event)
+
+
+def search_many(grid_map: GridMap, queries: list[tuple[tuple[int, int], tuple[int, int]]],
+                algorithm: str = "astar", components: Components = None) -> list[SearchResult]:
+    """
+    Run many (start, end) queries against the same map, without any progress reporting.
+    Args:
+        grid_map (GridMap): The map to search.
+        queries (list[tuple[tuple[int, int], tuple[int, int]]]): The (start, end) position pairs.
+        algorithm (str): A key of ALGORITHMS.
+        components (Components): Optional labeling of grid_map, used to reject unreachable queries up front.
+    Returns:
+        list[SearchResult]: One result per query, in the same order.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    func = ALGORITHMS[algorithm]
+    index = grid_map.index
+    if components is None:
+        return [func(grid_map, index(*start), index(*end)) for start, end in queries]
+    connected = components.connected
+    results = []
+    for start, end in queries:
+        start, end = index(*start), index(*end)
+        results.append(func(grid_map, start, end) if connected(start, end) else SearchResult(False))
+    return results
@@ -1,5 +1,9 @@
 from utils import *
 from spot import Spot
+from grid_map import GridMap
+from components import Components
+from map_file import save_map, MapFile
+from wavefront import distance_field
 
 class Grid:
     def __init__(self, win: pygame.Surface, rows: int, cols: int, width: int, height: int):
@@ -17,23 +21,111 @@ class Grid:
         self.cols: int = cols
         self.width: int = width
         self.height: int = height
-        self.grid: list[list[Spot]] = self._make_grid()
+        # one byte per cell holding its state; the search engine works directly on this map
+        self.map: GridMap = GridMap(rows, cols)
+        self.cells: bytearray = self.map.cells
+        # connected components of the free cells, kept up to date on every barrier edit
+        self.components: Components = Components(self.map)
+        # cells written since the last frame; the renderer redraws only these
+        self.dirty: set[int] = set()
+        # cells holding marks of a search (open, closed, path), so clearing them costs nothing per free cell
+        self.marked: set[int] = set()
+        self.redraw_all: bool = True
 
-    def _make_grid(self) -> list[list[Spot]]:
+    @property
+    def grid(self) -> list[list[Spot]]:
         """
-        Create a grid of Spot objects.
+        A 2D list (matrix) of Spot views on every cell, kept for compatibility.
+        It builds rows * cols views on every access, so prefer get_spot() or the cells array.
         Returns:
-            list[list[Spot]]: A 2D list (matrix) representing the grid of Spot objects.
+            list[list[Spot]]: The Spot views, indexed as grid[row][col].
         """
-        grid = []
-        spot_width = self.width // self.rows  # width of each spot
-        spot_height = self.height // self.cols  # height of each spot
-        for i in range(self.rows):
-            grid.append([])
-            for j in range(self.cols):
-                spot = Spot(i, j, spot_width, spot_height, self.rows)
-                grid[i].append(spot)
-        return grid
+        return [[Spot(self, i, j) for j in range(self.cols)] for i in range(self.rows)]
+
+    def get_spot(self, row: int, col: int) -> Spot:
+        """
+        Get a Spot view on the cell at (row, col).
+        Args:
+            row (int): The row of the spot.
+            col (int): The column of the spot.
+        Returns:
+            Spot: The view on that cell.
+        """
+        return Spot(self, row, col)
+
+    def set_state(self, cell: int, state: int) -> None:
+        """
+        Change the state of a cell and remember it for the next frame.
+        Placing or removing a barrier bumps the map version and updates the components.
+        Args:
+            cell (int): The flat index of the cell.
+            state (int): The new state (see grid_map.py).
+        Returns:
+            None
+        """
+        old_state = self.cells[cell]
+        if old_state != state:
+            self.cells[cell] = state
+            self.dirty.add(cell)
+            if state == FREE or state == BARRIER or state == START or state == END:
+                self.marked.discard(cell)
+            else:
+                self.marked.add(cell)
+            if old_state == BARRIER or state == BARRIER:
+                self.map.version += 1
+                self.components.update_cell(cell)
+
+    def set_cost(self, cell: int, cost: int) -> None:
+        """
+        Change the terrain cost of a cell and remember it for the next frame.
+        Args:
+            cell (int): The flat index of the cell.
+            cost (int): The cost of moving into the cell, from 1 to grid_map.MAX_COST.
+        Returns:
+            None
+        """
+        if self.map.cost(cell) != cost:
+            self.map.set_cost(*self.map.position(cell), cost)
+            self.dirty.add(cell)
+
+    def cell_color(self, cell: int) -> tuple[int, int, int] | None:
+        """
+        Get the color a cell is drawn with.
+        Args:
+            cell (int): The flat index of the cell.
+        Returns:
+            tuple[int, int, int] | None: The color of its state or terrain, or None to show the background.
+        """
+        state = self.cells[cell]
+        if state != FREE:
+            return STATE_COLORS[state]
+        costs = self.map.costs
+        if costs and costs[cell] > 1:
+            return cost_color(costs[cell])
+        return None
+
+    def distance_field(self, source: Spot) -> tuple:
+        """
+        BFS distances from a spot to every cell, with the direction of each cell's BFS parent.
+        Args:
+            source (Spot): The spot the distances are measured from.
+        Returns:
+            tuple: (distances, parents), flat and indexed by cell; see wavefront.distance_field().
+        """
+        return distance_field(self.map, source.cell)
+
+    def cell_rect(self, cell: int) -> tuple[int, int, int, int]:
+        """
+        Get the window rectangle covered by a cell.
+        Args:
+            cell (int): The flat index of the cell.
+        Returns:
+            tuple[int, int, int, int]: The (x, y, width, height) of the cell in pixels.
+        """
+        spot_width = self.width // self.rows
+        spot_height = self.height // self.cols
+        row, col = divmod(cell, self.cols)
+        return row * spot_width, col * spot_height, spot_width, spot_height
 
     def draw_grid_lines(self) -> None:
         """
@@ -43,12 +135,12 @@ class Grid:
         """
         spot_width = self.width // self.rows  # gap between lines
         spot_height = self.height // self.cols  # gap between lines
-        for i in range(self.rows):
-            # draw horizontal lines
-            pygame.draw.line(self.win, COLORS['GREY'], (0, i * spot_height), (self.width, i * spot_height))
         for j in range(self.cols):
+            # draw horizontal lines
+            pygame.draw.line(self.win, COLORS['GREY'], (0, j * spot_height), (self.width, j * spot_height))
+        for i in range(self.rows):
             # draw vertical lines
-            pygame.draw.line(self.win, COLORS['GREY'], (j * spot_width, 0), (j * spot_width, self.height))
+            pygame.draw.line(self.win, COLORS['GREY'], (i * spot_width, 0), (i * spot_width, self.height))
 
     def draw(self) -> None:
         """
@@ -57,34 +149,118 @@ class Grid:
             None
         """
         #pygame.draw.rect(self.win, COLORS['WHITE'], (0, 0, self.width, self.height))
-        for row in self.grid:
-            for spot in row:
-                if spot.color != COLORS['WHITE']:
-                    spot.draw(self.win)    # draw each spot
+        costs = self.map.costs
+        for cell, state in enumerate(self.cells):
+            if state != FREE or costs and costs[cell] > 1:
+                pygame.draw.rect(self.win, self.cell_color(cell), self.cell_rect(cell))
 
        # self.draw_grid_lines()        # draw the grid lines          
 
     def get_clicked_pos(self, pos: tuple[int, int]) -> tuple[int, int]:
         """
         Get the row and column of the grid based on the mouse position.
+        Rows run along x and columns along y, as in cell_rect().
         Args:
             pos (tuple[int, int]): The (x, y) position of the mouse click.
         Returns:
             tuple[int, int]: The (row, col) position of the clicked spot in the grid.
         """
-        spot_width = self.width // self.cols
-        spot_height = self.height // self.rows
+        spot_width = self.width // self.rows
+        spot_height = self.height // self.cols
         x, y = pos
-        col = x // spot_width
-        row = y // spot_height
-        return col, row
+        return x // spot_width, y // spot_height
     
+    def clear_search(self) -> None:
+        """
+        Remove the marks of a previous search (open, closed, path), keeping barriers, start and end.
+        Returns:
+            None
+        """
+        for cell in list(self.marked):
+            self.set_state(cell, FREE)
+
+    def load(self, cells: bytes, components: Components = None, costs: bytes = None) -> None:
+        """
+        Replace the state of every cell in one operation (e.g. with an imported map).
+        Args:
+            cells (bytes): One state per cell, indexed as row * cols + col.
+            components (Components): Labels already computed for these cells, to skip relabeling.
+            costs (bytes): The terrain cost of every cell; every cell costs 1 without them.
+        Returns:
+            None
+        """
+        if len(cells) != len(self.cells):
+            raise ValueError(f"Expected {len(self.cells)} cells, got {len(cells)}")
+        self.cells[:] = cells
+        self.map.clear_costs()
+        if costs is not None:
+            self.map.costs = bytearray(costs)
+            self.map.max_cost = max(self.map.costs, default=1)
+        self.map.version += 1
+        if components is not None:
+            components.grid_map = self.map
+            self.components = components
+        else:
+            self.components.rebuild()
+        self.dirty.clear()
+        self.marked.clear()
+        self.redraw_all = True
+
+    def save(self, path: str, start: Spot | None, end: Spot | None) -> None:
+        """
+        Write the barriers, terrain costs, start, end and component labels to a map file (see map_file).
+        Args:
+            path (str): The file to write.
+            start (Spot | None): The starting spot.
+            end (Spot | None): The ending spot.
+        Returns:
+            None
+        """
+        save_map(path, self.map, start.cell if start else -1, end.cell if end else -1, components=self.components)
+
+    def open(self, path: str) -> tuple[Spot | None, Spot | None]:
+        """
+        Load a map file written by save(); the stored component labels are reused.
+        Args:
+            path (str): The file to read.
+        Returns:
+            tuple[Spot | None, Spot | None]: The starting and ending spots stored in the file.
+        """
+        with MapFile(path) as map_file:
+            if (map_file.rows, map_file.cols) != (self.rows, self.cols):
+                raise ValueError(f"{path} is {map_file.rows}x{map_file.cols}, the grid is {self.rows}x{self.cols}")
+            self.load(map_file.cells(), map_file.components(self.map), map_file.costs())
+            start_cell, end_cell = map_file.start, map_file.end
+        return self.place_endpoints(start_cell, end_cell)
+
+    def place_endpoints(self, start_cell: int | None, end_cell: int | None) -> tuple[Spot | None, Spot | None]:
+        """
+        Mark the starting and ending cells, e.g. after a map was loaded.
+        Args:
+            start_cell (int | None): The starting cell, or None.
+            end_cell (int | None): The ending cell, or None.
+        Returns:
+            tuple[Spot | None, Spot | None]: The starting and ending spots.
+        """
+        start = end = None
+        if start_cell is not None:
+            start = self.get_spot(*self.map.position(start_cell))
+            start.make_start()
+        if end_cell is not None:
+            end = self.get_spot(*self.map.position(end_cell))
+            end.make_end()
+        return start, end
+
     def reset(self) -> None:
         """
         Reset the grid to its initial state.
         Returns:
             None
         """
-        for row in self.grid:
-            for spot in row:
-                spot.reset()
\ No newline at end of file
+        self.cells[:] = bytes(len(self.cells))
+        self.map.clear_costs()
+        self.map.version += 1
+        self.components.rebuild()
+        self.dirty.clear()
+        self.marked.clear()
+        self.redraw_all = True
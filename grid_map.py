@@ -0,0 +1,174 @@
+"""
+Pygame-free description of the grid used by the headless search engine.
+
+Cells are addressed by a flat index ``cell = row * cols + col`` and every cell holds one of the
+state constants below. The same constants are used as event kinds when a search reports its
+progress, so a client can mirror a run by writing ``kind`` into ``cells[cell]``.
+"""
+
+# ---- Cell states ----
+FREE = 0
+BARRIER = 1
+OPEN = 2
+CLOSED = 3
+PATH = 4
+START = 5
+END = 6
+OPEN_BACKWARD = 7    # frontier of the backward half of a bidirectional search
+CLOSED_BACKWARD = 8
+
+# ---- Terrain costs ----
+MAX_COST = 255  # costs are stored one byte per cell
+
+
+class GridMap:
+    def __init__(self, rows: int, cols: int):
+        """
+        Initialize an empty (all free) map.
+        Args:
+            rows (int): Number of rows in the map.
+            cols (int): Number of columns in the map.
+        """
+        self.rows: int = rows
+        self.cols: int = cols
+        self.cells: bytearray = bytearray(rows * cols)
+        # bumped whenever the barrier layout changes, so derived data (cached paths, tables) can tell it is stale
+        self.version: int = 0
+        # the cost of entering every cell, None while every cell costs 1 (see set_cost)
+        self.costs: bytearray | None = None
+        # an upper bound on the costs, which sizes the bucket queues of UCS and A*
+        self.max_cost: int = 1
+
+    @classmethod
+    def from_strings(cls, lines: list[str], barrier: str = "#") -> "GridMap":
+        """
+        Build a map from a text picture, one string per row.
+        Args:
+            lines (list[str]): The rows of the map; every string must have the same length.
+            barrier (str): The character that marks a barrier, anything else is free.
+        Returns:
+            GridMap: The map described by the picture.
+        """
+        grid_map = cls(len(lines), len(lines[0]) if lines else 0)
+        for row, line in enumerate(lines):
+            for col, char in enumerate(line):
+                if char == barrier:
+                    grid_map.cells[row * grid_map.cols + col] = BARRIER
+        return grid_map
+
+    def index(self, row: int, col: int) -> int:
+        """
+        Get the flat index of the cell at (row, col).
+        Args:
+            row (int): The row of the cell.
+            col (int): The column of the cell.
+        Returns:
+            int: The flat index of the cell.
+        """
+        return row * self.cols + col
+
+    def position(self, cell: int) -> tuple[int, int]:
+        """
+        Get the (row, col) position of a cell.
+        Args:
+            cell (int): The flat index of the cell.
+        Returns:
+            tuple[int, int]: The row and column of the cell.
+        """
+        return divmod(cell, self.cols)
+
+    def is_barrier(self, cell: int) -> bool:
+        """
+        Checks if the cell is a barrier.
+        Args:
+            cell (int): The flat index of the cell.
+        Returns:
+            bool: True if the cell is a barrier, False otherwise.
+        """
+        return self.cells[cell] == BARRIER
+
+    def set_barrier(self, row: int, col: int, barrier: bool = True) -> None:
+        """
+        Place or remove a barrier, bumping the version if the layout changed.
+        Args:
+            row (int): The row of the cell.
+            col (int): The column of the cell.
+            barrier (bool): True to place a barrier, False to clear the cell.
+        Returns:
+            None
+        """
+        cell = row * self.cols + col
+        if (self.cells[cell] == BARRIER) != barrier:
+            self.cells[cell] = BARRIER if barrier else FREE
+            self.version += 1
+
+    def cost(self, cell: int) -> int:
+        """
+        Get the cost of moving into a cell.
+        Args:
+            cell (int): The flat index of the cell.
+        Returns:
+            int: The cost, 1 unless set_cost() changed it.
+        """
+        return self.costs[cell] if self.costs else 1
+
+    def set_cost(self, row: int, col: int, cost: int) -> None:
+        """
+        Set the cost of moving into a cell, bumping the version if it changed.
+        Only UCS and A* weigh their paths with these costs; the other searches count steps.
+        Args:
+            row (int): The row of the cell.
+            col (int): The column of the cell.
+            cost (int): The cost, from 1 to MAX_COST.
+        Returns:
+            None
+        Raises:
+            ValueError: If the cost is out of range.
+        """
+        if not 1 <= cost <= MAX_COST:
+            raise ValueError(f"Cost must be between 1 and {MAX_COST}, got {cost}")
+        cell = row * self.cols + col
+        if self.cost(cell) == cost:
+            return
+        if self.costs is None:
+            self.costs = bytearray([1]) * len(self.cells)
+        self.costs[cell] = cost
+        self.max_cost = max(self.max_cost, cost)
+        self.version += 1
+
+    def clear_costs(self) -> None:
+        """
+        Make every cell cost 1 again, bumping the version if any cost was set.
+        Returns:
+            None
+        """
+        if self.costs is not None:
+            self.costs = None
+            self.max_cost = 1
+            self.version += 1
+
+    def neighbors(self, cell: int) -> list[int]:
+        """
+        Get the passable 4-connected neighbors of a cell, in the order DOWN, UP, RIGHT, LEFT.
+        Args:
+            cell (int): The flat index of the cell.
+        Returns:
+            list[int]: The flat indices of the neighbors that are not barriers.
+        """
+        cells = self.cells
+        cols = self.cols
+        row, col = divmod(cell, cols)
+        result = []
+        # DOWN
+        if row < self.rows - 1 and cells[cell + cols] != BARRIER:
+            result.append(cell + cols)
+        # UP
+        if row > 0 and cells[cell - cols] != BARRIER:
+            result.append(cell - cols)
+        # RIGHT
+        if col < cols - 1 and cells[cell + 1] != BARRIER:
+            result.append(cell + 1)
+        # LEFT
+        if col > 0 and cells[cell - 1] != BARRIER:
+            result.append(cell - 1)
+        return result
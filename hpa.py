@@ -0,0 +1,283 @@
+"""
+Hierarchical Path-Finding A* (HPA*) for very large grids.
+
+The map is cut into square clusters. Along every border between two clusters, each run of cells
+that is free on both sides becomes an entrance: one transition in the middle of a short run,
+one at each end of a long run. Transition cells are the nodes of an abstract graph, linked
+across the border with cost 1 and, inside every cluster, with their exact intra-cluster BFS
+distances. A query connects start and end to the nodes of their clusters, runs A* on the
+abstract graph and refines only the abstract edges on the result into cells. Paths are close
+to, but not always exactly, the shortest.
+
+After a barrier changes, update_cell() rebuilds the borders of the cluster containing the cell
+and the intra-cluster distances of that cluster and of the neighbors sharing those borders.
+"""
+from collections import deque
+from engine import SearchResult
+from grid_map import GridMap, BARRIER, OPEN, CLOSED, PATH
+from open_set import OpenSet
+
+# runs of at least this many cells get two transitions instead of one
+LONG_ENTRANCE = 6
+
+
+class HierarchicalMap:
+    def __init__(self, grid_map: GridMap, cluster_size: int = 10):
+        """
+        Build the abstract graph of a map.
+        Args:
+            grid_map (GridMap): The map; report barrier changes with update_cell().
+            cluster_size (int): The side of a square cluster, in cells.
+        """
+        self.grid_map: GridMap = grid_map
+        self.cluster_size: int = cluster_size
+        self.cluster_rows: int = -(-grid_map.rows // cluster_size)
+        self.cluster_cols: int = -(-grid_map.cols // cluster_size)
+        # transitions of every border, keyed by the (lower, higher) pair of clusters it separates
+        self.entrances: dict[tuple[int, int], list[tuple[int, int]]] = {}
+        # nodes of every cluster and their intra-cluster distances: intra[cluster][node][other node]
+        self.intra: dict[int, dict[int, dict[int, int]]] = {}
+
+        for cluster in range(self.cluster_rows * self.cluster_cols):
+            for other in self._higher_neighbors(cluster):
+                self._build_border(cluster, other)
+        for cluster in range(self.cluster_rows * self.cluster_cols):
+            self._build_cluster(cluster)
+
+    # ---- Structure ----
+    def cluster_of(self, cell: int) -> int:
+        """
+        Get the cluster a cell belongs to.
+        Args:
+            cell (int): The cell.
+        Returns:
+            int: The cluster index, row-major over the clusters.
+        """
+        row, col = divmod(cell, self.grid_map.cols)
+        return (row // self.cluster_size) * self.cluster_cols + col // self.cluster_size
+
+    def _bounds(self, cluster: int) -> tuple[int, int, int, int]:
+        """
+        The (first row, end row, first col, end col) of a cluster, ends excluded.
+        """
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        size = self.cluster_size
+        return (cluster_row * size, min((cluster_row + 1) * size, self.grid_map.rows),
+                cluster_col * size, min((cluster_col + 1) * size, self.grid_map.cols))
+
+    def _higher_neighbors(self, cluster: int) -> list[int]:
+        """
+        The clusters below and to the right of a cluster.
+        """
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        result = []
+        if cluster_row + 1 < self.cluster_rows:
+            result.append(cluster + self.cluster_cols)
+        if cluster_col + 1 < self.cluster_cols:
+            result.append(cluster + 1)
+        return result
+
+    def _adjacent_clusters(self, cluster: int) -> list[int]:
+        """
+        The up to four clusters sharing a border with a cluster.
+        """
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        result = self._higher_neighbors(cluster)
+        if cluster_row > 0:
+            result.append(cluster - self.cluster_cols)
+        if cluster_col > 0:
+            result.append(cluster - 1)
+        return result
+
+    def _build_border(self, low: int, high: int) -> None:
+        """
+        Find the transitions across the border between two adjacent clusters (low above or left of high).
+        """
+        cells = self.grid_map.cols
+        row0, row1, col0, col1 = self._bounds(low)
+        if high == low + self.cluster_cols:
+            # low is above high: pairs (last row of low, first row of high) along the columns
+            pairs = [((row1 - 1) * cells + col, row1 * cells + col) for col in range(col0, col1)]
+        else:
+            # low is left of high: pairs (last col of low, first col of high) along the rows
+            pairs = [(row * cells + col1 - 1, row * cells + col1) for row in range(row0, row1)]
+
+        state = self.grid_map.cells
+        transitions = []
+        run: list[tuple[int, int]] = []
+        for pair in pairs + [None]:
+            if pair is not None and state[pair[0]] != BARRIER and state[pair[1]] != BARRIER:
+                run.append(pair)
+                continue
+            if len(run) >= LONG_ENTRANCE:
+                transitions += [run[0], run[-1]]
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+        self.entrances[low, high] = transitions
+
+    def _nodes(self, cluster: int) -> set[int]:
+        """
+        The transition cells lying inside a cluster.
+        """
+        nodes = set()
+        for other in self._adjacent_clusters(cluster):
+            key = (cluster, other) if cluster < other else (other, cluster)
+            side = 0 if cluster < other else 1
+            nodes.update(pair[side] for pair in self.entrances.get(key, ()))
+        return nodes
+
+    def _build_cluster(self, cluster: int) -> None:
+        """
+        Compute the intra-cluster distances between all nodes of a cluster.
+        """
+        nodes = self._nodes(cluster)
+        distances: dict[int, dict[int, int]] = {}
+        for node in nodes:
+            reached, _ = self._bfs_in_cluster(node, cluster)
+            distances[node] = {other: reached[other] for other in nodes if other != node and other in reached}
+        self.intra[cluster] = distances
+
+    def _inter_partners(self, node: int) -> list[int]:
+        """
+        The transition cells across a border from a node.
+        """
+        cluster = self.cluster_of(node)
+        partners = []
+        for other in self._adjacent_clusters(cluster):
+            key = (cluster, other) if cluster < other else (other, cluster)
+            side = 0 if cluster < other else 1
+            partners += [pair[1 - side] for pair in self.entrances.get(key, ()) if pair[side] == node]
+        return partners
+
+    def _bfs_in_cluster(self, source: int, cluster: int, target: int = -1) -> tuple[dict[int, int], dict[int, int]]:
+        """
+        BFS from a cell without leaving its cluster, stopping early once target is reached.
+        Returns:
+            tuple[dict[int, int], dict[int, int]]: The distances and the parent links of the reached cells.
+        """
+        row0, row1, col0, col1 = self._bounds(cluster)
+        cols = self.grid_map.cols
+        distances = {source: 0}
+        came_from: dict[int, int] = {}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            if current == target:
+                break
+            for neighbor in self.grid_map.neighbors(current):
+                if neighbor not in distances:
+                    row, col = divmod(neighbor, cols)
+                    if row0 <= row < row1 and col0 <= col < col1:
+                        distances[neighbor] = distances[current] + 1
+                        came_from[neighbor] = current
+                        queue.append(neighbor)
+        return distances, came_from
+
+    # ---- Maintenance ----
+    def update_cell(self, cell: int) -> None:
+        """
+        Report that a cell became a barrier or was cleared.
+        Args:
+            cell (int): The cell whose barrier state changed.
+        Returns:
+            None
+        """
+        cluster = self.cluster_of(cell)
+        neighbors = self._adjacent_clusters(cluster)
+        for other in neighbors:
+            self._build_border(min(cluster, other), max(cluster, other))
+        for affected in [cluster] + neighbors:
+            self._build_cluster(affected)
+
+    # ---- Queries ----
+    def find_path(self, start: int, end: int, on_event: callable = None) -> SearchResult:
+        """
+        Answer a query on the abstract graph and refine the result into cells.
+        Args:
+            start (int): The starting cell.
+            end (int): The ending cell.
+            on_event (callable): Optional on_event(kind, cell) progress callback; only abstract nodes
+                are opened and closed.
+        Returns:
+            SearchResult: The path found; expanded counts abstract nodes plus the cells refined.
+        """
+        grid_map = self.grid_map
+        if grid_map.is_barrier(start) or grid_map.is_barrier(end):
+            return SearchResult(False)
+        if start == end:
+            return SearchResult(True, [grid_map.position(start)], 0, 0)
+
+        start_cluster = self.cluster_of(start)
+        end_cluster = self.cluster_of(end)
+        start_reach, _ = self._bfs_in_cluster(start, start_cluster)
+        end_reach, _ = self._bfs_in_cluster(end, end_cluster)
+        start_links = {node: start_reach[node] for node in self._nodes(start_cluster) if node in start_reach}
+        end_links = {node: end_reach[node] for node in self._nodes(end_cluster) if node in end_reach}
+
+        def edges(node: int) -> list[tuple[int, int]]:
+            if node == start:
+                # start may itself be a transition, with partners across the border
+                result = list(start_links.items()) + [(partner, 1) for partner in self._inter_partners(start)]
+                if start_cluster == end_cluster and end in start_reach:
+                    result.append((end, start_reach[end]))
+                return result
+            result = list(self.intra[self.cluster_of(node)].get(node, {}).items())
+            result += [(partner, 1) for partner in self._inter_partners(node)]
+            if node in end_links:
+                result.append((end, end_links[node]))
+            return result
+
+        cols = grid_map.cols
+        end_row, end_col = divmod(end, cols)
+        open_set = OpenSet()
+        open_set.push(start, 0)
+        g_score: dict[int, int] = {start: 0}
+        came_from: dict[int, int] = {}
+        expanded = 0
+        while open_set:
+            current = open_set.pop()
+            if current == end:
+                break
+            expanded += 1
+            if on_event:
+                on_event(CLOSED, current)
+            for neighbor, cost in edges(current):
+                temp_g_score = g_score[current] + cost
+                if temp_g_score < g_score.get(neighbor, float("inf")):
+                    g_score[neighbor] = temp_g_score
+                    came_from[neighbor] = current
+                    row, col = divmod(neighbor, cols)
+                    open_set.push(neighbor, temp_g_score + abs(row - end_row) + abs(col - end_col))
+                    if on_event:
+                        on_event(OPEN, neighbor)
+        else:
+            return SearchResult(False, expanded=expanded)
+
+        abstract = [end]
+        while abstract[-1] != start:
+            abstract.append(came_from[abstract[-1]])
+        abstract.reverse()
+
+        cells = [start]
+        for a, b in zip(abstract, abstract[1:]):
+            cells += self._refine(a, b)
+            expanded += 1
+        if on_event:
+            for cell in cells[1:-1]:
+                on_event(PATH, cell)
+        return SearchResult(True, [grid_map.position(cell) for cell in cells], len(cells) - 1, expanded)
+
+    def _refine(self, a: int, b: int) -> list[int]:
+        """
+        The cells after a up to b along one abstract edge.
+        """
+        if self.cluster_of(a) != self.cluster_of(b):
+            return [b]  # an inter-cluster edge joins two adjacent cells
+        _, came_from = self._bfs_in_cluster(a, self.cluster_of(a), b)
+        cells = [b]
+        while cells[-1] != a:
+            cells.append(came_from[cells[-1]])
+        cells.pop()
+        cells.reverse()
+        return cells
@@ -0,0 +1,204 @@
+"""
+Landmark (ALT) heuristic: exact BFS distances from K landmark cells, stored per map.
+
+By the triangle inequality, |d(L, target) - d(L, cell)| never overestimates d(cell, target), and
+around walls it is much closer to the truth than the Manhattan distance. Landmarks.heuristic
+can be passed to engine.astar, engine.greedy_search and engine.ida_star.
+"""
+import hashlib
+import os
+import struct
+from array import array
+import engine
+from grid_map import GridMap, BARRIER
+from wavefront import distance_field, np
+
+_MAGIC = b"LMK1"
+_HEADER = struct.Struct("<4siii20s")  # magic, rows, cols, landmark count, barrier fingerprint
+_UNREACHABLE = -1
+# maps every cell state to 1 for barriers and 0 otherwise
+_BARRIER_MASK = bytes(1 if state == BARRIER else 0 for state in range(256))
+
+
+def barrier_fingerprint(grid_map: GridMap) -> bytes:
+    """
+    Hash the barrier layout of a map (search marks such as open/closed are ignored).
+    Args:
+        grid_map (GridMap): The map.
+    Returns:
+        bytes: A 20-byte digest.
+    """
+    return hashlib.sha1(bytes(grid_map.cells).translate(_BARRIER_MASK)).digest()
+
+
+def distances_from(grid_map: GridMap, source: int) -> array:
+    """
+    BFS distances from one cell to every cell of the map, computed by the wavefront kernel.
+    Args:
+        grid_map (GridMap): The map.
+        source (int): The cell to measure from.
+    Returns:
+        array: One int per cell, -1 where the cell cannot be reached.
+    """
+    distances, _ = distance_field(grid_map, source)
+    if np is None:
+        return distances  # the fallback kernel already fills an array('i')
+    table = array("i")
+    table.frombytes(distances.astype(np.intc, copy=False).tobytes())
+    return table
+
+
+class Landmarks:
+    def __init__(self, grid_map: GridMap, landmarks: list[int], tables: list[array]):
+        """
+        Wrap precomputed landmark tables; use Landmarks.build() or Landmarks.load() to get them.
+        Args:
+            grid_map (GridMap): The map the tables were computed on.
+            landmarks (list[int]): The landmark cells.
+            tables (list[array]): The BFS distances from each landmark.
+        """
+        self.grid_map: GridMap = grid_map
+        self.landmarks: list[int] = landmarks
+        self.tables: list[array] = tables
+
+    @classmethod
+    def build(cls, grid_map: GridMap, count: int = 8) -> "Landmarks":
+        """
+        Pick landmarks by farthest-point selection and compute their distance tables.
+        The first landmark is the cell farthest from an arbitrary free cell; every next one is the
+        free cell farthest from all landmarks chosen so far (unreachable counts as farthest, so
+        every connected region gets a landmark).
+        Args:
+            grid_map (GridMap): The map.
+            count (int): The number of landmarks K.
+        Returns:
+            Landmarks: The landmarks and their tables.
+        """
+        free = [cell for cell, state in enumerate(grid_map.cells) if state != BARRIER]
+        if not free:
+            return cls(grid_map, [], [])
+        far = len(grid_map.cells)  # farther than any real distance
+
+        def distance(table: array, cell: int) -> int:
+            return table[cell] if table[cell] != _UNREACHABLE else far
+
+        # before the first landmark is chosen, "nearest" is measured from the seed cell
+        seed = distances_from(grid_map, free[0])
+        nearest = {cell: distance(seed, cell) for cell in free}
+        landmarks: list[int] = []
+        tables: list[array] = []
+        for _ in range(min(count, len(free))):
+            landmark = max(free, key=lambda cell: (nearest[cell], -cell))
+            table = distances_from(grid_map, landmark)
+            if not landmarks:
+                nearest = {cell: distance(table, cell) for cell in free}
+            else:
+                for cell in free:
+                    nearest[cell] = min(nearest[cell], distance(table, cell))
+            landmarks.append(landmark)
+            tables.append(table)
+        return cls(grid_map, landmarks, tables)
+
+    def heuristic(self, cell: int, target: int) -> float:
+        """
+        The landmark lower bound on the distance from cell to target (never below Manhattan).
+        Args:
+            cell (int): The cell to estimate from.
+            target (int): The target cell.
+        Returns:
+            float: The estimate; inf when a landmark proves the target is in another region.
+        """
+        cols = self.grid_map.cols
+        row, col = divmod(cell, cols)
+        target_row, target_col = divmod(target, cols)
+        best = abs(row - target_row) + abs(col - target_col)
+        for table in self.tables:
+            a = table[cell]
+            b = table[target]
+            if a == _UNREACHABLE or b == _UNREACHABLE:
+                if a != b:
+                    return float("inf")
+                continue
+            bound = a - b if a > b else b - a
+            if bound > best:
+                best = bound
+        return best
+
+    def compare(self, pairs: list[tuple[tuple[int, int], tuple[int, int]]]) -> dict[str, float]:
+        """
+        Run A* on some queries with the Manhattan and with the landmark heuristic.
+        Args:
+            pairs (list[tuple[tuple[int, int], tuple[int, int]]]): The (start, end) position pairs.
+        Returns:
+            dict[str, float]: Total nodes expanded with each heuristic and the relative reduction.
+        """
+        index = self.grid_map.index
+        manhattan = landmark = 0
+        for start, end in pairs:
+            manhattan += engine.astar(self.grid_map, index(*start), index(*end)).expanded
+            landmark += engine.astar(self.grid_map, index(*start), index(*end), heuristic=self.heuristic).expanded
+        return {
+            "manhattan": manhattan,
+            "landmarks": landmark,
+            "reduction": 1 - landmark / manhattan if manhattan else 0.0,
+        }
+
+    def save(self, path: str) -> None:
+        """
+        Write the landmarks and tables to a file, tagged with the map size and barrier fingerprint.
+        Args:
+            path (str): The file to write.
+        Returns:
+            None
+        """
+        grid_map = self.grid_map
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, grid_map.rows, grid_map.cols, len(self.landmarks),
+                                    barrier_fingerprint(grid_map)))
+            array("i", self.landmarks).tofile(file)
+            for table in self.tables:
+                table.tofile(file)
+
+    @classmethod
+    def load(cls, path: str, grid_map: GridMap) -> "Landmarks | None":
+        """
+        Read landmarks saved for this map.
+        Args:
+            path (str): The file to read.
+            grid_map (GridMap): The map they must belong to.
+        Returns:
+            Landmarks | None: The landmarks, or None if the file is missing or was made for other barriers.
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as file:
+            magic, rows, cols, count, fingerprint = _HEADER.unpack(file.read(_HEADER.size))
+            if (magic, rows, cols, fingerprint) != (_MAGIC, grid_map.rows, grid_map.cols, barrier_fingerprint(grid_map)):
+                return None
+            landmarks = array("i")
+            landmarks.fromfile(file, count)
+            tables = []
+            for _ in range(count):
+                table = array("i")
+                table.fromfile(file, rows * cols)
+                tables.append(table)
+        return cls(grid_map, list(landmarks), tables)
+
+    @classmethod
+    def load_or_build(cls, path: str, grid_map: GridMap, count: int = 8) -> "Landmarks":
+        """
+        Load the landmarks stored next to a map, or build and store them if they are missing or stale.
+        Args:
+            path (str): The landmark file, e.g. the map's file name with a ".landmarks" suffix.
+            grid_map (GridMap): The map.
+            count (int): The number of landmarks to build.
+        Returns:
+            Landmarks: The landmarks for the current barriers.
+        """
+        landmarks = cls.load(path, grid_map)
+        # a map with fewer free cells than count gets a landmark on every free cell
+        wanted = min(count, len(grid_map.cells) - bytes(grid_map.cells).translate(_BARRIER_MASK).count(1))
+        if landmarks is None or len(landmarks.landmarks) != wanted:
+            landmarks = cls.build(grid_map, count)
+            landmarks.save(path)
+        return landmarks
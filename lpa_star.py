@@ -0,0 +1,134 @@
+"""
+Lifelong Planning A* (LPA*): an incremental planner for a fixed start and end.
+
+The planner keeps its g / rhs values between runs. After barriers change, report every changed
+cell with update_cell() and call plan() again: only the cells whose distance from start is
+affected are expanded, instead of searching the whole map from scratch. (D* Lite is the same
+algorithm for a moving start; here the endpoints stay put, so LPA* is enough.)
+"""
+from engine import SearchResult
+from grid_map import GridMap, FREE, BARRIER, OPEN, CLOSED, PATH
+from open_set import OpenSet
+
+
+class LPAStar:
+    def __init__(self, grid_map: GridMap, start: int, end: int):
+        """
+        Initialize the planner; nothing is searched until plan() is called.
+        Args:
+            grid_map (GridMap): The map, whose barriers may change between calls to plan().
+            start (int): The starting cell.
+            end (int): The ending cell.
+        """
+        self.grid_map: GridMap = grid_map
+        self.start: int = start
+        self.end: int = end
+        self.end_position: tuple[int, int] = divmod(end, grid_map.cols)
+        # distances from start; a cell is consistent when g == rhs
+        self.g: dict[int, float] = {}
+        self.rhs: dict[int, float] = {start: 0}
+        self.open_set: OpenSet = OpenSet()
+        self.open_set.update(start, self._key(start))
+
+    def _key(self, cell: int) -> tuple[float, float]:
+        """
+        The priority of an inconsistent cell: (min(g, rhs) + h, min(g, rhs)).
+        """
+        row, col = divmod(cell, self.grid_map.cols)
+        end_row, end_col = self.end_position
+        best = min(self.g.get(cell, float("inf")), self.rhs.get(cell, float("inf")))
+        return best + abs(row - end_row) + abs(col - end_col), best
+
+    def _update_vertex(self, cell: int) -> None:
+        """
+        Recompute rhs of a cell from its neighbors and queue it if it became inconsistent.
+        """
+        inf = float("inf")
+        if cell != self.start:
+            if self.grid_map.is_barrier(cell):
+                rhs = inf
+            else:
+                g = self.g
+                rhs = min((g.get(neighbor, inf) + 1 for neighbor in self.grid_map.neighbors(cell)), default=inf)
+            if rhs == inf:
+                self.rhs.pop(cell, None)
+            else:
+                self.rhs[cell] = rhs
+
+        if self.g.get(cell, inf) != self.rhs.get(cell, inf):
+            self.open_set.update(cell, self._key(cell))
+        else:
+            self.open_set.remove(cell)
+
+    def update_cell(self, cell: int) -> None:
+        """
+        Report that a cell became a barrier or was cleared.
+        Args:
+            cell (int): The cell whose barrier state changed.
+        Returns:
+            None
+        """
+        self._update_vertex(cell)
+        for neighbor in self.grid_map.neighbors(cell):
+            self._update_vertex(neighbor)
+
+    def plan(self, on_event: callable = None) -> SearchResult:
+        """
+        Bring the distances up to date and return the shortest path from start to end.
+        Args:
+            on_event (callable): Optional on_event(kind, cell) progress callback.
+        Returns:
+            SearchResult: The path found; expanded counts only the work done by this call.
+        """
+        inf = float("inf")
+        g = self.g
+        rhs = self.rhs
+        open_set = self.open_set
+        end = self.end
+        cells = self.grid_map.cells
+        expanded = 0
+
+        while open_set and (open_set.peek_priority() < self._key(end) or rhs.get(end, inf) != g.get(end, inf)):
+            current = open_set.pop()
+            expanded += 1
+            if g.get(current, inf) > rhs.get(current, inf):
+                # over-consistent: the cell got closer, settle it
+                g[current] = rhs[current]
+                kind = CLOSED
+            else:
+                # under-consistent: the cell got farther (or became a barrier), recompute it too
+                g.pop(current, None)
+                self._update_vertex(current)
+                kind = FREE if cells[current] != BARRIER else None
+            neighbors = self.grid_map.neighbors(current)
+            for neighbor in neighbors:
+                self._update_vertex(neighbor)
+            # report the expansion only once it is complete: on_event may raise SearchCancelled, and
+            # the planner must stay consistent for the next plan()
+            if on_event:
+                if kind is not None:
+                    on_event(kind, current)
+                for neighbor in neighbors:
+                    if neighbor in open_set:
+                        on_event(OPEN, neighbor)
+
+        return self._path(expanded, on_event)
+
+    def _path(self, expanded: int, on_event: callable) -> SearchResult:
+        """
+        Follow the g values back from end to start.
+        """
+        inf = float("inf")
+        g = self.g
+        cost = g.get(self.end, inf)
+        if cost == inf:
+            return SearchResult(False, expanded=expanded)
+
+        cells = [self.end]
+        while cells[-1] != self.start:
+            cells.append(min(self.grid_map.neighbors(cells[-1]), key=lambda cell: g.get(cell, inf)))
+        if on_event:
+            for cell in cells[-2:0:-1]:
+                on_event(PATH, cell)
+        cells.reverse()
+        return SearchResult(True, [self.grid_map.position(cell) for cell in cells], cost, expanded)
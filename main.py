@@ -2,7 +2,18 @@ from utils import *
 from grid import Grid
 from searching_algorithms import *
 from button import Button
+from renderer import Renderer
+from slider import Slider
+from pacing import SPEEDS
+from lpa_star import LPAStar
+from hpa import HierarchicalMap
+from observer import StatsObserver
+from stats_panel import StatsPanel
+from search_thread import SearchThread
+from step_trace import StepTrace, TraceRecorder, TracePlayer
+from map_import import import_map
 import os
+import time
 
 pygame.font.init()
 
@@ -10,9 +21,13 @@ if __name__ == "__main__":
     WIN = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
     pygame.display.set_caption("Path Visualizing Algorithm - Gym Edition")
 
-    BACKGROUND_IMAGE = None
+    GYM_MAP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gym_map.png")
+    # S saves the current barriers, start and end here, L loads them back
+    SAVED_MAP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "saved_map.gmap")
+    # T saves the step trace of the last run here, O replays it
+    SAVED_TRACE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "saved_trace.strc")
 
-    original_image = pygame.image.load(r'D:\Work\Facultate\LabAI\lab03-LeonardStefanut\gym_map.png')
+    original_image = pygame.image.load(GYM_MAP)
     BACKGROUND_IMAGE = pygame.transform.scale(original_image, (WIDTH, HEIGHT))
     print("Background image loaded successfully!")
    
@@ -20,19 +35,26 @@ if __name__ == "__main__":
     ROWS = 50
     COLS = 50
     grid = Grid(WIN, ROWS, COLS, WIDTH, HEIGHT)
+    # walls and equipment of the gym become barriers; CLEAR GRID goes back to this layout
+    gym_cells = import_map(GYM_MAP, ROWS, COLS)
+    grid.load(gym_cells)
 
     start = None
     end = None
     run = True
-    started = False
     selected_algo = None
+    planner = None  # kept after an LPA* run so barrier edits repair its path
+    hierarchy = None  # HPA* abstraction of the grid, built on first use and patched on barrier edits
+    recorder = None  # records every run, so the last one can be replayed (P) or saved (T)
+    player = None  # replays a trace: P plays / pauses, LEFT / RIGHT seek, HOME / END jump
+    playing = False
 
     buttons = []
     button_width = 180
-    button_height = 40
+    button_height = 28
     button_x = WIDTH + (PANEL_WIDTH - button_width) // 2
-    start_y = 50
-    gap = 10
+    start_y = 30
+    gap = 4
 
     algos = [
         ("BFS", bfs),
@@ -42,92 +64,191 @@ if __name__ == "__main__":
         ("Greedy", greedy_search),
         ("DLS (50)", lambda d, g, s, e: dls(d, g, s, e, 50)),
         ("IDS", ids),
-        ("IDA*", ida_star)
+        ("IDA*", ida_star),
+        ("Bi-BFS", bidirectional_bfs),
+        ("Bi-A*", bidirectional_astar),
+        ("JPS", jps),
+        ("JPS+", jps_plus),
+        ("LPA*", lpa_star),
+        ("HPA*", hpa_star)
     ]
 
+    # searches run on a worker thread and reach the grid through runner.pump(), so the window stays
+    # responsive; every run reports to the observer, whose stats are shown live in the panel, and the
+    # loop below reports the frames it renders meanwhile
+    runner = SearchThread(grid)
+    observer = StatsObserver(wait=runner.publish)
+
+    def launch(search):
+        global recorder
+        stop_replay()
+        recorder = TraceRecorder(grid.map, start.cell, end.cell, observer)
+        runner.observer = recorder
+        runner.start(search)
+
     def try_start_algorithm(algo=None, name=None):
-        global started, selected_algo, start, end
+        global selected_algo, start, end, planner, hierarchy
         
         if algo:
             selected_algo = algo
             pygame.display.set_caption(f"Selected Algorithm: {name}")
             print(f"Algorithm selected: {name}")
 
-        if selected_algo and start and end and not started:
-            started = True
-            for row in grid.grid:
-                for spot in row:
-                    spot.update_neighbors(grid.grid)
-            
-            def draw_all():
-                if BACKGROUND_IMAGE:
-                    WIN.blit(BACKGROUND_IMAGE, (0, 0))
-                else:
-                    pygame.draw.rect(WIN, COLORS['WHITE'], (0, 0, WIDTH, HEIGHT))
+        if selected_algo and start and end and not runner.running:
+            # the spots and helpers are bound now: the search runs after this function returns
+            if selected_algo is lpa_star:
+                planner = LPAStar(grid.map, start.cell, end.cell)
+                launch(lambda observer, p=planner, s=start, e=end: lpa_star(observer, grid, s, e, p))
+            elif selected_algo is hpa_star:
+                planner = None
+                if hierarchy is None:
+                    hierarchy = HierarchicalMap(grid.map)
+                launch(lambda observer, h=hierarchy, s=start, e=end: hpa_star(observer, grid, s, e, h))
+            else:
+                planner = None
+                launch(lambda observer, f=selected_algo, s=start, e=end: f(observer, grid, s, e))
 
-                grid.draw()
-                
-                pygame.draw.rect(WIN, COLORS['PANEL_COLOR'], (WIDTH, 0, PANEL_WIDTH, HEIGHT))
-                for btn in buttons:
-                    btn.draw(WIN)
-                
-                pygame.display.update()
+    def repair_path(spot):
+        # tell the HPA* hierarchy and the LPA* planner about a barrier edit; LPA* shows its repaired path
+        if hierarchy:
+            hierarchy.update_cell(spot.cell)
+        if planner and not runner.running:
+            planner.update_cell(spot.cell)
+            launch(lambda observer, p=planner, s=start, e=end: lpa_star(observer, grid, s, e, p))
 
-            selected_algo(draw_all, grid, start, end)
-            started = False
+    def replay(trace):
+        # show the map the trace was recorded on, then play it back from its first step
+        global start, end, planner, hierarchy, player, playing
+        if (trace.rows, trace.cols) != (ROWS, COLS):
+            print(f"The trace is {trace.rows}x{trace.cols}, the grid is {ROWS}x{COLS}")
+            return
+        planner = None
+        hierarchy = None
+        grid.load(trace.cells(), costs=trace.costs)
+        start, end = grid.place_endpoints(trace.start, trace.end)
+        player = TracePlayer(trace, grid.set_state)
+        playing = True
+        pygame.display.set_caption(f"Replay: {trace.algorithm}")
+
+    def stop_replay():
+        global player, playing
+        player = None
+        playing = False
 
     for i, (name, func) in enumerate(algos):
         y = start_y + i * (button_height + gap)
         action = lambda f=func, n=name: try_start_algorithm(f, n)
         buttons.append(Button(button_x, y, button_width, button_height, name, action))
 
+    stats_panel = StatsPanel(button_x, start_y + len(algos) * (button_height + gap) + 6, button_width, 144, observer,
+                             runner)
+    buttons.append(stats_panel)
+
     def clear_grid():
-        global start, end, started, selected_algo
+        global start, end, selected_algo, planner, hierarchy
         start = None
         end = None
-        started = False
         selected_algo = None
-        grid.reset()
+        planner = None
+        hierarchy = None
+        stop_replay()
+        grid.load(gym_cells)
         pygame.display.set_caption("Path Visualizing Algorithm - Gym Edition")
 
+    def open_saved_map():
+        global start, end, planner, hierarchy
+        if not os.path.exists(SAVED_MAP):
+            return
+        planner = None
+        hierarchy = None
+        stop_replay()
+        start, end = grid.open(SAVED_MAP)
+
     clear_button_y = HEIGHT - 100
     buttons.append(Button(button_x, clear_button_y, button_width, button_height, "CLEAR GRID", clear_grid))
 
-    while run:
-        if BACKGROUND_IMAGE:
-            WIN.blit(BACKGROUND_IMAGE, (0, 0))
-        else:
-            pygame.draw.rect(WIN, COLORS['WHITE'], (0, 0, WIDTH, HEIGHT))
+    cancel_button = Button(button_x, clear_button_y - button_height - 2, button_width, button_height, "CANCEL",
+                           runner.cancel)
+    buttons.append(cancel_button)
+
+    def steps_per_frame():
+        # the expansions shown per frame, or None to show everything the search got to (Instant)
+        return SPEEDS[speed_slider.index][1]
 
-        grid.draw()
-        pygame.draw.rect(WIN, COLORS['PANEL_COLOR'], (WIDTH, 0, PANEL_WIDTH, HEIGHT))
-        for button in buttons:
-            button.draw(WIN)
-        pygame.display.update()
+    speed_slider = Slider(button_x, clear_button_y - 70, button_width, button_height + 10,
+                          [label for label, _ in SPEEDS], 1, lambda index: renderer.redraw(speed_slider))
+    buttons.append(speed_slider)
+
+    # what a left click paints once start and end are placed: walls, or terrain that UCS and A* pay to cross
+    BRUSHES = [("Wall", None), ("Cost 1", 1), ("Cost 2", 2), ("Cost 4", 4), ("Cost 8", 8)]
+    brush_slider = Slider(button_x, clear_button_y + button_height + 8, button_width, button_height + 10,
+                          [label for label, _ in BRUSHES], 0, lambda index: renderer.redraw(brush_slider), "Brush")
+    buttons.append(brush_slider)
+
+    renderer = Renderer(WIN, grid, BACKGROUND_IMAGE, buttons)
+
+    clock = pygame.time.Clock()
+    while run:
+        searching = runner.running
+        if searching:
+            runner.pump(steps_per_frame())
+            renderer.redraw(stats_panel)
+        elif playing:
+            player.advance(steps_per_frame())
+            playing = not player.done
+        began = time.perf_counter()
+        renderer.draw()
+        if searching:
+            observer.frame_drawn(time.perf_counter() - began)
+            if not runner.running:
+                renderer.redraw(stats_panel)  # show the last frame in the count
+        clock.tick(60)
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 run = False
 
-            if started:
+            if runner.running:
+                # during a search only the speed slider, CANCEL and Escape respond
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    if speed_slider.is_clicked(event.pos):
+                        speed_slider.click(event.pos)
+                    elif cancel_button.is_clicked(event.pos):
+                        runner.cancel()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    runner.cancel()
                 continue
 
             if pygame.mouse.get_pressed()[0]:
                 pos = pygame.mouse.get_pos()
 
                 if pos[0] < WIDTH:
+                    stop_replay()
                     row, col = grid.get_clicked_pos(pos)
                     if row < ROWS and col < COLS:
-                        spot = grid.grid[row][col]
-                        if not start and spot != end:
-                            start = spot
-                            start.make_start()
-                        elif not end and spot != start:
-                            end = spot
-                            end.make_end()
-                        elif spot != end and spot != start:
-                            spot.make_barrier()
+                        spot = grid.get_spot(row, col)
+                        if (not start and spot != end) or (not end and spot != start):
+                            was_barrier = spot.is_barrier()
+                            if not start:
+                                start = spot
+                                start.make_start()
+                            else:
+                                end = spot
+                                end.make_end()
+                            # the gym walls are barriers too: an endpoint placed on one opens the cell
+                            if was_barrier and hierarchy:
+                                hierarchy.update_cell(spot.cell)
+                        elif spot != end and spot != start and not spot.is_barrier():
+                            cost = BRUSHES[brush_slider.index][1]
+                            if cost is None:
+                                spot.make_barrier()
+                                repair_path(spot)
+                            else:
+                                grid.set_cost(spot.cell, cost)
                 else:
+                    for slider in (speed_slider, brush_slider):
+                        if slider.is_clicked(pos):
+                            slider.click(pos)
                     for button in buttons:
                         if button.is_clicked(pos):
                             if button.action:
@@ -136,14 +257,21 @@ if __name__ == "__main__":
             elif pygame.mouse.get_pressed()[2]:
                 pos = pygame.mouse.get_pos()
                 if pos[0] < WIDTH:
+                    stop_replay()
                     row, col = grid.get_clicked_pos(pos)
                     if row < ROWS and col < COLS:
-                        spot = grid.grid[row][col]
+                        spot = grid.get_spot(row, col)
+                        was_barrier = spot.is_barrier()
                         spot.reset()
+                        grid.set_cost(spot.cell, 1)
                         if spot == start:
                             start = None
+                            planner = None
                         elif spot == end:
                             end = None
+                            planner = None
+                        elif was_barrier:
+                            repair_path(spot)
 
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
@@ -152,4 +280,33 @@ if __name__ == "__main__":
                 if event.key == pygame.K_c:
                     clear_grid()
 
+                if event.key == pygame.K_s:
+                    grid.save(SAVED_MAP, start, end)
+
+                if event.key == pygame.K_l:
+                    open_saved_map()
+
+                if event.key == pygame.K_p:
+                    if player:
+                        if player.done:
+                            player.seek(0)
+                        playing = not playing
+                    elif recorder and recorder.trace and recorder.trace.result:
+                        replay(recorder.trace)
+
+                if player and event.key in (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_HOME, pygame.K_END):
+                    playing = False
+                    jump = max(1, len(player) // 20)
+                    targets = {pygame.K_LEFT: player.position - jump, pygame.K_RIGHT: player.position + jump,
+                               pygame.K_HOME: 0, pygame.K_END: len(player)}
+                    player.seek(targets[event.key])
+
+                if event.key == pygame.K_t and recorder and recorder.trace and recorder.trace.result:
+                    recorder.trace.save(SAVED_TRACE)
+
+                if event.key == pygame.K_o and os.path.exists(SAVED_TRACE):
+                    replay(StepTrace.load(SAVED_TRACE))
+
+    runner.cancel()
+    runner.join()
     pygame.quit()
\ No newline at end of file
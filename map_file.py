@@ -0,0 +1,255 @@
+"""
+Versioned binary map files, loaded through mmap.
+
+Layout (little-endian):
+    header      magic "GMAP", format version, flags, rows, cols, start, end, section count
+    sections    one (tag, count, offset, length) entry per section
+    data        every section, starting on an 8-byte boundary
+
+Sections:
+    BITS    the barrier mask, one bit per cell (bit j of byte k is cell 8k + j)
+    CELL    the barrier mask, one byte per cell (FREE / BARRIER), instead of BITS; it can be used
+            in place, without unpacking, as the cells of a read-only GridMap
+    COST    terrain costs, one byte per cell; count is the map's max_cost. Missing when every cell costs 1
+    COMP    component labels: int32 per cell, then count (label, size) int32 pairs
+    LMRK    landmarks: count int32 landmark cells, then count int32 distance tables of rows * cols
+
+Opening a file only reads the header and the section table. Everything else is sliced out of the
+mapping on demand, so a multi-million-cell map opens in milliseconds, and processes that map the
+same file share its pages read-only.
+"""
+import mmap
+import struct
+import sys
+from array import array
+from components import Components
+from grid_map import GridMap, BARRIER, FREE
+from landmarks import Landmarks, _BARRIER_MASK
+
+FORMAT_VERSION = 1
+_MAGIC = b"GMAP"
+_HEADER = struct.Struct("<4sHHiiiiI")  # magic, format version, flags, rows, cols, start, end, section count
+_SECTION = struct.Struct("<4sIQQ")  # tag, count, offset, length
+_ALIGN = 8
+# drops search marks, start and end: only barriers are stored
+_BARRIER_STATE = bytes(BARRIER if state == BARRIER else FREE for state in range(256))
+# barrier masks (0 / 1 per cell, see landmarks._BARRIER_MASK) to bit characters and back
+_TO_BITS = bytes.maketrans(b"\x00\x01", b"01")
+_FROM_BITS = bytes.maketrans(b"01", bytes([FREE, BARRIER]))
+
+
+def pack_barriers(cells: bytes) -> bytes:
+    """
+    Pack the barrier mask of a cell array into one bit per cell.
+    Args:
+        cells (bytes): One state per cell.
+    Returns:
+        bytes: ceil(len(cells) / 8) bytes; bit j of byte k is set when cell 8k + j is a barrier.
+    """
+    # the reversed mask read as a binary number has cell i as bit i (base 2 conversions are linear time)
+    digits = bytes(cells).translate(_BARRIER_MASK).translate(_TO_BITS)[::-1]
+    return int(digits or b"0", 2).to_bytes((len(cells) + 7) // 8, "little")
+
+
+def unpack_barriers(bits: bytes, size: int) -> bytes:
+    """
+    Expand a packed barrier mask back into one FREE / BARRIER state per cell.
+    Args:
+        bits (bytes): The packed mask.
+        size (int): The number of cells.
+    Returns:
+        bytes: size cell states.
+    """
+    digits = format(int.from_bytes(bits, "little"), "b").encode().rjust(size, b"0")
+    return digits[::-1][:size].translate(_FROM_BITS)
+
+
+def _int_view(buffer) -> memoryview | array:
+    """
+    View little-endian int32 data as ints, in place when the machine is little-endian too.
+    """
+    if sys.byteorder == "little":
+        return memoryview(buffer).cast("i")
+    values = array("i")
+    values.frombytes(buffer)
+    values.byteswap()
+    return values
+
+
+def save_map(path: str, grid_map: GridMap, start: int = -1, end: int = -1, packed: bool = True,
+             components: Components = None, landmarks: Landmarks = None) -> None:
+    """
+    Write a map to a file. Barriers and terrain costs are kept; search marks are not.
+    Args:
+        path (str): The file to write.
+        grid_map (GridMap): The map.
+        start (int): The starting cell, or -1 for none.
+        end (int): The ending cell, or -1 for none.
+        packed (bool): Store the barriers as bits (smallest) instead of bytes (usable in place).
+        components (Components): Optional component labels of the map to store with it.
+        landmarks (Landmarks): Optional landmark tables of the map to store with it.
+    Returns:
+        None
+    """
+    cells = bytes(grid_map.cells)
+    sections: list[tuple[bytes, int, bytes]] = []
+    if packed:
+        sections.append((b"BITS", 0, pack_barriers(cells)))
+    else:
+        sections.append((b"CELL", 0, cells.translate(_BARRIER_STATE)))
+    if grid_map.costs is not None:
+        sections.append((b"COST", grid_map.max_cost, bytes(grid_map.costs)))
+    if components is not None:
+        sizes = array("i", [value for pair in components.sizes.items() for value in pair])
+        sections.append((b"COMP", len(components.sizes), _le_bytes(components.labels) + _le_bytes(sizes)))
+    if landmarks is not None:
+        data = [_le_bytes(array("i", landmarks.landmarks))] + [_le_bytes(array("i", table)) for table in landmarks.tables]
+        sections.append((b"LMRK", len(landmarks.landmarks), b"".join(data)))
+
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table = []
+    for tag, count, data in sections:
+        offset += -offset % _ALIGN
+        table.append(_SECTION.pack(tag, count, offset, len(data)))
+        offset += len(data)
+
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, FORMAT_VERSION, 0, grid_map.rows, grid_map.cols, start, end, len(sections)))
+        file.write(b"".join(table))
+        for tag, count, data in sections:
+            file.write(bytes(-file.tell() % _ALIGN))
+            file.write(data)
+
+
+def _le_bytes(values: array) -> bytes:
+    """
+    The bytes of an int array in little-endian order.
+    """
+    if sys.byteorder == "little":
+        return values.tobytes()
+    swapped = array(values.typecode, values)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+class MapFile:
+    def __init__(self, path: str):
+        """
+        Open a map file; only the header and the section table are read.
+        Args:
+            path (str): The file to open.
+        Raises:
+            ValueError: If the file is not a map file or was written by a newer format version.
+        """
+        with open(path, "rb") as file:
+            self.mapping: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.flags, self.rows, self.cols, start, end, count = _HEADER.unpack_from(self.mapping)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a map file")
+        if version > FORMAT_VERSION:
+            raise ValueError(f"{path} uses map format {version}, this version reads up to {FORMAT_VERSION}")
+        self.version: int = version
+        self.start: int | None = start if start >= 0 else None
+        self.end: int | None = end if end >= 0 else None
+        # tag -> (count, offset, length)
+        self.sections: dict[bytes, tuple[int, int, int]] = {}
+        for i in range(count):
+            tag, count, offset, length = _SECTION.unpack_from(self.mapping, _HEADER.size + i * _SECTION.size)
+            self.sections[tag] = (count, offset, length)
+
+    def __enter__(self) -> "MapFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Unmap the file; views returned with copy=False must be released first.
+        Returns:
+            None
+        """
+        self.mapping.close()
+
+    def _section(self, tag: bytes) -> tuple[int, memoryview] | None:
+        """
+        The count and the data of a section, or None if the file does not have it.
+        """
+        if tag not in self.sections:
+            return None
+        count, offset, length = self.sections[tag]
+        return count, memoryview(self.mapping)[offset:offset + length]
+
+    def cells(self) -> bytes | memoryview:
+        """
+        The FREE / BARRIER state of every cell.
+        Returns:
+            bytes | memoryview: rows * cols states; a view into the mapping for CELL files.
+        """
+        section = self._section(b"CELL")
+        if section is not None:
+            return section[1]
+        return unpack_barriers(self._section(b"BITS")[1], self.rows * self.cols)
+
+    def costs(self) -> memoryview | None:
+        """
+        The terrain cost of every cell.
+        Returns:
+            memoryview | None: rows * cols costs, a view into the mapping, or None if every cell costs 1.
+        """
+        section = self._section(b"COST")
+        return section[1] if section is not None else None
+
+    def grid_map(self, copy: bool = True) -> GridMap:
+        """
+        Build the map stored in the file.
+        Args:
+            copy (bool): Copy the cells and costs into an editable map. Without a copy, the costs
+                and the cells of a CELL file stay in the shared mapping and the map is read-only.
+        Returns:
+            GridMap: The map.
+        """
+        grid_map = GridMap(0, 0)
+        grid_map.rows, grid_map.cols = self.rows, self.cols
+        cells = self.cells()
+        grid_map.cells = bytearray(cells) if copy else cells
+        section = self._section(b"COST")
+        if section is not None:
+            grid_map.max_cost, costs = section
+            grid_map.costs = bytearray(costs) if copy else costs
+        return grid_map
+
+    def components(self, grid_map: GridMap) -> Components | None:
+        """
+        The component labels stored in the file.
+        Args:
+            grid_map (GridMap): The map they belong to (see grid_map()).
+        Returns:
+            Components | None: The labels, or None if the file has none.
+        """
+        section = self._section(b"COMP")
+        if section is None:
+            return None
+        count, data = section
+        size = self.rows * self.cols
+        labels = array("i")
+        labels.frombytes(data[:4 * size])
+        pairs = _int_view(data[4 * size:4 * (size + 2 * count)])
+        return Components.from_labels(grid_map, labels, {pairs[i]: pairs[i + 1] for i in range(0, 2 * count, 2)})
+
+    def landmarks(self, grid_map: GridMap) -> Landmarks | None:
+        """
+        The landmark tables stored in the file, read in place from the mapping.
+        Args:
+            grid_map (GridMap): The map they belong to (see grid_map()).
+        Returns:
+            Landmarks | None: The landmarks, or None if the file has none.
+        """
+        section = self._section(b"LMRK")
+        if section is None:
+            return None
+        count, data = section
+        size = self.rows * self.cols
+        values = _int_view(data)
+        tables = [values[count + size * i:count + size * (i + 1)] for i in range(count)]
+        return Landmarks(grid_map, list(values[:count]), tables)
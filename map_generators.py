@@ -0,0 +1,134 @@
+"""
+Reproducible maps for benchmarking: every generator is a pure function of its size and seed.
+"""
+import os
+import random
+from grid_map import GridMap, BARRIER, FREE
+from map_import import import_map
+
+GYM_MAP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gym_map.png")
+
+
+def random_obstacles(rows: int, cols: int, density: float = 0.25, seed: int = 0) -> GridMap:
+    """
+    Scatter barriers uniformly at random.
+    Args:
+        rows (int): Number of rows in the map.
+        cols (int): Number of columns in the map.
+        density (float): The probability of each cell being a barrier.
+        seed (int): The random seed.
+    Returns:
+        GridMap: The generated map.
+    """
+    rng = random.Random(seed)
+    grid_map = GridMap(rows, cols)
+    grid_map.cells[:] = bytes(BARRIER if rng.random() < density else FREE for _ in range(rows * cols))
+    return grid_map
+
+
+def recursive_maze(rows: int, cols: int, seed: int = 0) -> GridMap:
+    """
+    A perfect maze carved by the recursive backtracker (with an explicit stack, so size is not
+    limited by the recursion limit). Rooms sit on even (row, col) and walls in between.
+    Args:
+        rows (int): Number of rows in the map.
+        cols (int): Number of columns in the map.
+        seed (int): The random seed.
+    Returns:
+        GridMap: The generated map.
+    """
+    rng = random.Random(seed)
+    grid_map = GridMap(rows, cols)
+    cells = grid_map.cells
+    cells[:] = bytes([BARRIER]) * (rows * cols)
+    cells[0] = FREE
+    stack = [(0, 0)]
+    while stack:
+        row, col = stack[-1]
+        options = [(row + d_row, col + d_col) for d_row, d_col in ((2, 0), (-2, 0), (0, 2), (0, -2))
+                   if 0 <= row + d_row < rows and 0 <= col + d_col < cols
+                   and cells[(row + d_row) * cols + col + d_col] == BARRIER]
+        if not options:
+            stack.pop()
+            continue
+        next_row, next_col = rng.choice(options)
+        cells[((row + next_row) // 2) * cols + (col + next_col) // 2] = FREE
+        cells[next_row * cols + next_col] = FREE
+        stack.append((next_row, next_col))
+    return grid_map
+
+
+def rooms_and_corridors(rows: int, cols: int, seed: int = 0, room_size: int = 12) -> GridMap:
+    """
+    Rectangular rooms on a lattice, separated by walls with one or two doors per wall.
+    Args:
+        rows (int): Number of rows in the map.
+        cols (int): Number of columns in the map.
+        seed (int): The random seed.
+        room_size (int): The mean side of a room, in cells.
+    Returns:
+        GridMap: The generated map.
+    """
+    rng = random.Random(seed)
+    grid_map = GridMap(rows, cols)
+    cells = grid_map.cells
+
+    def cuts(length: int) -> list[int]:
+        # wall positions, spaced room_size apart give or take a third
+        positions = []
+        position = 0
+        while True:
+            position += rng.randint(max(3, room_size * 2 // 3), max(3, room_size * 4 // 3))
+            if position >= length - 2:
+                return positions
+            positions.append(position)
+
+    row_walls = cuts(rows)
+    col_walls = cuts(cols)
+    for row in row_walls:
+        cells[row * cols:(row + 1) * cols] = bytes([BARRIER]) * cols
+    for col in col_walls:
+        for row in range(rows):
+            cells[row * cols + col] = BARRIER
+
+    # doors: every wall segment between two crossings gets one or two gaps
+    row_bounds = [-1] + row_walls + [rows]
+    col_bounds = [-1] + col_walls + [cols]
+    for row in row_walls:
+        for left, right in zip(col_bounds, col_bounds[1:]):
+            if right - left > 1:
+                for _ in range(rng.randint(1, 2)):
+                    cells[row * cols + rng.randrange(left + 1, right)] = FREE
+    for col in col_walls:
+        for top, bottom in zip(row_bounds, row_bounds[1:]):
+            if bottom - top > 1:
+                for _ in range(rng.randint(1, 2)):
+                    cells[rng.randrange(top + 1, bottom) * cols + col] = FREE
+    return grid_map
+
+
+def gym_map(rows: int, cols: int, seed: int = 0, path: str = GYM_MAP_PATH) -> GridMap:
+    """
+    Rasterize the gym floor plan with map_import: walls, equipment and text are barriers.
+    Args:
+        rows (int): Number of rows in the map (the image x axis, as drawn by Grid).
+        cols (int): Number of columns in the map (the image y axis).
+        seed (int): Unused; accepted so every generator has the same signature.
+        path (str): The image to rasterize.
+    Returns:
+        GridMap: The generated map.
+    """
+    grid_map = GridMap(rows, cols)
+    grid_map.cells[:] = import_map(path, rows, cols)
+    return grid_map
+
+
+# generator name -> generator(rows, cols, seed)
+GENERATORS: dict[str, callable] = {
+    "random10": lambda rows, cols, seed=0: random_obstacles(rows, cols, 0.10, seed),
+    "random25": lambda rows, cols, seed=0: random_obstacles(rows, cols, 0.25, seed),
+    "random40": lambda rows, cols, seed=0: random_obstacles(rows, cols, 0.40, seed),
+    "maze": recursive_maze,
+    "rooms": rooms_and_corridors,
+    "gym": gym_map,
+}
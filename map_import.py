@@ -0,0 +1,90 @@
+"""
+Map importer: turns a floor-plan image into grid cells.
+
+The image is decoded once into a pixel array and every pixel is classified (dark enough to be a
+wall, or the nearest color of a palette). The classes are then averaged over the block of pixels
+behind every cell with NumPy reductions, so the cost does not depend on Python loops over pixels.
+Thin walls survive the downsampling because a cell becomes a barrier as soon as a small share of its
+pixels is dark. The resulting cells are cached on disk, keyed by the image hash, the resolution and
+the settings, so later startups skip the decode and scaling altogether.
+"""
+import hashlib
+import os
+import numpy as np
+from grid_map import BARRIER, FREE
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".map_cache")
+# hashed into every cache key: change it whenever the rasterizer changes, so older masks are not served
+_RASTERIZER = "numpy-blocks"
+
+
+def import_map(path: str, rows: int, cols: int, threshold: int = 110, coverage: float = 0.08,
+               palette: dict[tuple[int, int, int], int] = None, cache_dir: str | None = CACHE_DIR) -> bytes:
+    """
+    Rasterize an image into one value per cell.
+    Args:
+        path (str): The image file.
+        rows (int): Number of rows; rows run along the image x axis, as Grid draws them.
+        cols (int): Number of columns, along the image y axis.
+        threshold (int): A pixel is dark when its brightest channel is below this.
+        coverage (float): The share of dark pixels that makes a cell a barrier.
+        palette (dict[tuple[int, int, int], int]): Optional (r, g, b) color -> cell value map. Every
+            cell then takes the value of the palette color closest to most of its pixels, instead of
+            the dark/light split.
+        cache_dir (str | None): Where processed maps are cached; None disables the cache.
+    Returns:
+        bytes: rows * cols cell values, indexed as row * cols + col.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    key = hashlib.sha1(data)
+    key.update(repr((_RASTERIZER, rows, cols, threshold, coverage, sorted(palette.items()) if palette else None)).encode())
+    cache_path = os.path.join(cache_dir, f"{key.hexdigest()}_{rows}x{cols}.cells") if cache_dir else None
+
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, "rb") as file:
+            cells = file.read()
+        if len(cells) == rows * cols:
+            return cells
+
+    cells = _rasterize(path, rows, cols, threshold, coverage, palette)
+
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_path, "wb") as file:
+            file.write(cells)
+    return cells
+
+
+def _rasterize(path: str, rows: int, cols: int, threshold: int, coverage: float,
+               palette: dict[tuple[int, int, int], int] | None) -> bytes:
+    """
+    The vectorized importer: per-pixel classes, summed over every cell's block with reduceat.
+    """
+    import pygame  # only decoding needs it
+
+    pixels = pygame.surfarray.array3d(pygame.image.load(path))  # (width, height, 3), x first
+    width, height = pixels.shape[:2]
+    x_edges = np.arange(rows) * width // rows
+    y_edges = np.arange(cols) * height // cols
+    # when upsampling, consecutive edges repeat: reduceat then yields the single pixel at the edge
+    areas = np.maximum(np.outer(np.diff(np.append(x_edges, width)), np.diff(np.append(y_edges, height))), 1)
+
+    def block_share(mask):
+        # the share of every cell's pixels for which mask holds
+        counts = np.add.reduceat(np.add.reduceat(mask.astype(np.int32), x_edges, axis=0), y_edges, axis=1)
+        return counts / areas
+
+    if palette is None:
+        dark = pixels.max(axis=2) < threshold
+        cells = np.where(block_share(dark) >= coverage, BARRIER, FREE)
+    else:
+        colors = np.array(list(palette), dtype=np.int32)
+        values = np.array(list(palette.values()), dtype=np.uint8)
+        # nearest palette color of every pixel, then the most common one in every cell
+        distances = ((pixels[:, :, None, :].astype(np.int32) - colors) ** 2).sum(axis=3)
+        nearest = distances.argmin(axis=2)
+        shares = np.stack([block_share(nearest == index) for index in range(len(colors))])
+        cells = values[shares.argmax(axis=0)]
+    return np.ascontiguousarray(cells, dtype=np.uint8).tobytes()
+
@@ -0,0 +1,201 @@
+"""
+Observers of a visualized search run.
+
+The wrappers in searching_algorithms.py report to a SearchObserver instead of calling a bare draw
+function: on_start() when the run begins, on_event() for every engine progress event, on_frame()
+whenever a frame may be drawn and on_finish() with the result. StatsObserver turns these into a
+RunStats that can be shown while the search is still running.
+"""
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from engine import SearchResult
+from grid_map import FREE, OPEN, CLOSED, OPEN_BACKWARD, CLOSED_BACKWARD
+
+
+@dataclass
+class RunStats:
+    """
+    The statistics of a single run, counted from its progress events.
+    Attributes:
+        algorithm (str): The name of the algorithm.
+        expanded (int): The number of expansions (CLOSED events).
+        pushed (int): The number of cells added to an open set (OPEN events).
+        reexpanded (int): The expansions of cells that had already been expanded in this run.
+        peak_open (int): The largest number of cells open at once.
+        path_length (int): The number of cells on the path (0 if none was found).
+        cost (float): The cost of the path (inf if none was found).
+        found (bool | None): True/False once the run finished, None while it runs or if it was cancelled.
+        finished (bool): True once the run ended, cancelled or not.
+        search_time (float): Seconds spent searching, i.e. outside the frame callback.
+        draw_time (float): Seconds spent rendering frames: in the frame callback, or on the UI thread
+            for a run on a worker thread (see StatsObserver.frame_drawn).
+        frames (int): The number of frames actually rendered.
+        wait_time (float): Seconds a run on a worker thread waited for the display to catch up.
+    """
+    algorithm: str = ""
+    expanded: int = 0
+    pushed: int = 0
+    reexpanded: int = 0
+    peak_open: int = 0
+    path_length: int = 0
+    cost: float = float("inf")
+    found: bool | None = None
+    finished: bool = False
+    search_time: float = 0.0
+    draw_time: float = 0.0
+    frames: int = 0
+    wait_time: float = 0.0
+
+
+class SearchObserver:
+    """Base observer: every hook does nothing, so subclasses only override what they need."""
+
+    # True if the observer applies the events to the grid itself (e.g. from another thread, see
+    # search_thread.py); the wrappers then leave the grid alone
+    paints: bool = False
+
+    def on_start(self, algorithm: str) -> None:
+        """
+        Called once before the search starts.
+        Args:
+            algorithm (str): The name of the algorithm.
+        Returns:
+            None
+        """
+
+    def on_event(self, kind: int, cell: int) -> None:
+        """
+        Called for every engine progress event, after the grid was updated (unless paints is set).
+        Args:
+            kind (int): The event kind (a cell state from grid_map).
+            cell (int): The cell the event is about.
+        Returns:
+            None
+        """
+
+    def on_frame(self) -> None:
+        """
+        Called whenever the run reached a point worth showing; may raise SearchCancelled.
+        Returns:
+            None
+        """
+
+    def on_finish(self, result: SearchResult | None) -> None:
+        """
+        Called once after the search, with None if it was cancelled.
+        Args:
+            result (SearchResult | None): The outcome of the search.
+        Returns:
+            None
+        """
+
+
+class DrawObserver(SearchObserver):
+    def __init__(self, draw: callable):
+        """
+        Adapt a bare draw callable to the observer interface.
+        Args:
+            draw (callable): Called on every frame.
+        """
+        self.draw: callable = draw
+
+    def on_frame(self) -> None:
+        self.draw()
+
+
+def as_observer(observer: SearchObserver | Callable) -> SearchObserver:
+    """
+    Accept either an observer or, as before, a bare draw callable.
+    Args:
+        observer (SearchObserver | Callable): The observer or draw function.
+    Returns:
+        SearchObserver: The observer to report to.
+    """
+    if isinstance(observer, SearchObserver):
+        return observer
+    return DrawObserver(observer)
+
+
+class StatsObserver(SearchObserver):
+    def __init__(self, draw: callable = None, wait: callable = None):
+        """
+        Collect the RunStats of every run.
+        Args:
+            draw (callable): Called on every frame; it returns True when it actually rendered one.
+            wait (callable): Called on every frame instead of draw when the run is on a worker thread
+                (e.g. SearchThread.publish); its time counts as wait_time. The UI thread then reports
+                the frames it renders with frame_drawn().
+        """
+        self.draw: callable = draw
+        self.wait: callable = wait
+        self.stats: RunStats = RunStats()
+        self.open: set[int] = set()
+        self.closed: set[int] = set()
+        self.started_at: float = 0.0
+        # seconds the searching thread spent in draw or wait, left out of search_time
+        self.paused: float = 0.0
+
+    def on_start(self, algorithm: str) -> None:
+        self.stats = RunStats(algorithm)
+        self.open.clear()
+        self.closed.clear()
+        self.started_at = time.perf_counter()
+        self.paused = 0.0
+
+    def on_event(self, kind: int, cell: int) -> None:
+        stats = self.stats
+        if kind == OPEN or kind == OPEN_BACKWARD:
+            stats.pushed += 1
+            self.open.add(cell)
+            if len(self.open) > stats.peak_open:
+                stats.peak_open = len(self.open)
+        elif kind == CLOSED or kind == CLOSED_BACKWARD:
+            stats.expanded += 1
+            self.open.discard(cell)
+            if cell in self.closed:
+                stats.reexpanded += 1
+            else:
+                self.closed.add(cell)
+        elif kind == FREE:
+            # a restarting search (IDS, IDA*) wiped the cell; expanding it again still counts as a re-expansion
+            self.open.discard(cell)
+
+    def on_frame(self) -> None:
+        if self.draw is None and self.wait is None:
+            return
+        stats = self.stats
+        began = time.perf_counter()
+        stats.search_time = began - self.started_at - self.paused
+        drawn = False
+        try:
+            drawn = self.draw() if self.draw else self.wait()
+        finally:
+            elapsed = time.perf_counter() - began
+            self.paused += elapsed
+            if self.draw:
+                stats.draw_time += elapsed
+                if drawn:
+                    stats.frames += 1
+            else:
+                stats.wait_time += elapsed
+
+    def frame_drawn(self, seconds: float) -> None:
+        """
+        Count a frame rendered on the UI thread while a run goes on in a worker thread.
+        Args:
+            seconds (float): How long rendering it took.
+        Returns:
+            None
+        """
+        self.stats.frames += 1
+        self.stats.draw_time += seconds
+
+    def on_finish(self, result: SearchResult | None) -> None:
+        stats = self.stats
+        stats.search_time = time.perf_counter() - self.started_at - self.paused
+        stats.finished = True
+        if result is not None:
+            stats.found = result.found
+            stats.path_length = len(result.path)
+            stats.cost = result.cost
@@ -0,0 +1,173 @@
+"""
+Open sets shared by the best-first searches (A*, UCS, Greedy) and the incremental planner.
+
+OpenSet is a binary heap and takes any priorities. BucketQueue is Dial's bucket queue: for the
+small integer priorities of UCS and A* on integer costs, every push and pop is O(1) instead of
+O(log n), and it keeps the same first-in first-out order among ties.
+"""
+from collections import deque
+from heapq import heappush, heappop
+
+
+class OpenSet:
+    def __init__(self):
+        """
+        A binary heap of (priority, order, cell) entries with lazy deletion.
+        Pushing a cell that is already open with a better priority stands in for decrease-key:
+        the new entry wins and the old one is skipped when it reaches the top. Ties are broken
+        first-in first-out. Unlike queue.PriorityQueue there is no lock on push/pop.
+        """
+        self.heap: list[tuple[float, int, int]] = []
+        self.priority: dict[int, float] = {}  # the live priority of every open cell
+        self.count: int = 0
+
+    def __len__(self) -> int:
+        return len(self.priority)
+
+    def __contains__(self, cell: int) -> bool:
+        return cell in self.priority
+
+    def push(self, cell: int, priority: float) -> bool:
+        """
+        Open a cell, or lower the priority of an open one.
+        Args:
+            cell (int): The cell to open.
+            priority (float): Its priority; lower is popped first.
+        Returns:
+            bool: True if the entry was added, False if the cell was already open with a priority at least as good.
+        """
+        if cell in self.priority and priority >= self.priority[cell]:
+            return False
+        self.priority[cell] = priority
+        self.count += 1
+        heappush(self.heap, (priority, self.count, cell))
+        return True
+
+    def update(self, cell: int, priority: float) -> None:
+        """
+        Open a cell or set the priority of an open one, whether it goes down or up.
+        Args:
+            cell (int): The cell.
+            priority (float): Its new priority.
+        Returns:
+            None
+        """
+        self.priority[cell] = priority
+        self.count += 1
+        heappush(self.heap, (priority, self.count, cell))
+
+    def remove(self, cell: int) -> None:
+        """
+        Take a cell out of the open set, if it is there.
+        Args:
+            cell (int): The cell.
+        Returns:
+            None
+        """
+        self.priority.pop(cell, None)
+
+    def peek_priority(self) -> float:
+        """
+        Get the lowest priority in the open set without removing its cell.
+        Returns:
+            float: The lowest priority, or inf if the open set is empty.
+        """
+        heap = self.heap
+        while heap and self.priority.get(heap[0][2]) != heap[0][0]:
+            heappop(heap)
+        return heap[0][0] if heap else float("inf")
+
+    def pop(self) -> int:
+        """
+        Remove and return the open cell with the lowest priority.
+        Returns:
+            int: The cell.
+        """
+        heap = self.heap
+        priority = self.priority
+        while heap:
+            value, _, cell = heappop(heap)
+            if priority.get(cell) == value:
+                del priority[cell]
+                return cell
+        raise IndexError("pop from an empty open set")
+
+
+class BucketQueue:
+    def __init__(self, span: int):
+        """
+        A monotone bucket queue with lazy deletion, for integer priorities.
+        It is monotone: a pushed priority must lie between the last popped priority and that plus
+        span, which holds for UCS with edge costs up to span and for A* with a consistent integer
+        heuristic and edge costs up to span - 1. The first push places the cursor, so it must have
+        the lowest priority of the whole run (the start cell). The buckets form a ring of span + 1 entries, so
+        memory does not depend on the path cost.
+        Args:
+            span (int): The largest difference between a pushed and the last popped priority.
+        """
+        self.buckets: list[deque[int]] = [deque() for _ in range(span + 1)]
+        self.priority: dict[int, int] = {}  # the live priority of every open cell
+        # the priority under the cursor, set by the first push; no open cell has a lower one
+        self.current: int | None = None
+
+    def __len__(self) -> int:
+        return len(self.priority)
+
+    def __contains__(self, cell: int) -> bool:
+        return cell in self.priority
+
+    def push(self, cell: int, priority: int) -> bool:
+        """
+        Open a cell, or lower the priority of an open one.
+        Args:
+            cell (int): The cell to open.
+            priority (int): Its priority, within span of the last popped one.
+        Returns:
+            bool: True if the entry was added, False if the cell was already open with a priority at least as good.
+        """
+        if cell in self.priority and priority >= self.priority[cell]:
+            return False
+        if self.current is None:
+            # the first priority may be far from 0 (e.g. an A* estimate)
+            self.current = priority
+        self.priority[cell] = priority
+        self.buckets[priority % len(self.buckets)].append(cell)
+        return True
+
+    def _advance(self) -> deque[int]:
+        """
+        Move the cursor to the first bucket whose front entry is live and return that bucket.
+        """
+        buckets = self.buckets
+        priority = self.priority
+        size = len(buckets)
+        while True:
+            bucket = buckets[self.current % size]
+            while bucket:
+                if priority.get(bucket[0]) == self.current:
+                    return bucket
+                bucket.popleft()  # stale: the cell was popped or pushed again with a lower priority
+            self.current += 1
+
+    def peek_priority(self) -> float:
+        """
+        Get the lowest priority in the open set without removing its cell.
+        Returns:
+            float: The lowest priority, or inf if the open set is empty.
+        """
+        if not self.priority:
+            return float("inf")
+        self._advance()
+        return self.current
+
+    def pop(self) -> int:
+        """
+        Remove and return the open cell with the lowest priority.
+        Returns:
+            int: The cell.
+        """
+        if not self.priority:
+            raise IndexError("pop from an empty open set")
+        cell = self._advance().popleft()
+        del self.priority[cell]
+        return cell
@@ -0,0 +1,17 @@
+"""
+The speeds offered for showing a visualized search.
+
+The search itself runs flat out on a worker thread (see search_thread.py) and the window keeps its
+own frame rate; a speed only decides how many search steps the UI thread shows per frame.
+"""
+
+# (label, steps_per_frame) settings offered by the speed slider, slowest first; None shows every
+# step the search (or a replay) got to since the last frame
+SPEEDS = [
+    ("1 / frame", 1),
+    ("5 / frame", 5),
+    ("25 / frame", 25),
+    ("100 / frame", 100),
+    ("500 / frame", 500),
+    ("Instant", None),
+]
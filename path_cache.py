@@ -0,0 +1,110 @@
+"""
+Versioned LRU cache in front of the engine's searches.
+
+Entries are keyed by (algorithm, start, end, map, map version), so any barrier edit makes the old
+entries unreachable; they are evicted like any other least recently used entry. Versions count per
+map, so the map itself is part of the key and one cache can serve several maps.
+"""
+from collections import OrderedDict
+from dataclasses import replace
+import engine
+from engine import SearchResult
+from grid_map import GridMap, PATH
+
+
+class PathCache:
+    def __init__(self, max_size: int = 1024):
+        """
+        Initialize an empty cache.
+        Args:
+            max_size (int): The maximum number of results kept.
+        """
+        self.max_size: int = max_size
+        # key -> (map, result); holding the map keeps its id from being reused while the entry lives
+        self.entries: OrderedDict[tuple, tuple[GridMap, SearchResult]] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, algorithm: str, grid_map: GridMap, start: int, end: int) -> SearchResult | None:
+        """
+        Look up a result, counting a hit or a miss.
+        Args:
+            algorithm (str): The name of the algorithm.
+            grid_map (GridMap): The map the query runs on.
+            start (int): The starting cell.
+            end (int): The ending cell.
+        Returns:
+            SearchResult | None: The cached result with expanded set to 0, or None on a miss.
+        """
+        key = (algorithm, start, end, id(grid_map), grid_map.version)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return replace(entry[1], expanded=0)
+
+    def put(self, algorithm: str, grid_map: GridMap, start: int, end: int, result: SearchResult) -> None:
+        """
+        Store a result, evicting the least recently used one if the cache is full.
+        Args:
+            algorithm (str): The name of the algorithm.
+            grid_map (GridMap): The map the query ran on.
+            start (int): The starting cell.
+            end (int): The ending cell.
+            result (SearchResult): The result to keep.
+        Returns:
+            None
+        """
+        key = (algorithm, start, end, id(grid_map), grid_map.version)
+        self.entries[key] = (grid_map, result)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def search(self, grid_map: GridMap, start: int, end: int, algorithm: str = "astar") -> SearchResult:
+        """
+        Answer a query from the cache, or run it and remember the result.
+        Args:
+            grid_map (GridMap): The map to search.
+            start (int): The starting cell.
+            end (int): The ending cell.
+            algorithm (str): A key of engine.ALGORITHMS.
+        Returns:
+            SearchResult: The path found and the search statistics (expanded is 0 on a hit).
+        """
+        result = self.get(algorithm, grid_map, start, end)
+        if result is None:
+            if algorithm not in engine.ALGORITHMS:
+                raise ValueError(f"Unknown algorithm: {algorithm}")
+            result = engine.ALGORITHMS[algorithm](grid_map, start, end)
+            self.put(algorithm, grid_map, start, end, result)
+        return result
+
+    def clear(self) -> None:
+        """
+        Drop every entry and reset the counters.
+        Returns:
+            None
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def replay(grid_map: GridMap, result: SearchResult, on_event: callable) -> None:
+    """
+    Report the inner cells of a result's path as PATH events, as if the search had just found it.
+    Args:
+        grid_map (GridMap): The map the result belongs to.
+        result (SearchResult): The result to replay.
+        on_event (callable): The on_event(kind, cell) callback.
+    Returns:
+        None
+    """
+    for position in reversed(result.path[1:-1]):
+        on_event(PATH, grid_map.index(*position))
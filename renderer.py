@@ -0,0 +1,120 @@
+from utils import *
+from grid import Grid
+from button import Button
+
+class Renderer:
+    def __init__(self, win: pygame.Surface, grid: Grid, background: pygame.Surface | None, buttons: list[Button]):
+        """
+        Incremental renderer: after the first frame, only the cells and buttons that changed are
+        redrawn and only their rectangles are pushed to the display.
+        Args:
+            win (pygame.Surface): The Pygame surface (window) to draw on.
+            grid (Grid): The grid to draw; its dirty cells are consumed on every frame.
+            background (pygame.Surface | None): The image behind the grid, or None for a white background.
+            buttons (list[Button]): The buttons of the side panel.
+        """
+        self.win: pygame.Surface = win
+        self.grid: Grid = grid
+        self.buttons: list[Button] = buttons
+        # the backdrop is composited once; a cell is cleared by copying its rectangle back from it
+        self.background: pygame.Surface = pygame.Surface((grid.width, grid.height))
+        if background:
+            self.background.blit(background, (0, 0))
+        else:
+            self.background.fill(COLORS['WHITE'])
+        self.hovered: Button | None = None
+        self.pending: list[Button] = []
+        self.full_redraw: bool = True
+
+    def invalidate(self) -> None:
+        """
+        Request a full redraw on the next frame (e.g. after the buttons changed).
+        Returns:
+            None
+        """
+        self.full_redraw = True
+
+    def redraw(self, button: Button) -> None:
+        """
+        Request a redraw of a single panel widget on the next frame (e.g. after its value changed).
+        Args:
+            button (Button): The widget to redraw.
+        Returns:
+            None
+        """
+        self.pending.append(button)
+
+    def draw(self) -> None:
+        """
+        Draw one frame, pushing only the changed rectangles to the display.
+        Returns:
+            None
+        """
+        if self.full_redraw or self.grid.redraw_all:
+            self._draw_everything()
+            return
+
+        mouse_pos = pygame.mouse.get_pos()
+        rects = [self._draw_cell(cell) for cell in self.grid.dirty]
+        self.grid.dirty.clear()
+
+        hovered = self._hovered_button(mouse_pos)
+        if hovered is not self.hovered:
+            self.pending += [button for button in (self.hovered, hovered) if button]
+            self.hovered = hovered
+        for button in self.pending:
+            button.draw(self.win, mouse_pos)
+            rects.append(button.rect)
+        self.pending.clear()
+
+        if rects:
+            pygame.display.update(rects)
+
+    def _draw_everything(self) -> None:
+        """
+        Draw the whole window and push it to the display.
+        Returns:
+            None
+        """
+        mouse_pos = pygame.mouse.get_pos()
+        self.win.blit(self.background, (0, 0))
+        self.grid.draw()
+        self.grid.dirty.clear()
+        self.grid.redraw_all = False
+
+        pygame.draw.rect(self.win, COLORS['PANEL_COLOR'], (self.grid.width, 0, PANEL_WIDTH, self.grid.height))
+        for button in self.buttons:
+            button.draw(self.win, mouse_pos)
+        self.hovered = self._hovered_button(mouse_pos)
+        self.pending.clear()
+        self.full_redraw = False
+
+        pygame.display.update()
+
+    def _draw_cell(self, cell: int) -> pygame.Rect:
+        """
+        Redraw a single cell over its piece of the background.
+        Args:
+            cell (int): The flat index of the cell.
+        Returns:
+            pygame.Rect: The rectangle that was redrawn.
+        """
+        rect = pygame.Rect(self.grid.cell_rect(cell))
+        self.win.blit(self.background, rect, rect)
+        color = self.grid.cell_color(cell)
+        if color:
+            pygame.draw.rect(self.win, color, rect)
+        return rect
+
+    def _hovered_button(self, mouse_pos: tuple[int, int]) -> Button | None:
+        """
+        Get the button under the mouse, if any.
+        Args:
+            mouse_pos (tuple[int, int]): The (x, y) position of the mouse.
+        Returns:
+            Button | None: The hovered button, or None.
+        """
+        for button in self.buttons:
+            if button.is_hovered(mouse_pos):
+                return button
+        return None
@@ -0,0 +1,196 @@
+"""
+Runs a visualized search in a worker thread, so the window stays responsive during long searches.
+
+The worker runs a search wrapper from searching_algorithms.py with a SearchThread as its observer.
+The wrapper then leaves the grid alone: its progress events are collected into batches of (kind,
+cell) deltas and handed to the UI thread through a bounded queue. The UI thread applies them with
+pump() at its own frame rate, and cancel() stops the worker at its next step. At slow speeds the
+queue fills up and the worker waits for the display, so it never runs far ahead of what is shown.
+"""
+import queue
+import threading
+from collections.abc import Callable
+from engine import SearchCancelled, SearchResult
+from grid import Grid
+from grid_map import START, END, CLOSED, CLOSED_BACKWARD, PATH
+from observer import SearchObserver
+
+
+class SearchThread(SearchObserver):
+    paints = True
+
+    def __init__(self, grid: Grid, observer: SearchObserver = None, batch_size: int = 256, max_batches: int = 64):
+        """
+        Initialize an idle search thread.
+        Args:
+            grid (Grid): The grid the deltas are applied to, on the UI thread.
+            observer (SearchObserver): Told about the run on the worker thread, e.g. a StatsObserver.
+                Pass publish as its wait function: waiting for the display then counts as wait time
+                instead of search time.
+            batch_size (int): How many deltas are handed to the UI thread at once.
+            max_batches (int): How many batches may wait in the queue before the worker blocks.
+        """
+        self.grid: Grid = grid
+        self.observer: SearchObserver = observer or SearchObserver()
+        self.batch_size: int = batch_size
+        self.deltas: queue.Queue[list[tuple[int, int]] | None] = queue.Queue(max_batches)
+        self.batch: list[tuple[int, int]] = []  # filled by the worker
+        self.applying: list[tuple[int, int]] = []  # being applied by the UI thread
+        self.applied: int = 0
+        self.cancelled: threading.Event = threading.Event()
+        self.thread: threading.Thread | None = None
+        self.finished: bool = True
+        self.error: BaseException | None = None
+
+    @property
+    def running(self) -> bool:
+        """
+        Whether a run is under way, or its last deltas are still waiting to be applied.
+        """
+        return not self.finished
+
+    @property
+    def backlog(self) -> int:
+        """
+        Roughly how many deltas wait for the UI thread.
+        """
+        return self.deltas.qsize() * self.batch_size + len(self.applying) - self.applied
+
+    def start(self, search: Callable[[SearchObserver], bool]) -> None:
+        """
+        Clear the marks of the last search and start a new one in the background.
+        Args:
+            search (Callable[[SearchObserver], bool]): Runs the search with the given observer,
+                e.g. lambda observer: astar(observer, grid, start, end).
+        Returns:
+            None
+        Raises:
+            RuntimeError: If a search is already running.
+        """
+        if self.running:
+            raise RuntimeError("A search is already running")
+        # the wrappers do not touch the grid while this observer paints, so clearing is up to us
+        self.grid.clear_search()
+        self.batch = []
+        self.applying = []
+        self.applied = 0
+        self.cancelled.clear()
+        self.finished = False
+        self.thread = threading.Thread(target=self._run, args=(search,), daemon=True)
+        self.thread.start()
+
+    def cancel(self) -> None:
+        """
+        Stop the running search; deltas that were not applied yet are dropped.
+        Returns:
+            None
+        """
+        if self.running:
+            self.cancelled.set()
+
+    def join(self) -> None:
+        """
+        Wait for the worker to end, e.g. after cancel() when the window closes.
+        Returns:
+            None
+        """
+        while self.running:
+            self.pump()
+            self.thread.join(0.01)
+
+    def pump(self, max_steps: int = None) -> None:
+        """
+        Apply queued deltas to the grid, on the UI thread.
+        Args:
+            max_steps (int): Stop after this many steps (expansions or path cells), None to apply
+                everything that is queued.
+        Returns:
+            None
+        Raises:
+            BaseException: Whatever the search raised, once its run ended.
+        """
+        set_state = self.grid.set_state
+        cells = self.grid.cells
+        steps = 0
+        while not self.finished and (max_steps is None or steps < max_steps):
+            if self.applied == len(self.applying):
+                try:
+                    batch = self.deltas.get_nowait()
+                except queue.Empty:
+                    break
+                if batch is None:
+                    self.finished = True
+                    break
+                self.applying = batch
+                self.applied = 0
+            if self.cancelled.is_set():
+                self.applied = len(self.applying)  # drop it, so the worker gets to finish
+                continue
+            kind, cell = self.applying[self.applied]
+            self.applied += 1
+            state = cells[cell]
+            if state != START and state != END:
+                set_state(cell, kind)
+            if kind == CLOSED or kind == CLOSED_BACKWARD or kind == PATH:
+                steps += 1
+        if self.finished and self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def publish(self) -> bool:
+        """
+        Hand the collected deltas to the UI thread once a batch is full, on the worker thread.
+        Blocks while the UI thread is max_batches behind.
+        Returns:
+            bool: True if a batch was handed over.
+        """
+        if len(self.batch) < self.batch_size:
+            return False
+        self._put(self.batch)
+        self.batch = []
+        return True
+
+    def _put(self, batch: list[tuple[int, int]]) -> None:
+        """
+        Queue a batch, giving up if the run is cancelled while waiting.
+        """
+        while True:
+            if self.cancelled.is_set():
+                raise SearchCancelled
+            try:
+                self.deltas.put(batch, timeout=0.05)
+                return
+            except queue.Full:
+                pass
+
+    def _run(self, search: Callable[[SearchObserver], bool]) -> None:
+        """
+        The worker: run the search, hand over the last deltas and signal the end of the run.
+        """
+        try:
+            search(self)
+        except BaseException as error:
+            self.error = error
+        finally:
+            if self.batch and not self.cancelled.is_set():
+                try:
+                    self._put(self.batch)
+                except SearchCancelled:
+                    pass
+            self.deltas.put(None)
+
+    def on_start(self, algorithm: str) -> None:
+        self.observer.on_start(algorithm)
+
+    def on_event(self, kind: int, cell: int) -> None:
+        self.batch.append((kind, cell))
+        self.observer.on_event(kind, cell)
+
+    def on_frame(self) -> None:
+        if self.cancelled.is_set():
+            raise SearchCancelled
+        self.observer.on_frame()
+        self.publish()
+
+    def on_finish(self, result: SearchResult | None) -> None:
+        self.observer.on_finish(result)
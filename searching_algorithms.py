@@ -1,424 +1,229 @@
 from utils import *
-from collections import deque
-from queue import PriorityQueue
 from grid import Grid
 from spot import Spot
-
-def reconstruct_path(came_from: dict[Spot, Spot], current: Spot, draw: callable) -> None:
- 
-    while current in came_from:
-        current = came_from[current]
-        if not current.is_start():
-            current.make_path()
-        draw()
-
-def bfs(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
+import engine
+from lpa_star import LPAStar
+from hpa import HierarchicalMap
+from path_cache import PathCache, replay
+from collections.abc import Callable
+from observer import SearchObserver, as_observer
+from engine import SearchCancelled, SearchResult, h_manhattan_distance, h_euclidian_distance
+from grid_map import CLOSED, CLOSED_BACKWARD, PATH
+
+# The searches themselves live in engine.py and never touch pygame.
+# The functions below keep the (observer, grid, start, end) signature used by main.py (a bare draw
+# function still works as the observer): the engine searches grid.map directly and its progress
+# events are written into grid.cells.
+
+# results of the plain searches, reused while the barriers stay the same
+path_cache = PathCache()
+# JPS+ table of the last map searched, rebuilt only after the barriers change
+jump_table: engine.JumpTable | None = None
+
+def _visualize(algorithm: callable, observer: SearchObserver | Callable, grid: Grid, start: Spot, end: Spot,
+               cache: bool = False, name: str = None, clear: bool = False, **kwargs) -> bool:
     """
-    Breadth-First Search (BFS) Algorithm.
+    Run an engine algorithm and show its progress on the grid.
     Args:
-        draw (callable): A function to call to update the Pygame window.
+        algorithm (callable): The engine function to run.
+        observer (SearchObserver | Callable): Told about the run; its on_frame() may raise SearchCancelled.
+            A bare draw function is accepted as well.
         grid (Grid): The Grid object containing the spots.
         start (Spot): The starting spot.
         end (Spot): The ending spot.
+        cache (bool): Look the query up in path_cache first; a hit only paints the cached path.
+        name (str): The name reported to the observer (default: the name of the engine function).
+        clear (bool): Remove the marks of the previous search first.
+        **kwargs: Extra arguments for the engine function.
     Returns:
         bool: True if a path is found, False otherwise.
     """
     if not start or not end:
         return False
 
-    queue = deque()
-    queue.append(start)
-    visited = {start}
-    came_from: dict[Spot, Spot] = {}
-
-    while queue:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return False
-
-        current = queue.popleft()
-
-        if current == end:
-            reconstruct_path(came_from, end, draw)
-            end.make_end()
-            start.make_start()
-            return True
-
-        for neighbor in current.neighbors:
-            if neighbor not in visited and not neighbor.is_barrier():
-                visited.add(neighbor)
-                came_from[neighbor] = current
-                queue.append(neighbor)
-                neighbor.make_open()
+    observer = as_observer(observer)
+    # an observer that paints runs us on a worker thread and applies the events on the UI thread
+    paint = not observer.paints
+    if clear and paint:
+        grid.clear_search()
+    set_state = grid.set_state
+    start_cell = start.cell
+    end_cell = end.cell
+    name = name or algorithm.__name__
+    observer.on_start(name)
+
+    if not grid.components.connected(start_cell, end_cell):
+        # walled off: nothing to expand
+        observer.on_frame()
+        observer.on_finish(SearchResult(False))
+        return False
 
-        draw()
+    def on_event(kind: int, cell: int) -> None:
+        # event kinds are cell states, so mirroring the search is a single state write
+        if paint and cell != start_cell and cell != end_cell:
+            set_state(cell, kind)
+        observer.on_event(kind, cell)
+        if kind == CLOSED or kind == CLOSED_BACKWARD or kind == PATH:
+            observer.on_frame()
+
+    result = path_cache.get(name, grid.map, start_cell, end_cell) if cache else None
+    try:
+        if result is not None:
+            if paint:
+                grid.clear_search()
+            replay(grid.map, result, on_event)
+        else:
+            result = algorithm(grid.map, start_cell, end_cell, on_event=on_event, **kwargs)
+            if cache:
+                path_cache.put(name, grid.map, start_cell, end_cell, result)
+    except SearchCancelled:
+        observer.on_finish(None)
+        return False
+    observer.on_frame()
+    observer.on_finish(result)
+    return result.found
 
-        if current != start:
-            current.make_closed()
-            
-    return False
+def bfs(observer: SearchObserver | Callable, grid: Grid, start: Spot, end: Spot) -> bool:
+    """
+    Breadth-First Search (BFS) Algorithm.
+    Args:
+        observer (SearchObserver | Callable): Told about the run; a bare draw function is accepted as well.
+        grid (Grid): The Grid object containing the spots.
+        start (Spot): The starting spot.
+        end (Spot): The ending spot.
+    Returns:
+        bool: True if a path is found, False otherwise.
+    """
+    return _visualize(engine.bfs, observer, grid, start, end, cache=True)
 
-def dfs(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
+def dfs(observer: SearchObserver | Callable, grid: Grid, start: Spot, end: Spot) -> bool:
     """
     Depth-First Search (DFS) Algorithm.
     Args:
-        draw (callable): A function to call to update the Pygame window.
+        observer (SearchObserver | Callable): Told about the run; a bare draw function is accepted as well.
         grid (Grid): The Grid object containing the spots.
         start (Spot): The starting spot.
         end (Spot): The ending spot.
     Returns:
         bool: True if a path is found, False otherwise.
     """
-    if not start or not end:
-        return False
-        
-    stack = []
-    stack.append(start)
-    visited = {start}
-    came_from: dict[Spot, Spot] = {}
+    return _visualize(engine.dfs, observer, grid, start, end, cache=True)
 
-    while stack:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return False
+def astar(observer: SearchObserver | Callable, grid: Grid, start: Spot, end: Spot) -> bool:
+    """
+    A* Pathfinding Algorithm.
+    Args:
+        observer (SearchObserver | Callable): Told about the run; a bare draw function is accepted as well.
+        grid (Grid): The Grid object containing the spots.
+        start (Spot): The starting spot.
+        end (Spot): The ending spot.
+    Returns:
+        bool: True if a path is found, False otherwise.
+    """
+    return _visualize(engine.astar, observer, grid, start, end, cache=True)
 
-        current = stack.pop()
+def ucs(observer: SearchObserver | Callable, grid: Grid, start: Spot, end: Spot) -> bool:
+    return _visualize(engine.ucs, observer, grid, start, end, cache=True)
 
-        if current == end:
-            reconstruct_path(came_from, end, draw)
-            end.make_end()
-            start.make_start()
-            return True
+def greedy_search(observer: SearchObserver | Callable, grid: Grid, start: Spot, end: Spot) -> bool:
+    return _visualize(engine.greedy_search, observer, grid, start, end, cache=True)
 
-        for neighbor in current.neighbors:
-            if neighbor not in visited and not neighbor.is_barrier():
-                visited.add(neighbor)
-                came_from[neighbor] = current
-                stack.append(neighbor)
-                neighbor.make_open()
+def dls(observer: SearchObserver | Callable, grid: Grid, start: Spot, end: Spot, limit: int) -> bool:
+    return _visualize(engine.dls, observer, grid, start, end, limit=limit)
 
-        draw()
+def ids(observer: SearchObserver | Callable, grid: Grid, start: Spot, end: Spot) -> bool:
+    return _visualize(engine.ids, observer, grid, start, end, cache=True)
 
-        if current != start:
-            current.make_closed()
-            
-    return False
+def ida_star(observer: SearchObserver | Callable, grid: Grid, start: Spot, end: Spot) -> bool:
+    return _visualize(engine.ida_star, observer, grid, start, end, cache=True)
 
-def h_manhattan_distance(p1: tuple[int, int], p2: tuple[int, int]) -> float:
+def bidirectional_bfs(observer: SearchObserver | Callable, grid: Grid, start: Spot, end: Spot) -> bool:
     """
-    Heuristic function for A* algorithm: uses the Manhattan distance between two points.
+    Bidirectional BFS: the backward frontier is drawn in its own colors.
     Args:
-        p1 (tuple[int, int]): The first point (x1, y1).
-        p2 (tuple[int, int]): The second point (x2, y2).
+        observer (SearchObserver | Callable): Told about the run; a bare draw function is accepted as well.
+        grid (Grid): The Grid object containing the spots.
+        start (Spot): The starting spot.
+        end (Spot): The ending spot.
     Returns:
-        float: The Manhattan distance between p1 and p2.
+        bool: True if a path is found, False otherwise.
     """
-    x1, y1 = p1
-    x2, y2 = p2
-    return abs(x1 - x2) + abs(y1 - y2)
+    return _visualize(engine.bidirectional_bfs, observer, grid, start, end, cache=True)
 
-def h_euclidian_distance(p1: tuple[int, int], p2: tuple[int, int]) -> float:
+def bidirectional_astar(observer: SearchObserver | Callable, grid: Grid, start: Spot, end: Spot) -> bool:
     """
-    Heuristic function for A* algorithm: uses the Euclidian distance between two points.
+    Bidirectional A*: the backward frontier is drawn in its own colors.
     Args:
-        p1 (tuple[int, int]): The first point (x1, y1).
-        p2 (tuple[int, int]): The second point (x2, y2).
+        observer (SearchObserver | Callable): Told about the run; a bare draw function is accepted as well.
+        grid (Grid): The Grid object containing the spots.
+        start (Spot): The starting spot.
+        end (Spot): The ending spot.
     Returns:
-        float: The Manhattan distance between p1 and p2.
+        bool: True if a path is found, False otherwise.
     """
-    from math import sqrt
-    x1, y1 = p1
-    x2, y2 = p2
-    return sqrt((x1 - x2)**2 + (y1 - y2)**2)
+    return _visualize(engine.bidirectional_astar, observer, grid, start, end, cache=True)
 
-
-def astar(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
+def jps(observer: SearchObserver | Callable, grid: Grid, start: Spot, end: Spot) -> bool:
     """
-    A* Pathfinding Algorithm.
+    Jump Point Search (JPS): only the jump points are opened and closed on the grid.
     Args:
-        draw (callable): A function to call to update the Pygame window.
+        observer (SearchObserver | Callable): Told about the run; a bare draw function is accepted as well.
         grid (Grid): The Grid object containing the spots.
         start (Spot): The starting spot.
         end (Spot): The ending spot.
     Returns:
         bool: True if a path is found, False otherwise.
     """
-    if not start or not end:
-        return False
-
-    count = 0
-    open_set = PriorityQueue()
-    open_set.put((0, count, start))
-
-    came_from: dict[Spot, Spot] = {}
-
-    g_score: dict[Spot, float] = {spot: float("inf") for row in grid.grid for spot in row}
-    g_score[start] = 0
-
-    f_score: dict[Spot, float] = {spot: float("inf") for row in grid.grid for spot in row}
-    f_score[start] = h_manhattan_distance(start.get_position(), end.get_position())
-
-    open_set_hash = {start}
-
-    while not open_set.empty():
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return False
-
-        current: Spot = open_set.get()[2]
-        open_set_hash.remove(current)
-
-        if current == end:
-            reconstruct_path(came_from, end, draw)
-            end.make_end()
-            start.make_start()
-            return True
-
-        for neighbor in current.neighbors:
-            temp_g_score = g_score[current] + 1
-
-            if temp_g_score < g_score[neighbor]:
-                came_from[neighbor] = current
-                g_score[neighbor] = temp_g_score
-                f_score[neighbor] = temp_g_score + h_manhattan_distance(neighbor.get_position(), end.get_position())
-                
-                if neighbor not in open_set_hash:
-                    count += 1
-                    open_set.put((f_score[neighbor], count, neighbor))
-                    open_set_hash.add(neighbor)
-                    neighbor.make_open()
-
-        draw()
-
-        if current != start:
-            current.make_closed()
-
-    return False
-
-def ucs(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
-    if not start or not end:
-        return False
-
-    count = 0
-    open_set = PriorityQueue()
-    open_set.put((0, count, start)) 
-
-    came_from: dict[Spot, Spot] = {}
-
-    g_score: dict[Spot, float] = {spot: float("inf") for row in grid.grid for spot in row}
-    g_score[start] = 0
-
-    open_set_hash = {start}
-
-    while not open_set.empty():
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return False
-
-        current: Spot = open_set.get()[2]
-        open_set_hash.remove(current)
-
-        if current == end:
-            reconstruct_path(came_from, end, draw)
-            end.make_end()
-            start.make_start()
-            return True
-
-        for neighbor in current.neighbors:
-            temp_g_score = g_score[current] + 1
-
-            if temp_g_score < g_score[neighbor]:
-                came_from[neighbor] = current
-                g_score[neighbor] = temp_g_score
-                
-                if neighbor not in open_set_hash:
-                    count += 1
-                    open_set.put((g_score[neighbor], count, neighbor))
-                    open_set_hash.add(neighbor)
-                    neighbor.make_open()
-
-        draw()
-
-        if current != start:
-            current.make_closed()
+    return _visualize(engine.jps, observer, grid, start, end, cache=True)
 
-    return False
-
-def greedy_search(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
-    if not start or not end:
-        return False
-
-    count = 0
-    open_set = PriorityQueue()
-    
-    h_score = h_manhattan_distance(start.get_position(), end.get_position())
-    open_set.put((h_score, count, start)) 
-
-    came_from: dict[Spot, Spot] = {}
-    visited = {start}
-
-    while not open_set.empty():
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return False
-
-        current: Spot = open_set.get()[2]
-
-        if current == end:
-            reconstruct_path(came_from, end, draw)
-            end.make_end()
-            start.make_start()
-            return True
-
-        for neighbor in current.neighbors:
-            if neighbor not in visited:
-                came_from[neighbor] = current
-                visited.add(neighbor)
-                h_score = h_manhattan_distance(neighbor.get_position(), end.get_position())
-                count += 1
-                open_set.put((h_score, count, neighbor))
-                neighbor.make_open()
-
-        draw()
-
-        if current != start:
-            current.make_closed()
-
-    return False
-
-
-def dls(draw: callable, grid: Grid, start: Spot, end: Spot,limit:int) -> bool:
-    
-    if not start or not end:
-        return False
-        
-    stack = [(start, 0)]
-    visited = {start}
-    came_from: dict[Spot, Spot] = {}
-
-    while stack:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return False
-
-        current, depth = stack.pop()
-
-        if current == end:
-            reconstruct_path(came_from, end, draw)
-            end.make_end()
-            start.make_start()
-            return True
-
-        if depth < limit:
-            for neighbor in current.neighbors:
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    came_from[neighbor] = current
-                    stack.append((neighbor, depth + 1))
-                    neighbor.make_open()
-
-        draw()
-
-        if current != start:
-            current.make_closed()
-            
-    return False
-
-def ids(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
-    if not start or not end:
-        return False
-    
-    max_depth = grid.rows * grid.cols
-
-    for i in range(max_depth):
-        for row in grid.grid:
-            for spot in row:
-                if not spot.is_start() and not spot.is_end() and not spot.is_barrier():
-                    spot.reset()
-
-        if dls(draw, grid, start, end, i):
-            return True
-            
-    return False
-
-def search(draw: callable, path: list[Spot], g_score: float, limit: float, end: Spot, visited_nodes: set[Spot]) -> tuple[bool, float]:
-    current_node = path[-1]
-    f_score = g_score + h_manhattan_distance(current_node.get_position(), end.get_position())
-
-    if f_score > limit:
-        return False, f_score
-
-    if current_node == end:
-        return True, limit
-
-    min_val = float("inf")
-
-    for neighbor in current_node.neighbors:
-        if neighbor not in path:
-            path.append(neighbor)
-            visited_nodes.add(neighbor)
-            
-            if not neighbor.is_end():
-                neighbor.make_open()
-            draw()
-
-            found, new_limit = search(draw, path, g_score + 1, limit, end, visited_nodes)
-
-            if found:
-                return True, new_limit
-
-            if new_limit < min_val:
-                min_val = new_limit
-
-            path.pop()
-            if not neighbor.is_start() and not neighbor.is_end():
-                neighbor.make_closed()
-            draw()
-
-    return False, min_val
-
-def ida_star(draw: callable, grid: Grid, start: Spot, end: Spot) -> bool:
-    if not start or not end:
-        return False
-
-    limit = h_manhattan_distance(start.get_position(), end.get_position())
-    path = [start]
-    visited_nodes = {start}
-
-    while True:
-        found, new_limit = search(draw, path, 0, limit, end, visited_nodes)
-
-        if found:
-            for node in path:
-                if not node.is_start() and not node.is_end():
-                    node.make_path()
-            end.make_end()
-            start.make_start()
-            draw()
-            return True
+def jps_plus(observer: SearchObserver | Callable, grid: Grid, start: Spot, end: Spot) -> bool:
+    """
+    JPS+ : Jump Point Search with jump distances precomputed for the current barriers.
+    Args:
+        observer (SearchObserver | Callable): Told about the run; a bare draw function is accepted as well.
+        grid (Grid): The Grid object containing the spots.
+        start (Spot): The starting spot.
+        end (Spot): The ending spot.
+    Returns:
+        bool: True if a path is found, False otherwise.
+    """
+    global jump_table
+    if jump_table is None or jump_table.grid_map is not grid.map or jump_table.version != grid.map.version:
+        jump_table = engine.JumpTable(grid.map)
+    return _visualize(engine.jps_plus, observer, grid, start, end, table=jump_table)
 
-        if new_limit == float("inf"):
-            return False
+def lpa_star(observer: SearchObserver | Callable, grid: Grid, start: Spot, end: Spot, planner: LPAStar = None) -> bool:
+    """
+    Lifelong Planning A* (LPA*).
+    Args:
+        observer (SearchObserver | Callable): Told about the run; a bare draw function is accepted as well.
+        grid (Grid): The Grid object containing the spots.
+        start (Spot): The starting spot.
+        end (Spot): The ending spot.
+        planner (LPAStar): The planner of a previous run, told about barrier edits through
+            update_cell(); its path is repaired instead of searched again. None plans from scratch.
+    Returns:
+        bool: True if a path is found, False otherwise.
+    """
+    if planner is None:
+        planner = LPAStar(grid.map, start.cell, end.cell)
+    return _visualize(lambda grid_map, start_cell, end_cell, on_event: planner.plan(on_event), observer, grid, start, end,
+                      name="lpa_star", clear=True)
 
-        limit = new_limit
-        
-        for row in grid.grid:
-            for spot in row:
-                if not spot.is_start() and not spot.is_end() and not spot.is_barrier():
-                    spot.reset()
-        start.make_start()
-        end.make_end()
-        draw()
-# and the others algorithms...
-# ▢ Depth-Limited Search (DLS)
-# ▢ Uninformed Cost Search (UCS)
-# ▢ Greedy Search
-# ▢ Iterative Deepening Search/Iterative Deepening Depth-First Search (IDS/IDDFS)
-# ▢ Iterative Deepening A* (IDA)
-# Assume that each edge (graph weight) equalss
\ No newline at end of file
+def hpa_star(observer: SearchObserver | Callable, grid: Grid, start: Spot, end: Spot, hierarchy: HierarchicalMap = None) -> bool:
+    """
+    Hierarchical Path-Finding A* (HPA*): the search runs over cluster entrances, then the path is refined.
+    Args:
+        observer (SearchObserver | Callable): Told about the run; a bare draw function is accepted as well.
+        grid (Grid): The Grid object containing the spots.
+        start (Spot): The starting spot.
+        end (Spot): The ending spot.
+        hierarchy (HierarchicalMap): The abstraction of grid.map, told about barrier edits through
+            update_cell(); None builds it from scratch.
+    Returns:
+        bool: True if a path is found, False otherwise.
+    """
+    if hierarchy is None:
+        hierarchy = HierarchicalMap(grid.map)
+    return _visualize(lambda grid_map, start_cell, end_cell, on_event: hierarchy.find_path(start_cell, end_cell, on_event),
+                      observer, grid, start, end, name="hpa_star")
@@ -0,0 +1,48 @@
+import pygame
+from utils import COLORS
+
+class Slider:
+    def __init__(self, x, y, width, height, labels, index=0, on_change=None, caption="Speed"):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.labels = labels
+        self.caption = caption
+        self.index = index
+        self.on_change = on_change
+        self.action = None  # clicks are handled by click(), which needs the position
+        self.font = pygame.font.SysFont('Arial', 16, bold=True)
+        # the track sits in the lower half of the rect, the caption in the upper half
+        self.track = pygame.Rect(x + 10, y + height * 3 // 4 - 2, width - 20, 4)
+
+    def knob_x(self, index):
+        if len(self.labels) == 1:
+            return self.track.left
+        return self.track.left + self.track.width * index // (len(self.labels) - 1)
+
+    def is_hovered(self, mouse_pos=None):
+        if mouse_pos is None:
+            mouse_pos = pygame.mouse.get_pos()
+        return self.rect.collidepoint(mouse_pos)
+
+    def draw(self, win, mouse_pos=None):
+        pygame.draw.rect(win, COLORS['PANEL_COLOR'], self.rect)
+
+        text_surf = self.font.render(f"{self.caption}: {self.labels[self.index]}", True, COLORS['TEXT_COLOR'])
+        win.blit(text_surf, text_surf.get_rect(midtop=(self.rect.centerx, self.rect.top)))
+
+        pygame.draw.rect(win, COLORS['GREY'], self.track)
+        if self.is_hovered(mouse_pos):
+            color = COLORS['BUTTON_HOVER']
+        else:
+            color = COLORS['BUTTON_COLOR']
+        pygame.draw.circle(win, color, (self.knob_x(self.index), self.track.centery), 8)
+
+    def is_clicked(self, pos):
+        return self.rect.collidepoint(pos)
+
+    def click(self, pos):
+        # snap to the nearest notch
+        index = min(range(len(self.labels)), key=lambda i: abs(self.knob_x(i) - pos[0]))
+        if index != self.index:
+            self.index = index
+            if self.on_change:
+                self.on_change(index)
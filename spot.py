@@ -1,29 +1,56 @@
 from utils import *
 
 class Spot:
+    # A Spot does not own any state: it is a small view on one cell of a Grid,
+    # whose state lives in the grid's byte array (see grid_map.py for the states).
+    __slots__ = ("grid", "row", "col", "cell")
+
     # --- Constructor ---
-    def __init__(self, row: int, col: int, width: int, height: int, total_rows: int):
+    def __init__(self, grid: "Grid", row: int, col: int):
         """
-        Initialize a spot in the grid.
+        Initialize a view on a spot in the grid.
         Args: 
+            grid (Grid): The grid that holds the state of the spot.
             row (int): The row index of the spot.
             col (int): The column index of the spot.
-            width (int): The width of the spot.
-            height (int): The height of the spot.
-            total_rows (int): Keeps track of the total number of rows in the grid (while avoiding global variables).
         """
         # a square has a position in the grid (row, col) and a position in the window (x, y)
+        self.grid = grid
         self.row: int = row
         self.col: int = col
-        # a square has also a width and a height
-        # the coordinates (x, y) are calculated based on the place inside the grid and its size.
-        self.width: int = width
-        self.height: int = height
-        self.x: int = row * width
-        self.y: int = col * height
-        self.color: tuple = COLORS["WHITE"]  # default color is white
-        self.neighbors: list = []
-        self.total_rows: int = total_rows
+        self.cell: int = row * grid.cols + col  # index of the spot in grid.cells
+
+    # ---- Geometry, derived from the grid ----
+    @property
+    def width(self) -> int:
+        return self.grid.width // self.grid.rows
+
+    @property
+    def height(self) -> int:
+        return self.grid.height // self.grid.cols
+
+    @property
+    def x(self) -> int:
+        return self.row * self.width
+
+    @property
+    def y(self) -> int:
+        return self.col * self.height
+
+    @property
+    def color(self) -> tuple:
+        """
+        The color the spot is drawn with, derived from its state.
+        """
+        return STATE_COLORS[self.grid.cells[self.cell]]
+
+    @property
+    def neighbors(self) -> list["Spot"]:
+        """
+        The neighbor spots that are not barriers, computed from the current cell states.
+        """
+        grid = self.grid
+        return [Spot(grid, *grid.map.position(cell)) for cell in grid.map.neighbors(self.cell)]
 
     # ---- Methods to change the state of the spot (i.e., its setters) ----
     def get_position(self) -> tuple[int, int]:
@@ -40,7 +67,7 @@ class Spot:
         Returns:
             bool: True if the spot is closed (red), False otherwise.
         """
-        return self.color == COLORS['RED']
+        return self.grid.cells[self.cell] == CLOSED
 
     def is_open(self) -> bool:
         """
@@ -48,7 +75,7 @@ class Spot:
         Returns:
             bool: True if the spot is marked as open (green), False otherwise.
         """
-        return self.color == COLORS['GREEN']
+        return self.grid.cells[self.cell] == OPEN
 
     def is_barrier(self) -> bool:
         """
@@ -56,7 +83,7 @@ class Spot:
         Returns:
             bool: True if the spot is a barrier (black), False otherwise.
         """
-        return self.color == COLORS['BLACK']
+        return self.grid.cells[self.cell] == BARRIER
 
     def is_start(self) -> bool:
         """
@@ -64,15 +91,15 @@ class Spot:
         Returns:
             bool: True if the spot is the start node (orange), False otherwise.
         """
-        return self.color == COLORS['ORANGE']
+        return self.grid.cells[self.cell] == START
 
     def is_end(self) -> bool:
         """
-        Checks if the spot is marked as the end node (turquoise).
+        Checks if the spot is marked as the end node (yellow).
         Returns:
-            bool: True if the spot is the end node (turquoise), False otherwise.
+            bool: True if the spot is the end node (yellow), False otherwise.
         """
-        return self.color == COLORS['TURQUOISE']
+        return self.grid.cells[self.cell] == END
 
     # ---- Methods to change the state of the spot (i.e., its setters) ----
     def reset(self) -> None:
@@ -81,7 +108,7 @@ class Spot:
         Returns:
             None
         """
-        self.color = COLORS['WHITE']
+        self.grid.set_state(self.cell, FREE)
 
     def make_closed(self) -> None:
         """
@@ -89,7 +116,7 @@ class Spot:
         Returns:
             None
         """
-        self.color = COLORS['RED']
+        self.grid.set_state(self.cell, CLOSED)
 
     def make_open(self) -> None:
         """
@@ -97,7 +124,7 @@ class Spot:
         Returns:
             None
         """
-        self.color = COLORS['GREEN']
+        self.grid.set_state(self.cell, OPEN)
 
     def make_barrier(self) -> None:
         """
@@ -105,7 +132,7 @@ class Spot:
         Returns:
             None
         """
-        self.color = COLORS['BLACK']
+        self.grid.set_state(self.cell, BARRIER)
 
     def make_start(self) -> None:
         """
@@ -113,7 +140,7 @@ class Spot:
         Returns:
             None
         """
-        self.color = COLORS['ORANGE']
+        self.grid.set_state(self.cell, START)
 
     def make_end(self) -> None:
         """
@@ -121,7 +148,7 @@ class Spot:
         Returns:
             None
         """
-        self.color = COLORS['YELLOW']
+        self.grid.set_state(self.cell, END)
 
     def make_path(self) -> None:
         """
@@ -129,7 +156,7 @@ class Spot:
         Returns:
             None
         """
-        self.color = COLORS['PURPLE']
+        self.grid.set_state(self.cell, PATH)
 
     # --- Operators ---
     # "Spot" type is not yet defined because the class will be defined at runtime and will exist only after it is closed (the whole class).
@@ -140,6 +167,17 @@ class Spot:
         This is used to avoid errors in data structures that require comparison, like PriorityQueue.
         """
         return False
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Two views are equal when they look at the same cell of the same grid.
+        """
+        if not isinstance(other, Spot):
+            return NotImplemented
+        return self.grid is other.grid and self.cell == other.cell
+
+    def __hash__(self) -> int:
+        return hash(self.cell)
     
     # --- Other Methods ---
     def draw(self, win: pygame.Surface) -> None:
@@ -148,27 +186,14 @@ class Spot:
         Args:
             win (pygame.Surface): The Pygame surface (window) where the spot will be drawn.
         """
-        # draw a rectangle at (x, y) with size (width, width) and color self.color
-        pygame.draw.rect(win, self.color, (self.x, self.y, self.width, self.width))
+        # draw a rectangle at (x, y) with size (width, height) and the color of the spot's state
+        pygame.draw.rect(win, self.color, (self.x, self.y, self.width, self.height))
 
     def update_neighbors(self, grid: list[list["Spot"]]) -> None:
         """
-        Update the list of neighbor spots that are not barriers.
+        Kept for compatibility: neighbors are now computed from the cell states on access.
         Args:
             grid (list[list[Spot]]): The 2D list (matrix) representing the grid of Spot objects.
         Returns:
             None
         """
-        self.neighbors = []
-        # DOWN
-        if self.row < self.total_rows - 1 and not grid[self.row + 1][self.col].is_barrier():
-            self.neighbors.append(grid[self.row + 1][self.col])
-        # UP
-        if self.row > 0 and not grid[self.row - 1][self.col].is_barrier():
-            self.neighbors.append(grid[self.row - 1][self.col])
-        # RIGHT
-        if self.col < self.total_rows - 1 and not grid[self.row][self.col + 1].is_barrier():
-            self.neighbors.append(grid[self.row][self.col + 1])
-        # LEFT
-        if self.col > 0 and not grid[self.row][self.col - 1].is_barrier():
-            self.neighbors.append(grid[self.row][self.col - 1])
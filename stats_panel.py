@@ -0,0 +1,53 @@
+import pygame
+from utils import COLORS
+
+class StatsPanel:
+    def __init__(self, x, y, width, height, observer, runner=None):
+        self.rect = pygame.Rect(x, y, width, height)
+        # the observer replaces its stats on every run, so they are looked up on every draw
+        self.observer = observer
+        # with a SearchThread, how long it waited for the display and what is still queued are shown too
+        self.runner = runner
+        self.action = None  # read-only widget
+        self.font = pygame.font.SysFont('Arial', 14)
+        self.line_height = self.font.get_linesize()
+
+    def lines(self):
+        stats = self.observer.stats
+        if not stats.algorithm:
+            return ["No run yet"]
+        if not stats.finished:
+            outcome = "running"
+        elif stats.found is None:
+            outcome = "cancelled"
+        elif stats.found:
+            outcome = f"{stats.path_length} cells, cost {stats.cost:g}"
+        else:
+            outcome = "no path"
+        return [
+            f"Run: {stats.algorithm}",
+            f"Path: {outcome}",
+            f"Expanded: {stats.expanded} ({stats.reexpanded} again)",
+            f"Pushed: {stats.pushed} (peak {stats.peak_open})",
+            f"Search: {stats.search_time * 1000:.1f} ms",
+            f"Draw: {stats.draw_time * 1000:.1f} ms",
+            f"Frames: {stats.frames}",
+        ] + ([
+            f"Display wait: {stats.wait_time * 1000:.1f} ms",
+            f"Queued: {self.runner.backlog if self.runner.running else 0} events",
+        ] if self.runner else [])
+
+    def is_hovered(self, mouse_pos=None):
+        return False
+
+    def draw(self, win, mouse_pos=None):
+        pygame.draw.rect(win, COLORS['PANEL_COLOR'], self.rect)
+        y = self.rect.top
+        for line in self.lines():
+            if y + self.line_height > self.rect.bottom:
+                break
+            win.blit(self.font.render(line, True, COLORS['TEXT_COLOR']), (self.rect.left + 4, y))
+            y += self.line_height
+
+    def is_clicked(self, pos):
+        return False
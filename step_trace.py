@@ -0,0 +1,306 @@
+"""
+Recorded search runs: compact binary step traces that replay at any speed, without searching again.
+
+A trace holds the map a run searched (barriers and terrain costs), its start and end, its result,
+and every step event it reported: push (OPEN), expand (CLOSED), path (PATH) and clear (FREE), with
+their backward variants. Each event is packed into one uint32 as ``cell << 4 | kind``.
+
+File layout (little-endian): a header, the algorithm name, the packed barriers (see map_file), the
+costs if the header flags say so, the path cells as int32, then the events, zlib-compressed.
+
+TraceRecorder records a run as an observer of the searching_algorithms wrappers, and
+StepTrace.record() records an engine search directly. TracePlayer replays a trace onto any state
+buffer, seeking backward and forward through an undo log of the states it overwrote.
+"""
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Callable, Iterator
+from engine import SearchResult
+from grid_map import GridMap, START, END, CLOSED, CLOSED_BACKWARD, PATH
+from map_file import pack_barriers, unpack_barriers, _le_bytes
+from observer import SearchObserver
+
+FORMAT_VERSION = 1
+_MAGIC = b"STRC"
+# magic, format version, flags, rows, cols, start, end, found, cost, expanded, path length, event count, name length
+_HEADER = struct.Struct("<4sHHiiii?dqiqH")
+_HAS_COSTS = 1
+_KIND_BITS = 4
+_KIND_MASK = (1 << _KIND_BITS) - 1
+# the packed barriers and costs of the last map snapshotted, reused while its version stays the same
+_snapshot: tuple[GridMap, int, bytes, bytes | None] | None = None
+
+
+def _map_snapshot(grid_map: GridMap) -> tuple[bytes, bytes | None]:
+    """
+    The packed barriers and the costs of a map, packed again only after its version changed.
+    """
+    global _snapshot
+    if _snapshot is None or _snapshot[0] is not grid_map or _snapshot[1] != grid_map.version:
+        costs = bytes(grid_map.costs) if grid_map.costs is not None else None
+        _snapshot = (grid_map, grid_map.version, pack_barriers(grid_map.cells), costs)
+    return _snapshot[2], _snapshot[3]
+
+
+def _from_bytes(typecode: str, data: bytes) -> array:
+    """
+    Read little-endian ints into an array.
+    """
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+class StepTrace:
+    def __init__(self, grid_map: GridMap, start: int, end: int, algorithm: str = ""):
+        """
+        Start an empty trace of a run on a map; the map's barriers and costs are copied now (once
+        per map version, so repeated runs on an unchanged map share the copy).
+        Args:
+            grid_map (GridMap): The map the run searches.
+            start (int): The starting cell.
+            end (int): The ending cell.
+            algorithm (str): The name of the algorithm.
+        """
+        self.rows: int = grid_map.rows
+        self.cols: int = grid_map.cols
+        self.start: int = start
+        self.end: int = end
+        self.algorithm: str = algorithm
+        self.barriers: bytes
+        self.costs: bytes | None
+        self.barriers, self.costs = _map_snapshot(grid_map)
+        # one uint32 per event: cell << 4 | kind
+        self.events: array = array("I")
+        self.result: SearchResult | None = None
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    @classmethod
+    def record(cls, algorithm: Callable, grid_map: GridMap, start: int, end: int, name: str = None,
+               **kwargs) -> "StepTrace":
+        """
+        Run an engine search and record it.
+        Args:
+            algorithm (Callable): The engine function, e.g. engine.ids.
+            grid_map (GridMap): The map to search.
+            start (int): The starting cell.
+            end (int): The ending cell.
+            name (str): The name stored in the trace (default: the name of the function).
+            **kwargs: Extra arguments for the engine function.
+        Returns:
+            StepTrace: The trace, with its result.
+        """
+        trace = cls(grid_map, start, end, name or algorithm.__name__)
+        trace.result = algorithm(grid_map, start, end, on_event=trace.append, **kwargs)
+        return trace
+
+    def append(self, kind: int, cell: int) -> None:
+        """
+        Record one step event.
+        Args:
+            kind (int): The event kind (a cell state from grid_map).
+            cell (int): The cell the event is about.
+        Returns:
+            None
+        """
+        self.events.append(cell << _KIND_BITS | kind)
+
+    def steps(self, begin: int = 0) -> Iterator[tuple[int, int]]:
+        """
+        Iterate over the recorded events.
+        Args:
+            begin (int): The position of the first event.
+        Returns:
+            Iterator[tuple[int, int]]: (kind, cell) pairs, in the order they were reported.
+        """
+        for value in self.events[begin:]:
+            yield value & _KIND_MASK, value >> _KIND_BITS
+
+    def cells(self) -> bytes:
+        """
+        The FREE / BARRIER state of every cell of the recorded map.
+        Returns:
+            bytes: rows * cols states.
+        """
+        return unpack_barriers(self.barriers, self.rows * self.cols)
+
+    def save(self, path: str) -> None:
+        """
+        Write the trace to a file.
+        Args:
+            path (str): The file to write.
+        Returns:
+            None
+        """
+        result = self.result or SearchResult(False)
+        name = self.algorithm.encode()
+        path_cells = array("i", [row * self.cols + col for row, col in result.path])
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, FORMAT_VERSION, _HAS_COSTS if self.costs is not None else 0,
+                                    self.rows, self.cols, self.start, self.end, result.found, result.cost,
+                                    result.expanded, len(path_cells), len(self.events), len(name)))
+            file.write(name)
+            file.write(self.barriers)
+            if self.costs is not None:
+                file.write(self.costs)
+            file.write(_le_bytes(path_cells))
+            file.write(zlib.compress(_le_bytes(self.events)))
+
+    @classmethod
+    def load(cls, path: str) -> "StepTrace":
+        """
+        Read a trace written by save().
+        Args:
+            path (str): The file to read.
+        Returns:
+            StepTrace: The trace.
+        Raises:
+            ValueError: If the file is not a trace or was written by a newer format version.
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        (magic, version, flags, rows, cols, start, end, found, cost, expanded, path_length, count,
+         name_length) = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a step trace")
+        if version > FORMAT_VERSION:
+            raise ValueError(f"{path} uses trace format {version}, this version reads up to {FORMAT_VERSION}")
+        trace = cls.__new__(cls)
+        trace.rows, trace.cols, trace.start, trace.end = rows, cols, start, end
+        offset = _HEADER.size
+        trace.algorithm = data[offset:offset + name_length].decode()
+        offset += name_length
+        size = rows * cols
+        trace.barriers = data[offset:offset + (size + 7) // 8]
+        offset += (size + 7) // 8
+        trace.costs = None
+        if flags & _HAS_COSTS:
+            trace.costs = data[offset:offset + size]
+            offset += size
+        path_cells = _from_bytes("i", data[offset:offset + 4 * path_length])
+        offset += 4 * path_length
+        trace.events = _from_bytes("I", zlib.decompress(data[offset:]))
+        if len(trace.events) != count:
+            raise ValueError(f"{path} is truncated: {len(trace.events)} of {count} events")
+        trace.result = SearchResult(found, [divmod(cell, cols) for cell in path_cells], cost, expanded)
+        return trace
+
+
+class TraceRecorder(SearchObserver):
+    def __init__(self, grid_map: GridMap, start: int, end: int, observer: SearchObserver = None):
+        """
+        Record the run of a searching_algorithms wrapper, passing every hook on to another observer.
+        Args:
+            grid_map (GridMap): The map the run searches.
+            start (int): The starting cell.
+            end (int): The ending cell.
+            observer (SearchObserver): Told about the run as well, e.g. a StatsObserver.
+        """
+        self.grid_map: GridMap = grid_map
+        self.start: int = start
+        self.end: int = end
+        self.observer: SearchObserver = observer or SearchObserver()
+        self.trace: StepTrace | None = None
+
+    def on_start(self, algorithm: str) -> None:
+        self.trace = StepTrace(self.grid_map, self.start, self.end, algorithm)
+        self.observer.on_start(algorithm)
+
+    def on_event(self, kind: int, cell: int) -> None:
+        self.trace.append(kind, cell)
+        self.observer.on_event(kind, cell)
+
+    def on_frame(self) -> None:
+        self.observer.on_frame()
+
+    def on_finish(self, result: SearchResult | None) -> None:
+        self.trace.result = result
+        self.observer.on_finish(result)
+
+
+class TracePlayer:
+    def __init__(self, trace: StepTrace, on_change: Callable[[int, int], None] = None):
+        """
+        Replay a trace from its first event.
+        Args:
+            trace (StepTrace): The trace to replay.
+            on_change (Callable[[int, int], None]): Called with (cell, state) for every cell the
+                replay changes, e.g. Grid.set_state; the start and end cells are never changed.
+        """
+        self.trace: StepTrace = trace
+        self.on_change: Callable[[int, int], None] | None = on_change
+        # the state of every cell at the current position
+        self.cells: bytearray = bytearray(trace.cells())
+        self.cells[trace.start] = START
+        self.cells[trace.end] = END
+        self.position: int = 0
+        # the state each event overwrote, for seeking backward; filled as events are first applied
+        self.previous: bytearray = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.trace.events)
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether every event has been applied.
+        """
+        return self.position == len(self.trace.events)
+
+    def seek(self, position: int) -> None:
+        """
+        Move to a position, applying or undoing the events in between.
+        Args:
+            position (int): The number of events applied afterwards, clamped to the trace.
+        Returns:
+            None
+        """
+        position = max(0, min(position, len(self.trace.events)))
+        events = self.trace.events
+        cells = self.cells
+        previous = self.previous
+        on_change = self.on_change
+        while self.position < position:
+            value = events[self.position]
+            cell = value >> _KIND_BITS
+            state = cells[cell]
+            if self.position == len(previous):
+                previous.append(state)
+            self.position += 1
+            if state != START and state != END:
+                cells[cell] = value & _KIND_MASK
+                if on_change:
+                    on_change(cell, cells[cell])
+        while self.position > position:
+            self.position -= 1
+            cell = events[self.position] >> _KIND_BITS
+            if cells[cell] != START and cells[cell] != END:
+                cells[cell] = previous[self.position]
+                if on_change:
+                    on_change(cell, cells[cell])
+
+    def advance(self, steps: int = None) -> None:
+        """
+        Play forward by a number of steps (expansions or path cells), as a live run would per frame.
+        Args:
+            steps (int): The number of steps, None to play to the end.
+        Returns:
+            None
+        """
+        if steps is None:
+            self.seek(len(self.trace.events))
+            return
+        events = self.trace.events
+        position = self.position
+        while steps > 0 and position < len(events):
+            kind = events[position] & _KIND_MASK
+            position += 1
+            if kind == CLOSED or kind == CLOSED_BACKWARD or kind == PATH:
+                steps -= 1
+        self.seek(position)
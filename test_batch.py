@@ -0,0 +1,50 @@
+"""
+Seeded checks of batched routing: route_all must answer every query as the in-process search does,
+in input order. Run with pytest, or as a script: python test_batch.py
+"""
+import engine
+from batch import route_all
+from components import Components
+from map_generators import random_obstacles
+
+SEED = 7
+
+
+def _queries(grid_map, count: int) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+    """
+    Reproducible position pairs over the whole map, reachable or not (barrier endpoints excluded).
+    """
+    free = [cell for cell in range(len(grid_map.cells)) if not grid_map.is_barrier(cell)]
+    return [(grid_map.position(free[(i * 7919) % len(free)]), grid_map.position(free[(i * 104729 + 13) % len(free)]))
+            for i in range(count)]
+
+
+def _expected(grid_map, pairs, algorithm: str) -> list[tuple[bool, float]]:
+    """
+    The (found, cost) of every query, searched in this process.
+    """
+    search = engine.ALGORITHMS[algorithm]
+    return [(result.found, result.cost) for result in
+            (search(grid_map, grid_map.index(*start), grid_map.index(*end)) for start, end in pairs)]
+
+
+def test_route_all_matches_searches() -> None:
+    grid_map = random_obstacles(20, 20, 0.3, SEED)
+    pairs = _queries(grid_map, 50)
+    results = route_all(grid_map, pairs, "astar", workers=2, chunk_size=8)
+    assert [(result.found, result.cost) for result in results] == _expected(grid_map, pairs, "astar")
+
+
+def test_route_all_with_components() -> None:
+    grid_map = random_obstacles(20, 20, 0.35, SEED)
+    pairs = _queries(grid_map, 50)
+    expected = _expected(grid_map, pairs, "bfs")
+    assert not all(found for found, _ in expected), "the map should have unreachable queries"
+    results = route_all(grid_map, pairs, "bfs", workers=2, chunk_size=8, components=Components(grid_map))
+    assert [(result.found, result.cost) for result in results] == expected
+
+
+if __name__ == "__main__":
+    for test in (test_route_all_matches_searches, test_route_all_with_components):
+        test()
+        print(f"{test.__name__}: ok")
@@ -0,0 +1,60 @@
+"""
+Seeded checks of the connected-component index: after every barrier edit reported through
+update_cell(), two cells must share a label exactly when a fresh labeling puts them together, and
+the component sizes must be right. Run with pytest, or as a script: python test_components.py
+"""
+import random
+from components import Components
+from grid_map import GridMap, BARRIER, FREE
+from map_generators import GENERATORS
+
+SEED = 7
+SIZE = 20
+EDITS = 300
+
+
+def _same_partition(components: Components, fresh: Components) -> bool:
+    """
+    Whether two labelings group the cells alike (label numbers may differ) and count them right.
+    """
+    mapping: dict[int, int] = {}
+    for label, fresh_label in zip(components.labels, fresh.labels):
+        if (label < 0) != (fresh_label < 0):
+            return False
+        if label >= 0 and mapping.setdefault(label, fresh_label) != fresh_label:
+            return False
+    if len(set(mapping.values())) != len(mapping):
+        return False  # two labels for one component
+    return {mapping[label]: size for label, size in components.sizes.items()} == fresh.sizes
+
+
+def test_update_cell_matches_relabeling() -> None:
+    for map_name in ("random25", "random40", "maze", "rooms"):
+        grid_map = GENERATORS[map_name](SIZE, SIZE, SEED)
+        components = Components(grid_map)
+        rng = random.Random(SEED)
+        for _ in range(EDITS):
+            cell = rng.randrange(len(grid_map.cells))
+            grid_map.cells[cell] = FREE if grid_map.cells[cell] == BARRIER else BARRIER
+            components.update_cell(cell)
+            assert _same_partition(components, Components(grid_map)), \
+                f"{map_name} after toggling {grid_map.position(cell)}"
+
+
+def test_cutting_a_corridor_splits_it() -> None:
+    grid_map = GridMap(1, 9)
+    components = Components(grid_map)
+    assert components.connected(0, 8)
+    grid_map.cells[4] = BARRIER
+    components.update_cell(4)
+    assert not components.connected(0, 8) and components.connected(0, 3) and components.connected(5, 8)
+    assert sorted(components.sizes.values()) == [4, 4]
+    grid_map.cells[4] = FREE
+    components.update_cell(4)
+    assert components.connected(0, 8) and list(components.sizes.values()) == [9]
+
+
+if __name__ == "__main__":
+    for test in (test_update_cell_matches_relabeling, test_cutting_a_corridor_splits_it):
+        test()
+        print(f"{test.__name__}: ok")
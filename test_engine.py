@@ -0,0 +1,184 @@
+"""
+Seeded cross-check of the engine searches against BFS path costs.
+
+The checked searches run the same reproducible queries on small generated maps. Optimal searches
+must match the BFS cost, every search must agree with BFS on reachability, and every path must be
+a walk of free, 4-connected cells from start to end. Run with pytest, or as a script:
+python test_engine.py
+"""
+import heapq
+import random
+import engine
+from benchmark import pick_queries
+from grid_map import GridMap, BARRIER
+from map_generators import GENERATORS
+
+SEED = 7
+SIZE = 24
+QUERIES = 40
+# the option sets below search open rooms exponentially without a full table, so they get smaller maps
+VARIANT_SIZE = 12
+# the searches of engine.ALGORITHMS that are checked, and whether they must find a shortest path on
+# a unit-cost map
+CHECKED = {
+    "bfs": True,
+    "dfs": False,
+    "astar": True,
+    "ucs": True,
+    "greedy": False,
+    "jps": True,
+    "jps_plus": True,
+    "bidirectional_bfs": True,
+    "bidirectional_astar": True,
+    "ida_star": True,
+    "ids": True,
+}
+# option sets whose pruning rules must keep a search optimal
+VARIANTS = [
+    ("ids", {"growth": 2.0}),
+    ("ids", {"carry_frontier": False}),
+    ("ida_star", {"table_size": 0}),
+    ("ida_star", {"table_size": 16}),
+]
+
+
+def _maps(size: int = SIZE) -> list[tuple[str, GridMap]]:
+    """
+    One small map per generator (the gym map needs pygame, so it is left out).
+    """
+    return [(name, generator(size, size, SEED)) for name, generator in GENERATORS.items() if name != "gym"]
+
+
+def _path_cost(grid_map: GridMap, result: engine.SearchResult, start: int, end: int) -> float:
+    """
+    Check that a path is a walk of free neighbors from start to end and return its terrain cost.
+    """
+    cells = [grid_map.index(row, col) for row, col in result.path]
+    assert cells[0] == start and cells[-1] == end, "the path does not join start and end"
+    for a, b in zip(cells, cells[1:]):
+        assert b in grid_map.neighbors(a), f"{grid_map.position(a)} -> {grid_map.position(b)} is not a move"
+    return sum(grid_map.cost(cell) for cell in cells[1:])
+
+
+def _check(grid_map: GridMap, name: str, result: engine.SearchResult, reference: engine.SearchResult,
+           start: int, end: int, optimal: bool) -> None:
+    """
+    Compare one result with the BFS reference.
+    """
+    query = f"{name} {grid_map.position(start)} -> {grid_map.position(end)}"
+    assert result.found == reference.found, f"{query}: found {result.found}, BFS found {reference.found}"
+    if not result.found:
+        return
+    assert _path_cost(grid_map, result, start, end) == result.cost, f"{query}: reported cost is not the path cost"
+    if optimal:
+        assert result.cost == reference.cost, f"{query}: cost {result.cost}, BFS cost {reference.cost}"
+
+
+def test_algorithms_match_bfs() -> None:
+    for map_name, grid_map in _maps():
+        for start, end in pick_queries(grid_map, QUERIES, SEED):
+            reference = engine.bfs(grid_map, start, end)
+            for name, optimal in CHECKED.items():
+                result = engine.ALGORITHMS[name](grid_map, start, end)
+                _check(grid_map, f"{map_name} {name}", result, reference, start, end, optimal)
+
+
+def test_search_options_match_bfs() -> None:
+    for map_name, grid_map in _maps(VARIANT_SIZE):
+        for start, end in pick_queries(grid_map, QUERIES, SEED):
+            reference = engine.bfs(grid_map, start, end)
+            for name, options in VARIANTS:
+                result = engine.ALGORITHMS[name](grid_map, start, end, **options)
+                _check(grid_map, f"{map_name} {name} {options}", result, reference, start, end, True)
+
+
+def test_dls_finds_paths_within_its_limit() -> None:
+    for map_name, grid_map in _maps():
+        for start, end in pick_queries(grid_map, QUERIES, SEED):
+            cost = int(engine.bfs(grid_map, start, end).cost)
+            # one step short, exact and one to spare
+            for limit in (cost - 1, cost, cost + 1):
+                result = engine.dls(grid_map, start, end, limit=limit)
+                assert result.found == (cost <= limit), f"{map_name} dls, cost {cost}, limit {limit}"
+                if result.found:
+                    assert _path_cost(grid_map, result, start, end) <= limit
+
+
+def test_same_row_and_column_queries() -> None:
+    # JPS and the JPS+ table treat an end on the row or column of a jump as a special case
+    for map_name, grid_map in _maps():
+        table = engine.JumpTable(grid_map)
+        rng = random.Random(SEED)
+        free = [cell for cell in range(len(grid_map.cells)) if grid_map.cells[cell] != BARRIER]
+        for _ in range(QUERIES):
+            start = rng.choice(free)
+            row, col = grid_map.position(start)
+            line = [cell for cell in free if cell != start and (grid_map.position(cell)[0] == row
+                                                                or grid_map.position(cell)[1] == col)]
+            if not line:
+                continue
+            end = rng.choice(line)
+            reference = engine.bfs(grid_map, start, end)
+            _check(grid_map, f"{map_name} jps", engine.jps(grid_map, start, end), reference, start, end, True)
+            _check(grid_map, f"{map_name} jps_plus", engine.jps_plus(grid_map, start, end, table=table), reference,
+                   start, end, True)
+
+
+def _dijkstra(grid_map: GridMap, start: int, end: int) -> float:
+    """
+    The terrain cost of a shortest path by a plain heap Dijkstra, or -1 if the end is unreachable.
+    """
+    distances = {start: 0}
+    heap = [(0, start)]
+    while heap:
+        distance, cell = heapq.heappop(heap)
+        if cell == end:
+            return distance
+        if distance > distances[cell]:
+            continue
+        for neighbor in grid_map.neighbors(cell):
+            candidate = distance + grid_map.cost(neighbor)
+            if candidate < distances.get(neighbor, candidate + 1):
+                distances[neighbor] = candidate
+                heapq.heappush(heap, (candidate, neighbor))
+    return -1
+
+
+def test_weighted_searches_are_optimal() -> None:
+    # UCS and A* must follow the terrain costs, not the step count
+    for map_name, grid_map in _maps():
+
+        def manhattan(cell: int, target: int) -> int:
+            (row, col), (target_row, target_col) = grid_map.position(cell), grid_map.position(target)
+            return abs(row - target_row) + abs(col - target_col)
+
+        rng = random.Random(SEED)
+        for cell in range(len(grid_map.cells)):
+            if grid_map.cells[cell] != BARRIER and rng.random() < 0.3:
+                grid_map.set_cost(*grid_map.position(cell), rng.choice((2, 4, 9)))
+        for start, end in pick_queries(grid_map, QUERIES, SEED):
+            cost = _dijkstra(grid_map, start, end)
+            # a custom heuristic sends A* to the binary heap instead of the bucket queue
+            for name, result in (("ucs", engine.ucs(grid_map, start, end)),
+                                 ("astar", engine.astar(grid_map, start, end)),
+                                 ("astar heap", engine.astar(grid_map, start, end, heuristic=manhattan))):
+                query = f"{map_name} weighted {name} {grid_map.position(start)} -> {grid_map.position(end)}"
+                assert result.found == (cost >= 0), query
+                if result.found:
+                    assert _path_cost(grid_map, result, start, end) == result.cost == cost, query
+
+
+def test_unreachable_end() -> None:
+    grid_map = GridMap(SIZE, SIZE)
+    for row in range(SIZE):
+        grid_map.cells[grid_map.index(row, SIZE // 2)] = BARRIER
+    start, end = grid_map.index(3, 2), grid_map.index(20, SIZE - 3)
+    for name in CHECKED:
+        assert not engine.ALGORITHMS[name](grid_map, start, end).found, f"{name} crossed the wall"
+
+
+if __name__ == "__main__":
+    for test in (test_algorithms_match_bfs, test_search_options_match_bfs, test_dls_finds_paths_within_its_limit,
+                 test_same_row_and_column_queries, test_weighted_searches_are_optimal, test_unreachable_end):
+        test()
+        print(f"{test.__name__}: ok")
@@ -0,0 +1,60 @@
+"""
+Seeded checks of HPA*: paths agree with BFS on reachability and never beat it, and a hierarchy
+patched by update_cell() after barrier edits equals one built from scratch. Run with pytest, or as
+a script: python test_hpa.py
+"""
+import random
+import engine
+from benchmark import pick_queries
+from grid_map import BARRIER, FREE
+from hpa import HierarchicalMap
+from map_generators import GENERATORS
+from test_engine import SEED, QUERIES, _maps, _path_cost
+
+SIZE = 30
+EDITS = 60
+
+
+def _same_graph(patched: HierarchicalMap, built: HierarchicalMap) -> bool:
+    """
+    Whether two hierarchies of the same map have the same entrances and intra-cluster distances.
+    """
+    entrances = {border: sorted(pairs) for border, pairs in patched.entrances.items() if pairs}
+    return (entrances == {border: sorted(pairs) for border, pairs in built.entrances.items() if pairs}
+            and patched.intra == built.intra)
+
+
+def test_paths_match_bfs() -> None:
+    for cluster_size in (10, 7):
+        for map_name, grid_map in _maps(SIZE):
+            hierarchy = HierarchicalMap(grid_map, cluster_size)
+            for start, end in pick_queries(grid_map, QUERIES, SEED):
+                reference = engine.bfs(grid_map, start, end)
+                result = hierarchy.find_path(start, end)
+                query = f"{map_name} hpa {grid_map.position(start)} -> {grid_map.position(end)}"
+                assert result.found == reference.found, query
+                assert _path_cost(grid_map, result, start, end) == result.cost >= reference.cost, query
+
+
+def test_update_cell_matches_rebuild() -> None:
+    for cluster_size in (10, 7):
+        for map_name in ("random25", "rooms"):
+            grid_map = GENERATORS[map_name](SIZE, SIZE, SEED)
+            hierarchy = HierarchicalMap(grid_map, cluster_size)
+            rng = random.Random(SEED)
+            for _ in range(EDITS):
+                cell = rng.randrange(len(grid_map.cells))
+                grid_map.cells[cell] = FREE if grid_map.cells[cell] == BARRIER else BARRIER
+                hierarchy.update_cell(cell)
+                assert _same_graph(hierarchy, HierarchicalMap(grid_map, cluster_size)), \
+                    f"{map_name} after toggling {grid_map.position(cell)}"
+            free = [cell for cell in range(len(grid_map.cells)) if grid_map.cells[cell] != BARRIER]
+            for _ in range(QUERIES):
+                start, end = rng.sample(free, 2)
+                assert hierarchy.find_path(start, end).found == engine.bfs(grid_map, start, end).found
+
+
+if __name__ == "__main__":
+    for test in (test_paths_match_bfs, test_update_cell_matches_rebuild):
+        test()
+        print(f"{test.__name__}: ok")
@@ -0,0 +1,70 @@
+"""
+Seeded checks of the incremental LPA* planner: after every barrier edit the repaired path must cost
+what a fresh BFS finds, also when a run was cancelled halfway. Run with pytest, or as a script:
+python test_lpa_star.py
+"""
+import random
+import engine
+from benchmark import pick_queries
+from engine import SearchCancelled
+from grid_map import BARRIER, FREE
+from lpa_star import LPAStar
+from map_generators import GENERATORS
+from test_engine import SEED, SIZE, _check, _maps
+
+EDITS = 10
+
+
+def _toggle(grid_map, planner: LPAStar, rng: random.Random) -> None:
+    """
+    Place or remove a barrier on a random cell other than the endpoints and tell the planner.
+    """
+    cell = rng.choice([cell for cell in range(len(grid_map.cells)) if cell not in (planner.start, planner.end)])
+    grid_map.cells[cell] = FREE if grid_map.cells[cell] == BARRIER else BARRIER
+    planner.update_cell(cell)
+
+
+def test_repairs_match_bfs() -> None:
+    for map_name, _ in _maps():
+        rng = random.Random(SEED)
+        for start, end in pick_queries(GENERATORS[map_name](SIZE, SIZE, SEED), 5, SEED):
+            # every query edits a fresh copy of the map, so its endpoints are still free
+            grid_map = GENERATORS[map_name](SIZE, SIZE, SEED)
+            planner = LPAStar(grid_map, start, end)
+            _check(grid_map, f"{map_name} lpa_star", planner.plan(), engine.bfs(grid_map, start, end), start, end,
+                   True)
+            for _ in range(EDITS):
+                _toggle(grid_map, planner, rng)
+                _check(grid_map, f"{map_name} lpa_star after an edit", planner.plan(),
+                       engine.bfs(grid_map, start, end), start, end, True)
+
+
+def test_cancelled_plan_stays_consistent() -> None:
+    for map_name, _ in _maps():
+        rng = random.Random(SEED)
+        for start, end in pick_queries(GENERATORS[map_name](SIZE, SIZE, SEED), 5, SEED):
+            grid_map = GENERATORS[map_name](SIZE, SIZE, SEED)
+            planner = LPAStar(grid_map, start, end)
+            events = 0
+            cancel_at = rng.randint(1, 200)
+
+            def on_event(kind: int, cell: int) -> None:
+                nonlocal events
+                events += 1
+                if events == cancel_at:
+                    raise SearchCancelled
+
+            try:
+                planner.plan(on_event)
+            except SearchCancelled:
+                pass
+            for _ in range(3):
+                _toggle(grid_map, planner, rng)
+            _check(grid_map, f"{map_name} lpa_star after a cancelled run", planner.plan(),
+                   engine.bfs(grid_map, start, end), start, end, True)
+
+
+if __name__ == "__main__":
+    for test in (test_repairs_match_bfs, test_cancelled_plan_stays_consistent):
+        test()
+        print(f"{test.__name__}: ok")
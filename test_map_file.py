@@ -0,0 +1,97 @@
+"""
+Seeded round trips through the binary map format: barriers (BITS and CELL), terrain costs (COST),
+component labels (COMP) and landmark tables (LMRK) must come back as saved, and batch workers must
+route on a mapped file as on the map itself. Run with pytest, or as a script: python test_map_file.py
+"""
+import os
+import random
+import tempfile
+from batch import route_all
+from components import Components
+from grid_map import BARRIER, FREE, OPEN, CLOSED
+from landmarks import Landmarks
+from map_file import MapFile, save_map, pack_barriers, unpack_barriers
+from map_generators import random_obstacles
+
+SEED = 7
+
+
+def _map(rows: int = 13, cols: int = 21):
+    """
+    A random map with search marks on some free cells and terrain costs on others.
+    """
+    grid_map = random_obstacles(rows, cols, 0.3, SEED)
+    rng = random.Random(SEED)
+    for cell in range(len(grid_map.cells)):
+        if grid_map.cells[cell] == FREE:
+            roll = rng.random()
+            if roll < 0.1:
+                grid_map.cells[cell] = rng.choice((OPEN, CLOSED))
+            elif roll < 0.3:
+                grid_map.set_cost(*grid_map.position(cell), rng.randint(2, 9))
+    return grid_map
+
+
+def _barriers(cells) -> bytes:
+    return bytes(BARRIER if state == BARRIER else FREE for state in cells)
+
+
+def test_pack_barriers_round_trip() -> None:
+    rng = random.Random(SEED)
+    for size in (0, 1, 7, 8, 9, 63, 64, 65, 1000):
+        cells = bytes(rng.choice((FREE, BARRIER, OPEN)) for _ in range(size))
+        assert unpack_barriers(pack_barriers(cells), size) == _barriers(cells), size
+
+
+def test_map_round_trip() -> None:
+    grid_map = _map()
+    components = Components(grid_map)
+    landmarks = Landmarks.build(grid_map, 4)
+    with tempfile.TemporaryDirectory() as directory:
+        for packed in (True, False):
+            path = os.path.join(directory, "map.gmap")
+            save_map(path, grid_map, 5, 17, packed=packed, components=components, landmarks=landmarks)
+            with MapFile(path) as map_file:
+                assert (map_file.rows, map_file.cols, map_file.start, map_file.end) == (13, 21, 5, 17)
+                loaded = map_file.grid_map()
+                assert bytes(loaded.cells) == _barriers(grid_map.cells)
+                assert bytes(loaded.costs) == bytes(grid_map.costs) and loaded.max_cost == grid_map.max_cost
+                loaded_components = map_file.components(loaded)
+                assert list(loaded_components.labels) == list(components.labels)
+                assert loaded_components.sizes == components.sizes
+                loaded_landmarks = map_file.landmarks(loaded)
+                assert loaded_landmarks.landmarks == landmarks.landmarks
+                assert [list(table) for table in loaded_landmarks.tables] == [list(table) for table in landmarks.tables]
+                del loaded_landmarks, loaded  # views into the mapping must go before it closes
+
+
+def test_optional_sections_are_missing() -> None:
+    grid_map = random_obstacles(6, 5, 0.3, SEED)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "map.gmap")
+        save_map(path, grid_map)
+        with MapFile(path) as map_file:
+            assert (map_file.start, map_file.end) == (None, None)
+            assert map_file.costs() is None
+            loaded = map_file.grid_map()
+            assert loaded.costs is None and map_file.components(loaded) is None and map_file.landmarks(loaded) is None
+
+
+def test_route_all_on_a_map_file() -> None:
+    grid_map = _map(20, 20)
+    rng = random.Random(SEED)
+    free = [cell for cell in range(len(grid_map.cells)) if grid_map.cells[cell] != BARRIER]
+    pairs = [tuple(grid_map.position(cell) for cell in rng.sample(free, 2)) for _ in range(30)]
+    expected = [(result.found, result.cost) for result in route_all(grid_map, pairs, "ucs", workers=2)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "map.gmap")
+        save_map(path, grid_map, packed=False)
+        results = route_all(grid_map, pairs, "ucs", workers=2, chunk_size=8, map_path=path)
+    assert [(result.found, result.cost) for result in results] == expected
+
+
+if __name__ == "__main__":
+    for test in (test_pack_barriers_round_trip, test_map_round_trip, test_optional_sections_are_missing,
+                 test_route_all_on_a_map_file):
+        test()
+        print(f"{test.__name__}: ok")
@@ -0,0 +1,67 @@
+"""
+Seeded checks of the versioned LRU path cache: hits, eviction order, staleness after map edits and
+maps that reach the same version. Run with pytest, or as a script: python test_path_cache.py
+"""
+import random
+import engine
+from grid_map import GridMap
+from path_cache import PathCache
+from map_generators import random_obstacles
+
+SEED = 7
+
+
+def test_hit_matches_search() -> None:
+    grid_map = random_obstacles(16, 16, 0.2, SEED)
+    cache = PathCache()
+    rng = random.Random(SEED)
+    free = [cell for cell in range(len(grid_map.cells)) if not grid_map.is_barrier(cell)]
+    for _ in range(50):
+        start, end = rng.sample(free, 2)
+        first = cache.search(grid_map, start, end, "astar")
+        second = cache.search(grid_map, start, end, "astar")
+        assert second.expanded == 0
+        assert (second.found, second.path, second.cost) == (first.found, first.path, first.cost)
+    assert cache.hits == 50 and cache.misses == 50
+
+
+def test_least_recently_used_is_evicted() -> None:
+    grid_map = GridMap(4, 4)
+    cache = PathCache(max_size=2)
+    cache.search(grid_map, 0, 1, "bfs")
+    cache.search(grid_map, 0, 2, "bfs")
+    cache.search(grid_map, 0, 1, "bfs")  # now the most recently used
+    cache.search(grid_map, 0, 3, "bfs")  # evicts 0 -> 2
+    assert len(cache) == 2
+    assert cache.get("bfs", grid_map, 0, 1) is not None
+    assert cache.get("bfs", grid_map, 0, 3) is not None
+    assert cache.get("bfs", grid_map, 0, 2) is None
+
+
+def test_edits_make_entries_stale() -> None:
+    grid_map = GridMap(3, 3)
+    cache = PathCache()
+    assert cache.search(grid_map, 0, 2, "bfs").cost == 2
+    grid_map.set_barrier(0, 1, True)
+    result = cache.search(grid_map, 0, 2, "bfs")
+    assert result.cost == 4 and (0, 1) not in result.path
+    assert cache.misses == 2
+
+
+def test_maps_at_the_same_version_do_not_share_entries() -> None:
+    a = GridMap(3, 3)
+    b = GridMap(3, 3)
+    a.set_barrier(2, 2, True)
+    b.set_barrier(0, 1, True)
+    assert a.version == b.version
+    cache = PathCache()
+    assert cache.search(a, 0, 2, "bfs").path == engine.bfs(a, 0, 2).path
+    assert cache.search(b, 0, 2, "bfs").path == engine.bfs(b, 0, 2).path
+    assert cache.hits == 0
+
+
+if __name__ == "__main__":
+    for test in (test_hit_matches_search, test_least_recently_used_is_evicted, test_edits_make_entries_stale,
+                 test_maps_at_the_same_version_do_not_share_entries):
+        test()
+        print(f"{test.__name__}: ok")
@@ -0,0 +1,131 @@
+"""
+Seeded checks of step traces: a recorded run survives a save/load round trip, and a TracePlayer
+seeking forward and backward shows the states a live run showed at the same step. Run with pytest,
+or as a script: python test_step_trace.py
+"""
+import os
+import random
+import tempfile
+import engine
+from benchmark import pick_queries
+from grid_map import BARRIER, FREE, CLOSED, CLOSED_BACKWARD, PATH, START, END
+from map_generators import random_obstacles
+from step_trace import StepTrace, TracePlayer
+
+SEED = 7
+QUERIES = 5
+SEEKS = 200
+# between them these report pushes and expansions, backward ones and path cells, and iterative
+# deepening paints the same cells over and over
+RECORDED = ("astar", "bidirectional_bfs", "ids")
+
+
+def _map():
+    """
+    A small random map with terrain costs, so the traces carry a cost layer.
+    """
+    grid_map = random_obstacles(16, 16, 0.25, SEED)
+    rng = random.Random(SEED)
+    for cell in range(len(grid_map.cells)):
+        if grid_map.cells[cell] != BARRIER and rng.random() < 0.2:
+            grid_map.set_cost(*grid_map.position(cell), rng.randint(2, 5))
+    return grid_map
+
+
+def _traces():
+    grid_map = _map()
+    for start, end in pick_queries(grid_map, QUERIES, SEED):
+        for name in RECORDED:
+            yield grid_map, StepTrace.record(engine.ALGORITHMS[name], grid_map, start, end, name=name)
+
+
+def _live_states(trace: StepTrace) -> list[bytes]:
+    """
+    The cell states after every event, as a live run paints them (the endpoints keep their marks).
+    """
+    cells = bytearray(trace.cells())
+    cells[trace.start], cells[trace.end] = START, END
+    states = [bytes(cells)]
+    for kind, cell in trace.steps():
+        if cell != trace.start and cell != trace.end:
+            cells[cell] = kind
+        states.append(bytes(cells))
+    return states
+
+
+def test_save_load_round_trip() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "run.trace")
+        for grid_map, trace in _traces():
+            trace.save(path)
+            loaded = StepTrace.load(path)
+            assert (loaded.rows, loaded.cols, loaded.start, loaded.end, loaded.algorithm) == \
+                (trace.rows, trace.cols, trace.start, trace.end, trace.algorithm)
+            assert loaded.events == trace.events and list(loaded.steps()) == list(trace.steps())
+            assert loaded.cells() == bytes(BARRIER if grid_map.is_barrier(cell) else FREE
+                                           for cell in range(len(grid_map.cells)))
+            assert loaded.costs == bytes(grid_map.costs)
+            assert loaded.result == trace.result, trace.algorithm
+
+
+def test_load_rejects_other_files() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "run.trace")
+        next(_traces())[1].save(path)
+        with open(path, "r+b") as file:
+            file.write(b"GMAP")
+        try:
+            StepTrace.load(path)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("a file without the trace magic was loaded")
+
+
+def test_seek_matches_live_run() -> None:
+    rng = random.Random(SEED)
+    for _, trace in _traces():
+        states = _live_states(trace)
+        mirror = bytearray(states[0])
+
+        def on_change(cell: int, state: int) -> None:
+            mirror[cell] = state
+
+        player = TracePlayer(trace, on_change)
+        for _ in range(SEEKS):
+            # mostly short hops around the current position, with some long jumps and overshoots
+            if rng.random() < 0.7:
+                position = player.position + rng.randint(-20, 20)
+            else:
+                position = rng.randint(-5, len(trace) + 5)
+            player.seek(position)
+            assert player.position == max(0, min(position, len(trace)))
+            assert bytes(player.cells) == states[player.position], f"{trace.algorithm} at {player.position}"
+            assert mirror == player.cells
+        player.seek(len(trace))
+        assert player.done and bytes(player.cells) == states[-1]
+
+
+def test_advance_counts_steps() -> None:
+    for _, trace in _traces():
+        kinds = [kind for kind, _ in trace.steps()]
+        player = TracePlayer(trace)
+        counted = 0
+        while not player.done:
+            position = player.position
+            player.advance(3)
+            steps = sum(1 for kind in kinds[position:player.position] if kind in (CLOSED, CLOSED_BACKWARD, PATH))
+            # a frame stops right after its third step, or at the end of the trace
+            assert steps == 3 and kinds[player.position - 1] in (CLOSED, CLOSED_BACKWARD, PATH) or player.done
+            counted += steps
+        assert counted == sum(1 for kind in kinds if kind in (CLOSED, CLOSED_BACKWARD, PATH))
+        fresh = TracePlayer(trace)
+        fresh.advance()
+        assert fresh.done and fresh.cells == player.cells
+
+
+if __name__ == "__main__":
+    for test in (test_save_load_round_trip, test_load_rejects_other_files, test_seek_matches_live_run,
+                 test_advance_counts_steps):
+        test()
+        print(f"{test.__name__}: ok")
@@ -1,4 +1,5 @@
 import pygame
+from grid_map import FREE, BARRIER, OPEN, CLOSED, PATH, START, END, OPEN_BACKWARD, CLOSED_BACKWARD
 
 WIDTH = 800
 HEIGHT = 800
@@ -21,4 +22,26 @@ COLORS = {
     'BUTTON_HOVER': (100, 149, 237),
     'TEXT_COLOR': (255, 255, 255),
     'PANEL_COLOR': (50, 50, 50)
-}
\ No newline at end of file
+}
+
+# cells only store their state; the color of each state is applied when drawing
+STATE_COLORS = {
+    FREE: COLORS['WHITE'],
+    BARRIER: COLORS['BLACK'],
+    OPEN: COLORS['GREEN'],
+    CLOSED: COLORS['RED'],
+    PATH: COLORS['PURPLE'],
+    START: COLORS['ORANGE'],
+    END: COLORS['YELLOW'],
+    OPEN_BACKWARD: COLORS['TURQUOISE'],
+    CLOSED_BACKWARD: COLORS['BLUE'],
+}
+
+# free cells that cost more than 1 to enter are tinted from light sand (2) to dark brown (9 and up)
+LIGHT_TERRAIN = (235, 215, 170)
+HEAVY_TERRAIN = (120, 80, 40)
+
+
+def cost_color(cost: int) -> tuple[int, int, int]:
+    t = (min(cost, 9) - 2) / 7
+    return tuple(round(light + (heavy - light) * t) for light, heavy in zip(LIGHT_TERRAIN, HEAVY_TERRAIN))
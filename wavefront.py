@@ -0,0 +1,131 @@
+"""
+Wavefront BFS: whole distance fields in one call.
+
+distance_field() expands the BFS frontier a full layer at a time. With NumPy installed, every
+layer is a handful of array operations over the frontier cells, so a field costs O(diameter)
+NumPy calls instead of one interpreter iteration per cell. NumPy is listed in requirements.txt;
+without it the kernel falls back to a plain deque BFS with the same results, just not faster.
+landmarks.distances_from() builds its distance tables with it.
+
+Alongside the distances it returns a parent direction map: for every reached cell, the side its
+BFS parent lies on (one of the FROM_* codes below). trace_parents() turns it into a path.
+"""
+from array import array
+from collections import deque
+from grid_map import GridMap, BARRIER
+
+try:
+    import numpy as np
+except ImportError:  # optional: the pure-Python kernel below is used instead
+    np = None
+
+# ---- Parent directions ----
+NO_PARENT = 0    # the source, or a cell that was not reached
+FROM_DOWN = 1    # the parent is the cell below (+cols)
+FROM_UP = 2      # the parent is the cell above (-cols)
+FROM_RIGHT = 3   # the parent is the cell to the right (+1)
+FROM_LEFT = 4    # the parent is the cell to the left (-1)
+
+
+def _parent_steps(cols: int) -> tuple[int, ...]:
+    """
+    The offset from a cell to its parent, indexed by parent direction.
+    """
+    return 0, cols, -cols, 1, -1
+
+
+def distance_field(grid_map: GridMap, source: int, target: int = -1) -> tuple:
+    """
+    BFS distances and parent directions from a source to every reachable cell.
+    Args:
+        grid_map (GridMap): The map to expand over.
+        source (int): The cell the wavefront starts from.
+        target (int): Stop after the layer that reaches this cell; -1 expands the whole map.
+    Returns:
+        tuple: (distances, parents), both flat and indexed by cell. distances holds -1 for cells that
+            were not reached, parents holds the FROM_* direction of each cell's parent. They are
+            NumPy arrays when NumPy is installed, an array('i') and a bytearray otherwise.
+    """
+    if np is not None:
+        return _distance_field_numpy(grid_map, source, target)
+    return _distance_field_python(grid_map, source, target)
+
+
+def _distance_field_numpy(grid_map: GridMap, source: int, target: int) -> tuple:
+    """
+    The vectorized kernel: the frontier is an array of cells and each layer is built from it with
+    one shift, bounds mask and unvisited filter per direction.
+    """
+    cols = grid_map.cols
+    size = grid_map.rows * cols
+    unvisited = np.frombuffer(grid_map.cells, dtype=np.uint8) != BARRIER
+    distances = np.full(size, -1, dtype=np.int32)
+    parents = np.zeros(size, dtype=np.int8)
+
+    distances[source] = 0
+    unvisited[source] = False
+    frontier = np.array([source], dtype=np.intp)
+    depth = 0
+    while frontier.size and not (target >= 0 and distances[target] >= 0):
+        depth += 1
+        col = frontier % cols
+        layer = []
+        # (offset to the neighbor, cells that have that neighbor, direction back to the frontier cell)
+        for offset, valid, direction in ((cols, frontier < size - cols, FROM_UP),
+                                         (-cols, frontier >= cols, FROM_DOWN),
+                                         (1, col != cols - 1, FROM_LEFT),
+                                         (-1, col != 0, FROM_RIGHT)):
+            reached = frontier[valid] + offset
+            reached = reached[unvisited[reached]]
+            # two frontier cells never share a neighbor in the same direction, so reached is unique
+            unvisited[reached] = False
+            parents[reached] = direction
+            layer.append(reached)
+        frontier = np.concatenate(layer)
+        distances[frontier] = depth
+    return distances, parents
+
+
+def _distance_field_python(grid_map: GridMap, source: int, target: int) -> tuple:
+    """
+    The fallback kernel: a deque BFS writing into flat arrays.
+    """
+    cols = grid_map.cols
+    steps = _parent_steps(cols)
+    size = grid_map.rows * cols
+    distances = array('i', [-1]) * size
+    parents = bytearray(size)
+
+    distances[source] = 0
+    queue = deque([source])
+    while queue:
+        current = queue.popleft()
+        if current == target:
+            break
+        depth = distances[current] + 1
+        for neighbor in grid_map.neighbors(current):
+            if distances[neighbor] < 0:
+                distances[neighbor] = depth
+                parents[neighbor] = steps.index(current - neighbor)
+                queue.append(neighbor)
+    return distances, parents
+
+
+def trace_parents(grid_map: GridMap, parents, end: int) -> list[int]:
+    """
+    Follow a parent direction map back from a cell to the source.
+    Args:
+        grid_map (GridMap): The map the field was computed on.
+        parents: The parent directions returned by distance_field().
+        end (int): A reached cell.
+    Returns:
+        list[int]: The cells from the source to end.
+    """
+    steps = _parent_steps(grid_map.cols)
+    cells = [end]
+    direction = parents[end]
+    while direction != NO_PARENT:
+        cells.append(cells[-1] + steps[direction])
+        direction = parents[cells[-1]]
+    cells.reverse()
+    return cells